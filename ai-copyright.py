@@ -7,11 +7,16 @@ AI驱动软件著作权申请材料生成系统 - 统一入口脚本
 这是系统的主入口脚本，提供统一的命令行界面来访问所有功能
 """
 
+import os
 import sys
 import argparse
 import subprocess
+import importlib.util
 from pathlib import Path
 
+# 进程内模式下已加载的脚本模块（同一进程内重复调用时不再重新导入）
+_loaded_modules = {}
+
 class Colors:
     """终端颜色定义"""
     RED = '\033[0;31m'
@@ -48,6 +53,56 @@ def run_command(command, description="执行命令"):
         print_colored(Colors.RED, f"❌ 命令执行失败: {e}")
         return False
 
+def load_script_module(script_path):
+    """以模块方式加载脚本文件，脚本所在目录加入 sys.path 以便其导入同目录模块"""
+    script_path = Path(script_path).resolve()
+    module = _loaded_modules.get(script_path)
+    if module is not None:
+        return module
+    
+    script_dir = str(script_path.parent)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    
+    module_name = f"_ai_copyright_{script_path.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    
+    _loaded_modules[script_path] = module
+    return module
+
+def run_script_in_process(script_path, script_args, description="执行脚本"):
+    """在当前进程内调用脚本的 main()，按 sys.exit 的语义判断是否成功"""
+    print_colored(Colors.BLUE, f"🔄 {description}...")
+    
+    saved_argv = sys.argv
+    sys.argv = [str(script_path)] + list(script_args)
+    try:
+        exit_code = load_script_module(script_path).main()
+    except SystemExit as e:
+        exit_code = e.code
+    except Exception as e:
+        print_colored(Colors.RED, f"❌ 脚本执行失败: {e}")
+        return False
+    finally:
+        sys.argv = saved_argv
+    
+    if exit_code is None or exit_code == 0:
+        return True
+    
+    print_colored(Colors.RED, f"❌ 脚本执行失败: {script_path.name} 返回 {exit_code}")
+    return False
+
+def run_script(args, script_path, script_args=(), description="执行脚本"):
+    """运行指定脚本：默认启动子进程，--in-process 时在当前进程内直接调用"""
+    if getattr(args, 'in_process', False):
+        return run_script_in_process(script_path, script_args, description)
+    
+    cmd = " ".join([f"python3 {script_path}"] + list(script_args))
+    return run_command(cmd, description)
+
 def init_project(args):
     """初始化新项目"""
     script_path = get_script_path() / "scripts" / "init" / "init_project.py"
@@ -57,19 +112,24 @@ def init_project(args):
         print("用法: ai-copyright.py init <项目名称>")
         return False
     
-    cmd = f"python3 {script_path} {args.name}"
+    script_args = [args.name]
     if args.force:
-        cmd += " --force"
+        script_args.append("--force")
     
-    return run_command(cmd, f"初始化项目 '{args.name}'")
+    return run_script(args, script_path, script_args, f"初始化项目 '{args.name}'")
 
 def generate_code(args):
     """生成源代码"""
     script_path = get_script_path() / "scripts" / "generators"
     
+    script_args = []
+    
     if args.type == "all":
         script = script_path / "generate_all_sourcecode.py"
         desc = "生成所有源代码"
+        if getattr(args, 'in_process', False):
+            # 让统一生成脚本同样在进程内调用前端/后端生成脚本
+            script_args.append("--in-process")
     elif args.type == "frontend":
         script = script_path / "generate_frontend_sourcecode.py"
         desc = "生成前端源代码"
@@ -80,35 +140,35 @@ def generate_code(args):
         print_colored(Colors.RED, "❌ 无效的生成类型")
         return False
     
-    return run_command(f"python3 {script}", desc)
+    return run_script(args, script, script_args, desc)
 
 def check_project(args):
     """检查项目"""
     script_path = get_script_path() / "scripts" / "validators" / "check_project.py"
     
-    cmd = f"python3 {script_path}"
+    script_args = []
     if args.quick:
-        cmd += " --quick"
+        script_args.append("--quick")
     if args.path:
-        cmd += f" {args.path}"
+        script_args.append(args.path)
     
-    return run_command(cmd, "检查项目完整性")
+    return run_script(args, script_path, script_args, "检查项目完整性")
 
 def run_tests(args):
     """运行测试"""
     script_path = get_script_path() / "scripts" / "validators" / "run_tests.py"
     
-    cmd = f"python3 {script_path}"
+    script_args = []
     if args.path:
-        cmd += f" {args.path}"
+        script_args.append(args.path)
     
-    return run_command(cmd, "运行自动化测试")
+    return run_script(args, script_path, script_args, "运行自动化测试")
 
-def validate_frontend(_args):
+def validate_frontend(args):
     """验证前端页面"""
     script_path = get_script_path() / "scripts" / "validators" / "validate_frontend_pages.py"
     
-    return run_command(f"python3 {script_path}", "验证前端页面完整性")
+    return run_script(args, script_path, description="验证前端页面完整性")
 
 def show_status(_args):
     """显示项目状态"""
@@ -159,9 +219,15 @@ def main():
   %(prog)s test                       # 运行自动化测试
   %(prog)s validate-frontend          # 验证前端页面
   %(prog)s status                     # 显示项目状态
+  %(prog)s --in-process check         # 在当前进程内执行（适合CI中频繁调用）
         """
     )
     
+    parser.add_argument('--in-process', action='store_true',
+                        default=os.environ.get('AI_COPYRIGHT_IN_PROCESS') == '1',
+                        help='在当前进程内直接调用各脚本，不再启动新的Python解释器 '
+                             '(也可设置环境变量 AI_COPYRIGHT_IN_PROCESS=1)')
+    
     subparsers = parser.add_subparsers(dest='command', help='可用命令')
     
     # init 命令
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+生成与拼接流程基准测试
+功能：在合成项目上计时前端/后端生成脚本、各 merge_*_simple 脚本以及
+QualityMonitor.run_monitoring，输出墙钟时间、峰值内存和吞吐量 (JSON)，
+并可与保存的基线结果比较，发现热点路径的性能回退
+
+每次测量都在独立的子进程中执行，峰值内存取自该子进程的 ru_maxrss
+
+用法示例：
+  python3 scripts/benchmarks/run_benchmarks.py --size medium --output baseline.json
+  python3 scripts/benchmarks/run_benchmarks.py --size medium --compare baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+from synth_project import synthesize_project
+
+# 规模预设：页面数/页面KB、Java文件数/文件KB、SQL文件数/文件KB
+SIZE_PRESETS = {
+    'small':  dict(pages=10, page_kb=20, java_files=50, java_kb=3, sql_files=3, sql_kb=10),
+    'medium': dict(pages=40, page_kb=40, java_files=400, java_kb=4, sql_files=10, sql_kb=40),
+    'large':  dict(pages=120, page_kb=60, java_files=2000, java_kb=5, sql_files=30, sql_kb=80),
+}
+
+QUALITY_MONITOR_SNIPPET = (
+    "import sys; sys.path.insert(0, 'scripts/validators'); "
+    "from quality_monitor import QualityMonitor; QualityMonitor(use_cache={use_cache}, record_history=False).run_monitoring()"
+)
+
+# 基准项：名称 -> (命令参数, 计入吞吐量的输入类别, 是否先预热一次)
+BENCHMARKS = {
+    'generate_frontend': (['scripts/generators/generate_frontend_sourcecode.py'], ['front'], False),
+    'generate_backend': (['scripts/generators/generate_backend_sourcecode.py'], ['backend'], False),
+    'merge_frontend': (['scripts/generators/merge_frontend_simple.py', '--no-cache'], ['front'], False),
+    'merge_backend': (['scripts/generators/merge_backend_simple.py', '--no-cache'], ['backend'], False),
+    'merge_database': (['scripts/generators/merge_database_simple.py', '--no-cache'], ['db'], False),
+    'merge_frontend_cached': (['scripts/generators/merge_frontend_simple.py'], ['front'], True),
+    'merge_backend_cached': (['scripts/generators/merge_backend_simple.py'], ['backend'], True),
+    'merge_database_cached': (['scripts/generators/merge_database_simple.py'], ['db'], True),
+    'quality_monitor': (['-c', QUALITY_MONITOR_SNIPPET.format(use_cache=False)], ['front', 'backend', 'db'], False),
+    'quality_monitor_cached': (['-c', QUALITY_MONITOR_SNIPPET.format(use_cache=True)], ['front', 'backend', 'db'], True),
+}
+
+DEFAULT_THRESHOLD = 0.2
+
+# 颜色输出类
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def log(color: str, message: str):
+    """进度信息输出到 stderr，stdout 只用于 JSON 结果"""
+    print(f"{color}{message}{Colors.NC}", file=sys.stderr)
+
+def run_measured(args, cwd: Path):
+    """
+    在子进程中运行 python 命令，返回 (墙钟时间秒, 峰值内存MB, 退出码, stderr末尾)
+
+    不支持 os.wait4 的平台（Windows）无法取得子进程峰值内存，返回 None
+    """
+    with tempfile.TemporaryFile() as err:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable] + args, cwd=cwd,
+                                   stdout=subprocess.DEVNULL, stderr=err)
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(process.pid, 0)
+            elapsed = time.perf_counter() - start
+            process.returncode = (os.WEXITSTATUS(status) if os.WIFEXITED(status)
+                                  else -os.WTERMSIG(status))
+            # Linux 单位为 KB，macOS 为字节
+            divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+            peak_rss = usage.ru_maxrss / divisor
+        else:
+            process.wait()
+            elapsed = time.perf_counter() - start
+            peak_rss = None
+
+        err.seek(0)
+        tail = err.read()[-2000:].decode('utf-8', 'replace')
+
+    return elapsed, peak_rss, process.returncode, tail
+
+def run_benchmark(name: str, project: Path, dataset: dict, repeat: int) -> dict:
+    """运行单个基准项 repeat 次，取墙钟时间中位数和峰值内存最大值"""
+    args, kinds, warm_up = BENCHMARKS[name]
+    if warm_up:
+        run_measured(args, project)
+    else:
+        shutil.rmtree(project / 'output_docs' / '.cache', ignore_errors=True)
+
+    wall_times, rss_values = [], []
+    returncode, tail = 0, ''
+    for _ in range(repeat):
+        elapsed, peak_rss, returncode, tail = run_measured(args, project)
+        wall_times.append(elapsed)
+        if peak_rss is not None:
+            rss_values.append(peak_rss)
+        if returncode != 0:
+            break
+
+    wall_time = statistics.median(wall_times)
+    input_bytes = sum(dataset[kind]['bytes'] for kind in kinds)
+    input_files = sum(dataset[kind]['files'] for kind in kinds)
+
+    result = {
+        'wall_time_s': round(wall_time, 4),
+        'wall_times_s': [round(t, 4) for t in wall_times],
+        'peak_rss_mb': round(max(rss_values), 2) if rss_values else None,
+        'input_mb': round(input_bytes / (1024 * 1024), 3),
+        'input_files': input_files,
+        'throughput_mb_s': round(input_bytes / (1024 * 1024) / wall_time, 3) if wall_time else None,
+        'files_per_s': round(input_files / wall_time, 1) if wall_time else None,
+        'returncode': returncode
+    }
+    if returncode != 0:
+        result['stderr_tail'] = tail
+    return result
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    与基线比较墙钟时间和峰值内存，返回回退列表 [(基准项, 指标, 基线值, 当前值, 比例)]
+    """
+    if current.get('scale') != baseline.get('scale'):
+        log(Colors.YELLOW, "⚠ 基线的数据集规模与本次不同，比较结果仅供参考")
+
+    regressions = []
+    log(Colors.BLUE, f"\n{'基准项':<24}{'基线(s)':>10}{'当前(s)':>10}{'变化':>9}{'基线MB':>9}{'当前MB':>9}")
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            log(Colors.YELLOW, f"{name:<24}{'(基线中无此项)':>20}")
+            continue
+
+        ratio = result['wall_time_s'] / base['wall_time_s'] if base['wall_time_s'] else 1.0
+        color = Colors.RED if ratio > 1 + threshold else Colors.GREEN if ratio < 1 - threshold else Colors.NC
+        base_rss = base.get('peak_rss_mb')
+        rss = result.get('peak_rss_mb')
+        log(color, f"{name:<24}{base['wall_time_s']:>10.3f}{result['wall_time_s']:>10.3f}"
+                   f"{(ratio - 1) * 100:>+8.1f}%{base_rss or 0:>9.1f}{rss or 0:>9.1f}")
+
+        if ratio > 1 + threshold:
+            regressions.append((name, 'wall_time_s', base['wall_time_s'], result['wall_time_s'], ratio))
+        if base_rss and rss and rss / base_rss > 1 + threshold:
+            regressions.append((name, 'peak_rss_mb', base_rss, rss, rss / base_rss))
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='生成与拼接流程基准测试')
+    parser.add_argument('--size', choices=sorted(SIZE_PRESETS), default='small', help='合成项目规模预设')
+    for option, help_text in [('pages', 'HTML页面数量'), ('page-kb', '每个页面大小 (KB)'),
+                              ('java-files', 'Java文件数量'), ('java-kb', '每个Java文件大小 (KB)'),
+                              ('sql-files', 'SQL文件数量'), ('sql-kb', '每个SQL文件大小 (KB)')]:
+        parser.add_argument(f'--{option}', type=int, help=f'{help_text}，覆盖规模预设')
+    parser.add_argument('--repeat', type=int, default=3, help='每个基准项的重复次数（取中位数）')
+    parser.add_argument('--only', help='只运行指定基准项，逗号分隔')
+    parser.add_argument('--workdir', help='合成项目目录（默认使用临时目录，结束后删除）')
+    parser.add_argument('--output', help='把结果JSON写入文件（可作为以后比较的基线）')
+    parser.add_argument('--compare', help='与基线结果JSON比较，出现回退时退出码为1')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'判定回退的相对阈值（默认 {DEFAULT_THRESHOLD}，即慢 20%%）')
+    args = parser.parse_args()
+
+    scale = dict(SIZE_PRESETS[args.size])
+    for key in scale:
+        value = getattr(args, key)
+        if value is not None:
+            scale[key] = value
+
+    names = list(BENCHMARKS)
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            parser.error(f"未知的基准项: {', '.join(unknown)} (可选: {', '.join(BENCHMARKS)})")
+
+    project = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='ai-copyright-bench-'))
+    try:
+        log(Colors.BLUE, f"ℹ 生成合成项目: {project} ({args.size}: {scale})")
+        try:
+            dataset = synthesize_project(project, **scale)
+        except ValueError as e:
+            parser.error(str(e))
+
+        results = {}
+        for name in names:
+            log(Colors.BLUE, f"ℹ 运行基准项: {name}")
+            results[name] = run_benchmark(name, project, dataset, args.repeat)
+            result = results[name]
+            if result['returncode'] != 0:
+                log(Colors.RED, f"✗ {name} 执行失败 (退出码 {result['returncode']})")
+            else:
+                log(Colors.GREEN, f"✓ {name}: {result['wall_time_s']:.3f}s, "
+                                  f"{result['throughput_mb_s']} MB/s, {result['files_per_s']} 文件/s, "
+                                  f"峰值内存 {result['peak_rss_mb']} MB")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(project, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat
+        },
+        'scale': scale,
+        'dataset': dataset,
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        log(Colors.GREEN, f"✓ 结果已保存: {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    failed = any(result['returncode'] != 0 for result in results.values())
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            log(Colors.RED, f"\n✗ 发现 {len(regressions)} 项性能回退 (阈值 {args.threshold:.0%}):")
+            for name, metric, base, current, ratio in regressions:
+                log(Colors.RED, f"  - {name} {metric}: {base} → {current} ({ratio:.2f}x)")
+            return 1
+        log(Colors.GREEN, "\n✓ 未发现性能回退")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基准测试用的合成项目生成器
+功能：按指定规模生成一个独立的项目目录，包含 output_sourcecode/ 下的
+HTML页面、Java源文件和SQL脚本，以及运行生成/拼接脚本所需的配置和脚本副本
+
+内容由固定随机种子生成，相同参数得到完全相同的项目
+"""
+
+import sys
+import json
+import random
+import shutil
+import argparse
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# 复制到合成项目中的脚本目录
+SCRIPT_DIRS = ['scripts/generators', 'scripts/validators']
+
+# 合成项目标记文件，只有带此标记的目录才允许被清空重建
+MARKER_FILE = '.benchmark-project'
+
+CJK_WORDS = ['用户', '订单', '管理', '系统', '数据', '统计', '分析', '配置', '权限', '日志',
+             '查询', '导出', '审核', '通知', '设置', '报表', '客户', '商品', '库存', '支付']
+ENTITY_NAMES = ['User', 'Order', 'Product', 'Customer', 'Invoice', 'Payment', 'Inventory',
+                'Role', 'Permission', 'Notice', 'Report', 'Category', 'Supplier', 'Address']
+PACKAGES = ['controller', 'service', 'service/impl', 'mapper', 'entity', 'dto', 'vo', 'config', 'util']
+
+def cjk_text(rng: random.Random, words: int) -> str:
+    return ''.join(rng.choice(CJK_WORDS) for _ in range(words))
+
+def make_html_page(rng: random.Random, index: int, target_size: int) -> str:
+    """生成一个约 target_size 字节的页面，包含样式块、内联样式、导航、表格和脚本"""
+    head = f"""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{cjk_text(rng, 3)} - 页面{index}</title>
+    <link rel="stylesheet" href="css/common.css">
+    <style>
+        .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
+        .card {{ background: #fff; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        @media (max-width: 768px) {{ .container {{ padding: 10px; }} }}
+    </style>
+</head>
+<body>
+    <nav class="navbar">
+        <a href="index.html">首页</a>
+        <a href="page{(index + 1) % 50}.html">{cjk_text(rng, 2)}</a>
+    </nav>
+    <div class="container">
+"""
+    tail = """    </div>
+    <script>
+        document.addEventListener('DOMContentLoaded', function () {
+            try {
+                document.querySelectorAll('.card').forEach(function (el) { el.classList.add('ready'); });
+            } catch (e) { console.error(e); }
+        });
+    </script>
+</body>
+</html>
+"""
+    parts = [head]
+    size = len(head.encode('utf-8')) + len(tail.encode('utf-8'))
+    section = 0
+    while size < target_size:
+        section += 1
+        block = f"""        <section class="card" style="margin-top: 16px; padding: 12px;">
+            <h2>{cjk_text(rng, 3)} {section}</h2>
+            <p>{cjk_text(rng, rng.randint(20, 60))}</p>
+            <table class="table">
+                <tr><th>编号</th><th>{cjk_text(rng, 2)}</th><th>状态</th></tr>
+                <tr><td>{rng.randint(1000, 9999)}</td><td>{cjk_text(rng, 4)}</td><td style="color: green;">正常</td></tr>
+            </table>
+            <button class="btn" onclick="handleAction({section})">{cjk_text(rng, 2)}</button>
+        </section>
+"""
+        parts.append(block)
+        size += len(block.encode('utf-8'))
+    parts.append(tail)
+    return ''.join(parts)
+
+def make_java_file(rng: random.Random, package: str, class_name: str, target_size: int) -> str:
+    """生成一个约 target_size 字节的Java类"""
+    package_name = 'com.example.' + package.replace('/', '.')
+    head = f"""package {package_name};
+
+import java.util.List;
+import java.util.ArrayList;
+
+/**
+ * {cjk_text(rng, 4)}
+ */
+public class {class_name} {{
+
+    private Long id;
+    private String name;
+
+"""
+    parts = [head]
+    size = len(head.encode('utf-8'))
+    method = 0
+    while size < target_size:
+        method += 1
+        block = f"""    /**
+     * {cjk_text(rng, rng.randint(4, 10))}
+     */
+    public List<String> process{method}(String input, int limit) {{
+        List<String> result = new ArrayList<>();
+        try {{
+            for (int i = 0; i < limit; i++) {{
+                if (input != null && input.length() > i) {{
+                    result.add(input.substring(0, i) + "{rng.randint(0, 999)}");
+                }} else if (i % 2 == 0) {{
+                    result.add(String.valueOf(i));
+                }}
+            }}
+        }} catch (Exception e) {{
+            throw new IllegalStateException("{cjk_text(rng, 3)}", e);
+        }}
+        return result;
+    }}
+
+"""
+        parts.append(block)
+        size += len(block.encode('utf-8'))
+    parts.append("}\n")
+    return ''.join(parts)
+
+def make_sql_file(rng: random.Random, index: int, target_size: int) -> str:
+    """生成一个约 target_size 字节的SQL脚本，包含建表、索引和测试数据"""
+    parts = [f"-- {cjk_text(rng, 4)} 第{index}部分\n\n"]
+    size = len(parts[0].encode('utf-8'))
+    table = 0
+    while size < target_size:
+        table += 1
+        name = f"t_{rng.choice(ENTITY_NAMES).lower()}_{index}_{table}"
+        block = f"""CREATE TABLE {name} (
+    id BIGINT PRIMARY KEY AUTO_INCREMENT COMMENT '主键',
+    name VARCHAR(100) NOT NULL COMMENT '{cjk_text(rng, 2)}',
+    status TINYINT DEFAULT 1 COMMENT '状态',
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id) REFERENCES t_user(id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='{cjk_text(rng, 3)}';
+
+CREATE INDEX idx_{name}_name ON {name}(name);
+
+INSERT INTO {name} (name, status) VALUES ('{cjk_text(rng, 3)}', 1), ('{cjk_text(rng, 3)}', 0);
+
+"""
+        parts.append(block)
+        size += len(block.encode('utf-8'))
+    return ''.join(parts)
+
+def synthesize_project(target: Path, pages: int = 20, page_kb: int = 30,
+                       java_files: int = 100, java_kb: int = 4,
+                       sql_files: int = 5, sql_kb: int = 20, seed: int = 42) -> dict:
+    """
+    在 target 目录下生成合成项目，返回规模统计
+
+    target 已存在时只有空目录或此前生成的合成项目才会被清空重建，否则抛出 ValueError
+    """
+    rng = random.Random(seed)
+    target = Path(target)
+    if target.exists():
+        if any(target.iterdir()) and not (target / MARKER_FILE).exists():
+            raise ValueError(f"目录不是空目录也不是合成项目，拒绝清空: {target}")
+        shutil.rmtree(target)
+
+    target.mkdir(parents=True)
+    (target / MARKER_FILE).write_text(f"seed={seed}\n", encoding='utf-8')
+
+    for script_dir in SCRIPT_DIRS:
+        shutil.copytree(PROJECT_ROOT / script_dir, target / script_dir,
+                        ignore=shutil.ignore_patterns('__pycache__'))
+
+    config = {
+        'front': 'JavaScript',
+        'backend': 'Java',
+        'title': '基准测试管理系统',
+        'short_title': '基准测试系统',
+        'generation_mode': 'full'
+    }
+    with open(target / 'ai-copyright-config.json', 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+    source_root = target / 'output_sourcecode'
+    stats = {'front': [0, 0], 'backend': [0, 0], 'db': [0, 0]}
+
+    def write(path: Path, content: str, kind: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = content.encode('utf-8')
+        path.write_bytes(data)
+        stats[kind][0] += 1
+        stats[kind][1] += len(data)
+
+    for i in range(pages):
+        write(source_root / 'front' / f'page{i:03d}.html',
+              make_html_page(rng, i, page_kb * 1024), 'front')
+
+    java_root = source_root / 'backend' / 'src' / 'main' / 'java' / 'com' / 'example'
+    write(source_root / 'backend' / 'pom.xml',
+          '<project>\n  <modelVersion>4.0.0</modelVersion>\n</project>\n', 'backend')
+    for i in range(java_files):
+        package = PACKAGES[i % len(PACKAGES)]
+        class_name = f"{ENTITY_NAMES[i % len(ENTITY_NAMES)]}{package.split('/')[-1].title()}{i}"
+        write(java_root / package / f'{class_name}.java',
+              make_java_file(rng, package, class_name, java_kb * 1024), 'backend')
+
+    for i in range(sql_files):
+        write(source_root / 'db' / f'schema_{i:02d}.sql',
+              make_sql_file(rng, i, sql_kb * 1024), 'db')
+
+    (target / 'output_docs').mkdir(exist_ok=True)
+
+    return {kind: {'files': files, 'bytes': size} for kind, (files, size) in stats.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='生成基准测试用的合成项目')
+    parser.add_argument('target', help='合成项目目录（已存在时会被清空）')
+    parser.add_argument('--pages', type=int, default=20, help='HTML页面数量')
+    parser.add_argument('--page-kb', type=int, default=30, help='每个页面大小 (KB)')
+    parser.add_argument('--java-files', type=int, default=100, help='Java文件数量')
+    parser.add_argument('--java-kb', type=int, default=4, help='每个Java文件大小 (KB)')
+    parser.add_argument('--sql-files', type=int, default=5, help='SQL文件数量')
+    parser.add_argument('--sql-kb', type=int, default=20, help='每个SQL文件大小 (KB)')
+    parser.add_argument('--seed', type=int, default=42, help='随机种子')
+    args = parser.parse_args()
+
+    try:
+        stats = synthesize_project(Path(args.target), args.pages, args.page_kb, args.java_files,
+                                   args.java_kb, args.sql_files, args.sql_kb, args.seed)
+    except ValueError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+前端文档分批规划模块
+将清理CSS后的HTML页面装箱到若干 _partN.txt 文档中，每个文档不超过token上限
+
+分批策略：
+- ordered   : 保持文件名顺序，使用最少的分段数，并在分段数不变的前提下尽量均衡各段大小（默认）
+- ffd       : 首次适应递减 (First-Fit-Decreasing)，不保证页面顺序，分段数通常最少
+- best-fit  : 最佳适应递减 (Best-Fit-Decreasing)，优先填满剩余空间最小的分段
+- greedy    : 旧版按文件名顺序的贪心分批，超大页面单独成段
+
+超过上限的单个页面会在安全的DOM边界处（元素结束标签之后、<script>/<pre> 等之外）
+拆分为多个片段，而不是单独占用一个分段
+"""
+
+import re
+import bisect
+import html.parser
+from collections import namedtuple
+
+BATCH_STRATEGIES = ['ordered', 'ffd', 'best-fit', 'greedy']
+DEFAULT_BATCH_STRATEGY = 'ordered'
+
+# 每个分段头部（标题、生成时间、分隔线）预留的token数
+BATCH_HEADER_TOKENS = 64
+
+# 在这些元素内部不拆分
+UNSPLITTABLE_TAGS = {'script', 'style', 'pre', 'textarea', 'table'}
+
+# 没有结束标签的空元素，不计入嵌套深度
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'source', 'track', 'wbr'}
+
+# 批次中的一个条目：整个页面或超大页面的一个片段
+BatchItem = namedtuple('BatchItem', ['name', 'label', 'content', 'tokens', 'order'])
+
+class DOMBoundaryScanner(html.parser.HTMLParser):
+    """
+    扫描HTML，记录每个结束标签之后的位置及该处的元素嵌套深度
+    """
+
+    def __init__(self, content):
+        super().__init__(convert_charrefs=False)
+        self.content = content
+        self.line_starts = [0] + [match.end() for match in re.finditer('\n', content)]
+        self.stack = []
+        self.blocked = 0
+        self.boundaries = []  # [(偏移量, 深度)]
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(tag)
+        if tag in UNSPLITTABLE_TAGS:
+            self.blocked += 1
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        while self.stack:
+            open_tag = self.stack.pop()
+            if open_tag in UNSPLITTABLE_TAGS:
+                self.blocked -= 1
+            if open_tag == tag:
+                break
+
+        if self.blocked == 0:
+            end = self.content.find('>', self._offset())
+            if end != -1:
+                self.boundaries.append((end + 1, len(self.stack)))
+
+def find_split_boundaries(content):
+    """
+    返回可以安全拆分的位置列表 [(偏移量, 嵌套深度)]，按偏移量递增
+    """
+    scanner = DOMBoundaryScanner(content)
+    try:
+        scanner.feed(content)
+        scanner.close()
+    except Exception:
+        pass
+    return scanner.boundaries
+
+def split_oversized_content(content, max_tokens, estimate_tokens):
+    """
+    把超过 max_tokens 的页面内容在DOM边界处拆分为若干片段
+
+    在每段允许的长度范围后半部分中，优先选择嵌套最浅的边界；
+    找不到边界时退回到换行处拆分；拆分后仍超过 max_tokens 的片段继续拆分。
+    按长度无法再拆分时（上限小于少数几个字符的token数）从中间硬切，单个字符的片段原样保留
+    """
+    total_tokens = estimate_tokens(content)
+    if total_tokens <= max_tokens:
+        return [content]
+
+    # 按平均密度把token上限换算为字符长度，留出余量
+    chars_per_segment = max(1, int(len(content) * max_tokens / total_tokens * 0.9))
+    boundaries = find_split_boundaries(content)
+    offsets = [offset for offset, _ in boundaries]
+
+    segments = []
+    start = 0
+    while len(content) - start > chars_per_segment:
+        limit = start + chars_per_segment
+        low = bisect.bisect_right(offsets, start + chars_per_segment // 2)
+        high = bisect.bisect_right(offsets, limit)
+
+        if low < high:
+            # 最浅的边界；深度相同时取最靠后的
+            cut = min(boundaries[low:high], key=lambda b: (b[1], -b[0]))[0]
+        else:
+            cut = content.rfind('\n', start + 1, limit) + 1 or limit
+
+        segments.append(content[start:cut])
+        start = cut
+
+    segments.append(content[start:])
+
+    if len(segments) == 1:
+        # 没有切出任何片段，继续递归不会有进展：按字符从中间硬切
+        if len(content) == 1:
+            return [content]
+        middle = len(content) // 2
+        segments = [content[:middle], content[middle:]]
+
+    # 密度不均匀时（如ASCII标记之后的长段中文），按平均密度切出的片段仍可能超限，
+    # 逐段重新估算，超限的片段继续拆分（片段都比原内容短，递归必然结束）
+    result = []
+    for segment in segments:
+        if estimate_tokens(segment) > max_tokens:
+            result.extend(split_oversized_content(segment, max_tokens, estimate_tokens))
+        else:
+            result.append(segment)
+    return result
+
+def item_overhead(label, estimate_tokens):
+    """条目在分段文档中的额外开销：分隔标识及头部文件列表中的名称"""
+    return estimate_tokens(f"=== {label} ===\n\n\n") + estimate_tokens(f"{label}, ")
+
+def build_batch_items(html_files, clean_contents, max_tokens, estimate_tokens, split_oversized=True):
+    """
+    为每个页面生成批次条目；超大页面按DOM边界拆分为多个条目
+
+    读取失败的页面以 content=None 保留，交给写入阶段输出错误信息
+    """
+    items = []
+    for html_file in html_files:
+        content = clean_contents.get(html_file)
+        if content is None or isinstance(content, Exception):
+            items.append(BatchItem(html_file, html_file, None, 0, len(items)))
+            continue
+
+        tokens = estimate_tokens(content)
+        # 条目开销超过上限时仍给内容留出1个token，拆分总能结束
+        limit = max(1, max_tokens - item_overhead(html_file, estimate_tokens))
+
+        if not split_oversized or tokens <= limit:
+            items.append(BatchItem(html_file, html_file, content,
+                                   tokens + item_overhead(html_file, estimate_tokens), len(items)))
+            continue
+
+        segments = split_oversized_content(content, limit, estimate_tokens)
+        for index, segment in enumerate(segments, 1):
+            label = f"{html_file} [{index}/{len(segments)}]"
+            items.append(BatchItem(html_file, label, segment,
+                                   estimate_tokens(segment) + item_overhead(label, estimate_tokens),
+                                   len(items)))
+    return items
+
+def pack_ordered(items, capacity):
+    """
+    保持顺序的分段：贪心顺序装填得到最少分段数，
+    再二分查找保持该分段数的最小容量，使各段大小尽量均衡
+    """
+    def greedy(cap):
+        bins, current, load = [], [], 0
+        for item in items:
+            if current and load + item.tokens > cap:
+                bins.append(current)
+                current, load = [], 0
+            current.append(item)
+            load += item.tokens
+        if current:
+            bins.append(current)
+        return bins
+
+    best = greedy(capacity)
+    largest = max((item.tokens for item in items), default=0)
+    low, high = max(largest, 1), capacity
+    while low < high:
+        middle = (low + high) // 2
+        if len(greedy(middle)) <= len(best):
+            high = middle
+        else:
+            low = middle + 1
+
+    return greedy(low) if low < capacity else best
+
+def pack_decreasing(items, capacity, best_fit=False):
+    """
+    首次适应递减 / 最佳适应递减装箱，每个分段内部仍按原始顺序排列
+    """
+    bins = []
+    loads = []
+    for item in sorted(items, key=lambda x: (-x.tokens, x.order)):
+        candidates = [i for i, load in enumerate(loads) if load + item.tokens <= capacity]
+        if candidates:
+            target = max(candidates, key=lambda i: loads[i]) if best_fit else candidates[0]
+            bins[target].append(item)
+            loads[target] += item.tokens
+        else:
+            bins.append([item])
+            loads.append(item.tokens)
+
+    for batch in bins:
+        batch.sort(key=lambda x: x.order)
+    bins.sort(key=lambda batch: batch[0].order)
+    return bins
+
+def plan_batches(html_files, clean_contents, max_tokens, estimate_tokens,
+                 strategy=DEFAULT_BATCH_STRATEGY, split_oversized=True):
+    """
+    按指定策略规划批次，返回 [[BatchItem, ...], ...]
+    """
+    if strategy not in BATCH_STRATEGIES:
+        raise ValueError(f"未知的分批策略: {strategy} (可选: {', '.join(BATCH_STRATEGIES)})")
+
+    if max_tokens <= BATCH_HEADER_TOKENS:
+        raise ValueError(f"token上限 {max_tokens} 必须大于分段头部预留的 {BATCH_HEADER_TOKENS} tokens")
+
+    capacity = max_tokens - BATCH_HEADER_TOKENS
+
+    if strategy == 'greedy':
+        # 旧版行为：不拆分超大页面，超大页面单独成段
+        items = build_batch_items(html_files, clean_contents, capacity, estimate_tokens, split_oversized=False)
+        bins, current, load = [], [], 0
+        for item in items:
+            if item.tokens > capacity:
+                if current:
+                    bins.append(current)
+                    current, load = [], 0
+                bins.append([item])
+                continue
+            if current and load + item.tokens > capacity:
+                bins.append(current)
+                current, load = [], 0
+            current.append(item)
+            load += item.tokens
+        if current:
+            bins.append(current)
+        return bins
+
+    items = build_batch_items(html_files, clean_contents, capacity, estimate_tokens, split_oversized)
+
+    if strategy == 'ordered':
+        return pack_ordered(items, capacity)
+    return pack_decreasing(items, capacity, best_fit=(strategy == 'best-fit'))
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+前端页面公共组件去重模块
+找出在多个页面中重复出现的DOM子树（页头、侧边栏、页脚、<style>/<script> 块等）
+和内联脚本中的公共函数，在“公共组件”部分只输出一次，各页面中以引用标记代替
+
+去重规则：
+- 每个元素（有结束标签的）和内联脚本中的顶层 function 声明都是候选块
+- 候选块按去掉每行首尾空白、删除空行后的文本计算指纹，缩进不同的相同代码视为同一组件
+- 在至少 MIN_COMPONENT_PAGES 个页面中出现、且不少于 MIN_COMPONENT_CHARS 个字符的块为公共组件
+- 每个页面从外到内选取最大的公共组件，已被替换的块内部不再处理
+- 替换后只在一个页面中使用的块（其他页面中被外层组件包含）不作为公共组件，恢复为原文
+- <html>、<body> 不作为组件，保证每个页面仍保留自己的结构
+
+供 generate_frontend_sourcecode.py 和 merge_frontend_simple.py 的 --dedup 选项使用
+"""
+
+import re
+import hashlib
+import html.parser
+from collections import namedtuple
+from typing import Dict, List
+
+MIN_COMPONENT_CHARS = 120
+# 公共组件说明中最多列出的页面数
+LISTED_PAGES = 5
+MIN_COMPONENT_PAGES = 2
+
+# 不作为公共组件的元素
+SKIPPED_TAGS = {'html', 'body'}
+
+# 没有结束标签的空元素
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'source', 'track', 'wbr'}
+
+COMMON_SECTION_TITLE = "公共组件"
+
+# 候选块：kind 为 element 或 function
+Block = namedtuple('Block', ['start', 'end', 'kind', 'label'])
+# 公共组件：编号、描述、首次出现处的代码、所在页面、出现次数
+Component = namedtuple('Component', ['id', 'kind', 'label', 'text', 'pages', 'occurrences'])
+DedupResult = namedtuple('DedupResult', ['pages', 'components', 'original_chars', 'deduplicated_chars'])
+
+# 内联脚本中的顶层函数声明
+_FUNCTION_START = re.compile(r'^[ \t]*(?:async[ \t]+)?function\s*\*?\s*([\w$]+)\s*\(', re.M)
+# 匹配函数体大括号时跳过注释和字符串
+_JS_TOKEN = re.compile(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`|[{}]", re.S)
+
+class ElementSpanScanner(html.parser.HTMLParser):
+    """
+    扫描HTML，记录每个元素从开始标签到结束标签的范围，以及内联脚本的内容范围
+    """
+
+    def __init__(self, content):
+        super().__init__(convert_charrefs=False)
+        self.content = content
+        self.line_starts = [0] + [match.end() for match in re.finditer('\n', content)]
+        self.stack = []  # [(标签, 开始位置, 描述)]
+        self.blocks = []
+        self.scripts = []  # [(内容开始, 内容结束)]
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        self.stack.append((tag, self._offset(), _element_label(tag, attrs)))
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _, _ in self.stack):
+            return
+        # 隐式关闭的元素没有明确的结束位置，不作为候选块
+        while self.stack[-1][0] != tag:
+            self.stack.pop()
+        _, start, label = self.stack.pop()
+
+        end_tag_start = self._offset()
+        end = self.content.find('>', end_tag_start)
+        if end == -1:
+            return
+        if tag not in SKIPPED_TAGS:
+            self.blocks.append(Block(start, end + 1, 'element', label))
+        if tag == 'script':
+            content_start = self.content.find('>', start) + 1
+            if 0 < content_start <= end_tag_start:
+                self.scripts.append((content_start, end_tag_start))
+
+def _element_label(tag: str, attrs) -> str:
+    """元素描述，如 header#top.navbar.fixed"""
+    attributes = dict(attrs)
+    label = tag
+    if attributes.get('id'):
+        label += f"#{attributes['id']}"
+    classes = (attributes.get('class') or '').split()
+    if classes:
+        label += ''.join(f".{name}" for name in classes[:2])
+    if tag == 'script' and attributes.get('src'):
+        label += f"[src={attributes['src']}]"
+    return label
+
+def find_script_functions(content: str, start: int, end: int) -> List[Block]:
+    """内联脚本 content[start:end] 中的顶层函数声明（到函数体的右大括号为止）"""
+    blocks = []
+    position = start
+    while True:
+        match = _FUNCTION_START.search(content, position, end)
+        if match is None:
+            break
+        depth = 0
+        function_end = -1
+        for token in _JS_TOKEN.finditer(content, match.end(), end):
+            text = token.group()
+            if text == '{':
+                depth += 1
+            elif text == '}':
+                depth -= 1
+                if depth == 0:
+                    function_end = token.end()
+                    break
+        if function_end == -1:
+            break
+        function_start = match.start() + len(match.group()) - len(match.group().lstrip())
+        blocks.append(Block(function_start, function_end, 'function', f"function {match.group(1)}()"))
+        position = function_end
+    return blocks
+
+def find_blocks(content: str) -> List[Block]:
+    """页面中的全部候选块，按开始位置排列，外层块在内层块之前"""
+    scanner = ElementSpanScanner(content)
+    try:
+        scanner.feed(content)
+        scanner.close()
+    except Exception:
+        # 无法解析的页面不参与去重
+        return []
+    blocks = list(scanner.blocks)
+    for start, end in scanner.scripts:
+        blocks.extend(find_script_functions(content, start, end))
+    blocks.sort(key=lambda block: (block.start, -block.end))
+    return blocks
+
+def normalize_block(text: str) -> str:
+    """去掉每行首尾空白并删除空行，缩进不同的相同代码得到相同结果"""
+    return '\n'.join(line for line in (line.strip() for line in text.splitlines()) if line)
+
+def fingerprint(text: str) -> str:
+    return hashlib.blake2b(normalize_block(text).encode('utf-8'), digest_size=16).hexdigest()
+
+def dedent_block(text: str) -> str:
+    """块的第一行从标签开始，没有缩进；其余行去掉公共缩进"""
+    lines = text.split('\n')
+    indents = [len(line) - len(line.lstrip(' \t')) for line in lines[1:] if line.strip()]
+    if not indents:
+        return text
+    indent = min(indents)
+    return '\n'.join([lines[0]] + [line[indent:] for line in lines[1:]])
+
+def reference_marker(component: Component) -> str:
+    """页面中代替公共组件的引用标记（脚本中的函数使用 JS 注释）"""
+    text = f"公共组件 {component.id}: {component.label}，见“{COMMON_SECTION_TITLE}”部分"
+    if component.kind == 'function':
+        return f"/* {text} */"
+    return f"<!-- {text} -->"
+
+def select_blocks(blocks: List[tuple], shared: set) -> List[tuple]:
+    """从外到内选取页面中要替换的公共组件块，已选块内部的块跳过"""
+    selected = []
+    position = 0
+    for block, digest in blocks:
+        if digest not in shared or block.start < position:
+            continue
+        selected.append((block, digest))
+        position = block.end
+    return selected
+
+def deduplicate_pages(contents: Dict[str, str], min_chars: int = MIN_COMPONENT_CHARS,
+                      min_pages: int = MIN_COMPONENT_PAGES) -> DedupResult:
+    """
+    对 {页面名: 内容} 去重，返回 DedupResult(去重后的页面, 公共组件列表, 原字符数, 去重后字符数)
+
+    去重后字符数包括公共组件部分（render_components_section 的输出）
+    """
+    page_blocks = {}
+    block_pages = {}
+    for name, content in contents.items():
+        blocks = []
+        for block in find_blocks(content):
+            text = content[block.start:block.end]
+            if len(text) < min_chars:
+                continue
+            digest = fingerprint(text)
+            blocks.append((block, digest))
+            block_pages.setdefault(digest, set()).add(name)
+        page_blocks[name] = blocks
+
+    # 嵌套在更大公共组件中的块，在其他页面被外层组件替换后可能只剩一个页面使用；
+    # 这样的块不再作为公共组件，恢复为页面内原文，并重新选取（其内部的块可能成为组件）
+    shared = {digest for digest, pages in block_pages.items() if len(pages) >= min_pages}
+    while True:
+        selected = {name: select_blocks(page_blocks[name], shared) for name in contents}
+        used_pages = {}
+        for name, blocks in selected.items():
+            for _, digest in blocks:
+                used_pages.setdefault(digest, set()).add(name)
+        dropped = {digest for digest, names in used_pages.items() if len(names) < min_pages}
+        if not dropped:
+            break
+        shared -= dropped
+
+    components = {}
+    pages = {}
+    for name, content in contents.items():
+        parts = []
+        position = 0
+        for block, digest in selected[name]:
+            component = components.get(digest)
+            if component is None:
+                component = Component(f"C{len(components) + 1}", block.kind, block.label,
+                                      dedent_block(content[block.start:block.end]), [], [0])
+                components[digest] = component
+            if name not in component.pages:
+                component.pages.append(name)
+            component.occurrences[0] += 1
+            parts.append(content[position:block.start])
+            parts.append(reference_marker(component))
+            position = block.end
+        parts.append(content[position:])
+        pages[name] = ''.join(parts)
+
+    component_list = [component._replace(occurrences=component.occurrences[0]) for component in components.values()]
+    original_chars = sum(len(content) for content in contents.values())
+    deduplicated_chars = sum(len(content) for content in pages.values()) + len(render_components_section(component_list))
+    return DedupResult(pages, component_list, original_chars, deduplicated_chars)
+
+def render_components_section(components: List[Component]) -> str:
+    """文档开头的公共组件部分，没有公共组件时返回空字符串"""
+    if not components:
+        return ""
+    parts = [f"{'=' * 80}\n{COMMON_SECTION_TITLE}: 共 {len(components)} 个"
+             f"（在多个页面中重复出现，各页面中以“公共组件 C编号”引用标记代替）\n{'=' * 80}\n\n"]
+    for component in components:
+        pages = ', '.join(component.pages[:LISTED_PAGES])
+        if len(component.pages) > LISTED_PAGES:
+            pages += " 等"
+        parts.append(f"--- 公共组件 {component.id}: {component.label}"
+                     f"（{len(component.pages)} 个页面，共 {component.occurrences} 处: {pages}）---\n")
+        parts.append(component.text)
+        parts.append("\n\n")
+    return ''.join(parts)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+拼接文档分页输出模块 (Python版本)
+功能：在 merge_*_simple.py 拼接 .txt 文档的同时，把写入的内容流式转换为分页的 DOCX 或 PDF，
+每页带页眉（软件名称和版本号）和页码，可直接用于软著申请提交
+
+特点：
+- 只使用 Python 标准库（zipfile、zlib），不依赖办公软件或第三方库
+- 分页规则与 paginate_sourcecode.py 相同：每页50行，每行80个半角字符宽度，超出部分折行，
+  预先折好行并逐页插入分页，办公软件打开时不需要重新排版
+- 逐页写出：DOCX 的 word/document.xml 以流方式写入 ZIP，PDF 的页面对象写出后即释放，
+  内存中只保留当前页，以及每页的对象编号和偏移量
+- DOCX 使用 Word 页码域；PDF 使用 Adobe-GB1 的 STSong-Light 字体（不嵌入，阅读器自动替换为宋体）
+
+用法：
+  with MergedOutput(Path("output_docs/前端源代码.txt"), ['docx', 'pdf'], page_header(config)) as output:
+      output.write(...)
+"""
+
+import os
+import re
+import zlib
+import shutil
+import zipfile
+from pathlib import Path
+from datetime import datetime
+from typing import Iterable, List
+from xml.sax.saxutils import escape
+
+from paginate_sourcecode import LINES_PER_PAGE, LINE_WIDTH, char_width, wrap_line
+from merge_cache import STREAM_CHUNK_SIZE, copy_file_bytes
+
+# 支持的输出格式
+DOCUMENT_FORMATS = ('docx', 'pdf')
+# 未配置版本号时使用的版本号（与软著登记信息表一致）
+DEFAULT_VERSION = 'V1.0'
+
+# XML 不允许的控制字符（制表符由折行时展开，换页符等直接删除）
+_CONTROL_CHARS = re.compile('[\x00-\x08\x0b-\x1f\x7f\ufffe\uffff]')
+
+def page_header(config: dict) -> str:
+    """页眉文字：软件名称和版本号，取自 generate_header() 使用的配置字段"""
+    title = config.get('title', '未设置')
+    return f"{title} {config.get('version', DEFAULT_VERSION)}"
+
+class PagedWriter:
+    """
+    分页写出器基类：像文本流一样接收 write() 的内容，按行折行后每 lines_per_page 行调用一次 _write_page
+
+    子类实现 _write_page(页码, 行列表) 和 _finish()
+    """
+
+    def __init__(self, path: Path, header: str, lines_per_page: int = LINES_PER_PAGE, width: int = LINE_WIDTH):
+        self.path = Path(path)
+        self.header = _CONTROL_CHARS.sub('', header)
+        self.lines_per_page = lines_per_page
+        self.width = width
+        self.pending = ''
+        self.page_lines: List[str] = []
+        self.page_count = 0
+
+    def write(self, text: str):
+        if not text:
+            return
+        lines = (self.pending + text).split('\n')
+        self.pending = lines.pop()
+        for line in lines:
+            self._add_line(line)
+
+    def _add_line(self, line: str):
+        if not line.isprintable():
+            line = _CONTROL_CHARS.sub('', line)
+        for segment in wrap_line(line, self.width):
+            self.page_lines.append(segment)
+            if len(self.page_lines) == self.lines_per_page:
+                self._flush_page()
+
+    def _flush_page(self):
+        self.page_count += 1
+        self._write_page(self.page_count, self.page_lines)
+        self.page_lines = []
+
+    def close(self):
+        if self.pending:
+            self._add_line(self.pending)
+            self.pending = ''
+        if self.page_lines or self.page_count == 0:
+            self._flush_page()
+        self._finish()
+
+    def _write_page(self, number: int, lines: List[str]):
+        raise NotImplementedError
+
+    def _finish(self):
+        raise NotImplementedError
+
+# ---------------------------------------------------------------- DOCX
+
+_W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_DOCX_CONTENT_TYPES = _XML_DECLARATION + (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '<Override PartName="/word/header1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+    '<Override PartName="/word/footer1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/>'
+    '<Override PartName="/docProps/core.xml" '
+    'ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>'
+    '</Types>')
+
+_DOCX_PACKAGE_RELS = _XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" '
+    'Target="docProps/core.xml"/>'
+    '</Relationships>')
+
+_DOCX_DOCUMENT_RELS = _XML_DECLARATION + (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/header" '
+    'Target="header1.xml"/>'
+    '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer" '
+    'Target="footer1.xml"/>'
+    '</Relationships>')
+
+# 等宽字体 9 磅，固定行距 14 磅（280 缇），A4 纸上下左右边距 2 厘米（1134 缇）：
+# 50 行共 14000 缇，小于版心高度 14570 缇；80 列约 432 磅，小于版心宽度 482 磅，不会再次折行或分页
+_DOCX_STYLES = _XML_DECLARATION + (
+    f'<w:styles xmlns:w="{_W_NS}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr>'
+    '<w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New" w:eastAsia="SimSun"/>'
+    '<w:sz w:val="18"/><w:szCs w:val="18"/>'
+    '</w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:before="0" w:after="0" w:line="280" w:lineRule="exact"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '</w:styles>')
+
+_DOCX_SECTION = (
+    '<w:sectPr>'
+    '<w:headerReference w:type="default" r:id="rId2"/>'
+    '<w:footerReference w:type="default" r:id="rId3"/>'
+    '<w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1134" w:right="1134" w:bottom="1134" w:left="1134" w:header="567" w:footer="567" w:gutter="0"/>'
+    '</w:sectPr>')
+
+def _docx_text(text: str) -> str:
+    return f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+class DocxWriter(PagedWriter):
+    """流式 DOCX 写出器：每行一个段落，每页第一段设置段前分页"""
+
+    def __init__(self, path: Path, header: str, **options):
+        super().__init__(path, header, **options)
+        self.zip = zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED)
+        self.zip.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+        self.zip.writestr('_rels/.rels', _DOCX_PACKAGE_RELS)
+        self.zip.writestr('word/_rels/document.xml.rels', _DOCX_DOCUMENT_RELS)
+        self.zip.writestr('word/styles.xml', _DOCX_STYLES)
+        self.zip.writestr('word/header1.xml', _XML_DECLARATION + (
+            f'<w:hdr xmlns:w="{_W_NS}"><w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+            f'{_docx_text(self.header)}</w:p></w:hdr>'))
+        self.zip.writestr('word/footer1.xml', _XML_DECLARATION + (
+            f'<w:ftr xmlns:w="{_W_NS}"><w:p><w:pPr><w:jc w:val="center"/></w:pPr>'
+            f'{_docx_text("第 ")}<w:fldSimple w:instr=" PAGE "><w:r><w:t>1</w:t></w:r></w:fldSimple>'
+            f'{_docx_text(" 页")}</w:p></w:ftr>'))
+        self.zip.writestr('docProps/core.xml', _XML_DECLARATION + (
+            '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            f'<dc:title>{escape(self.header)}</dc:title>'
+            f'<dcterms:created xsi:type="dcterms:W3CDTF">{datetime.now().strftime("%Y-%m-%dT%H:%M:%S")}Z</dcterms:created>'
+            '</cp:coreProperties>'))
+
+        # 正文分块压缩写入 ZIP，不在内存中拼接整个 document.xml
+        self.document = self.zip.open('word/document.xml', 'w', force_zip64=True)
+        self.document.write((_XML_DECLARATION +
+                             f'<w:document xmlns:w="{_W_NS}" xmlns:r="{_R_NS}"><w:body>').encode('utf-8'))
+
+    def _write_page(self, number: int, lines: List[str]):
+        parts = []
+        for index, line in enumerate(lines):
+            properties = '<w:pPr><w:pageBreakBefore/></w:pPr>' if index == 0 and number > 1 else ''
+            parts.append(f'<w:p>{properties}{_docx_text(line) if line else ""}</w:p>')
+        self.document.write(''.join(parts).encode('utf-8'))
+
+    def _finish(self):
+        self.document.write(f'{_DOCX_SECTION}</w:body></w:document>'.encode('utf-8'))
+        self.document.close()
+        self.zip.close()
+
+# ---------------------------------------------------------------- PDF
+
+# A4 纸（磅），正文 9 磅字号、14 磅行距，ASCII 字符宽半个字号、宽字符一个字号，与折行时的列宽一致
+_PDF_PAGE_WIDTH = 595
+_PDF_PAGE_HEIGHT = 842
+_PDF_MARGIN = 56.7
+_PDF_FONT_SIZE = 9
+_PDF_LEADING = 14
+_PDF_FIRST_BASELINE = _PDF_PAGE_HEIGHT - _PDF_MARGIN - _PDF_FONT_SIZE
+_PDF_HEADER_BASELINE = _PDF_PAGE_HEIGHT - 38
+_PDF_FOOTER_BASELINE = 30
+
+# 固定对象编号：目录、页面树、字体；页面对象从 _PDF_FIRST_PAGE_OBJECT 开始，每页内容流和页面各一个
+_PDF_CATALOG = 1
+_PDF_PAGES = 2
+_PDF_FONT = 3
+_PDF_CID_FONT = 4
+_PDF_FONT_DESCRIPTOR = 5
+_PDF_TO_UNICODE = 6
+_PDF_FIRST_PAGE_OBJECT = 7
+
+def _to_unicode_cmap() -> bytes:
+    """文本按 UTF-16BE 编码，ToUnicode 映射为恒等映射（BMP 范围，每段末字节 00-FF），供阅读器复制和搜索文字"""
+    ranges = [f"<{high:02X}00> <{high:02X}FF> <{high:02X}00>" for high in range(256) if not 0xD8 <= high <= 0xDF]
+    blocks = []
+    for start in range(0, len(ranges), 100):
+        chunk = ranges[start:start + 100]
+        blocks.append(f"{len(chunk)} beginbfrange\n" + '\n'.join(chunk) + "\nendbfrange")
+    return ("/CIDInit /ProcSet findresource begin\n12 dict begin\nbegincmap\n"
+            "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+            "/CMapName /Adobe-Identity-UCS def\n/CMapType 2 def\n"
+            "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+            + '\n'.join(blocks) +
+            "\nendcmap\nCMapName currentdict /CMap defineresource pop\nend\nend").encode('ascii')
+
+def _pdf_text(text: str) -> str:
+    """UTF-16BE 十六进制字符串，配合 UniGB-UTF16-H 编码使用"""
+    return f"<{text.encode('utf-16-be', 'surrogatepass').hex()}>"
+
+def _text_width(text: str) -> float:
+    return sum(char_width(char) for char in text) * _PDF_FONT_SIZE / 2
+
+class PdfWriter(PagedWriter):
+    """流式 PDF 写出器：每页的内容流压缩后立即写出，页面树、字体和交叉引用表在结束时写出"""
+
+    def __init__(self, path: Path, header: str, **options):
+        super().__init__(path, header, **options)
+        self.file = open(self.path, 'wb')
+        self.position = 0
+        self.offsets = {}
+        self.page_objects: List[int] = []
+        self.next_object = _PDF_FIRST_PAGE_OBJECT
+        self._emit(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+        header_x = (_PDF_PAGE_WIDTH - _text_width(self.header)) / 2
+        rule_y = _PDF_HEADER_BASELINE - 5
+        # 页眉和页眉下的横线每页相同
+        self.page_header = (f"BT /F1 {_PDF_FONT_SIZE} Tf {header_x:.2f} {_PDF_HEADER_BASELINE} Td "
+                            f"{_pdf_text(self.header)} Tj ET\n"
+                            f"0.5 w {_PDF_MARGIN} {rule_y} m {_PDF_PAGE_WIDTH - _PDF_MARGIN} {rule_y} l S\n")
+
+    def _emit(self, data: bytes):
+        self.file.write(data)
+        self.position += len(data)
+
+    def _emit_object(self, number: int, body: bytes):
+        self.offsets[number] = self.position
+        self._emit(f"{number} 0 obj\n".encode('ascii') + body + b"\nendobj\n")
+
+    def _write_page(self, number: int, lines: List[str]):
+        footer = f"第 {number} 页"
+        footer_x = (_PDF_PAGE_WIDTH - _text_width(footer)) / 2
+        parts = [self.page_header,
+                 f"BT /F1 {_PDF_FONT_SIZE} Tf {footer_x:.2f} {_PDF_FOOTER_BASELINE} Td {_pdf_text(footer)} Tj ET\n",
+                 f"BT /F1 {_PDF_FONT_SIZE} Tf {_PDF_LEADING} TL {_PDF_MARGIN} {_PDF_FIRST_BASELINE} Td\n"]
+        for line in lines:
+            parts.append(f"{_pdf_text(line)} Tj T*\n" if line else "T*\n")
+        parts.append("ET\n")
+        stream = zlib.compress(''.join(parts).encode('ascii'))
+
+        content_object = self.next_object
+        page_object = content_object + 1
+        self.next_object += 2
+        self._emit_object(content_object, f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode('ascii')
+                          + stream + b"\nendstream")
+        self._emit_object(page_object, (
+            f"<< /Type /Page /Parent {_PDF_PAGES} 0 R /MediaBox [0 0 {_PDF_PAGE_WIDTH} {_PDF_PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 {_PDF_FONT} 0 R >> >> /Contents {content_object} 0 R >>").encode('ascii'))
+        self.page_objects.append(page_object)
+
+    def _finish(self):
+        kids = ' '.join(f"{number} 0 R" for number in self.page_objects)
+        self._emit_object(_PDF_PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_objects)} >>".encode('ascii'))
+        self._emit_object(_PDF_CATALOG, f"<< /Type /Catalog /Pages {_PDF_PAGES} 0 R >>".encode('ascii'))
+        self._emit_object(_PDF_FONT, (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /STSong-Light /Encoding /UniGB-UTF16-H "
+            f"/DescendantFonts [{_PDF_CID_FONT} 0 R] /ToUnicode {_PDF_TO_UNICODE} 0 R >>").encode('ascii'))
+        # Adobe-GB1 中 CID 1-95 为 ASCII 字符，统一为半个字号宽，保证与折行列宽一致
+        self._emit_object(_PDF_CID_FONT, (
+            f"<< /Type /Font /Subtype /CIDFontType0 /BaseFont /STSong-Light "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (GB1) /Supplement 4 >> "
+            f"/FontDescriptor {_PDF_FONT_DESCRIPTOR} 0 R /DW 1000 /W [1 95 500] >>").encode('ascii'))
+        self._emit_object(_PDF_FONT_DESCRIPTOR, (
+            "<< /Type /FontDescriptor /FontName /STSong-Light /Flags 6 /FontBBox [-25 -254 1000 880] "
+            "/ItalicAngle 0 /Ascent 880 /Descent -120 /CapHeight 880 /StemV 93 >>").encode('ascii'))
+        cmap = zlib.compress(_to_unicode_cmap())
+        self._emit_object(_PDF_TO_UNICODE, f"<< /Length {len(cmap)} /Filter /FlateDecode >>\nstream\n".encode('ascii')
+                          + cmap + b"\nendstream")
+
+        size = self.next_object
+        xref_position = self.position
+        entries = ["0000000000 65535 f \n"]
+        entries.extend(f"{self.offsets[number]:010d} 00000 n \n" if number in self.offsets else "0000000000 65535 f \n"
+                       for number in range(1, size))
+        self._emit(f"xref\n0 {size}\n{''.join(entries)}".encode('ascii'))
+        self._emit(f"trailer\n<< /Size {size} /Root {_PDF_CATALOG} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n"
+                   .encode('ascii'))
+        self.file.close()
+
+WRITERS = {'docx': DocxWriter, 'pdf': PdfWriter}
+
+class MergedOutput:
+    """
+    拼接文档输出流：写入 .txt 的同时写入各格式的分页文档（与 .txt 同名，扩展名为格式名）
+
+    可以代替 open(output_file, 'w', encoding='utf-8') 返回的文件对象，供 write() 和 shutil.copyfileobj 使用
+    """
+
+    def __init__(self, text_file: Path, formats: Iterable[str] = (), header: str = ''):
+        self.text_file = Path(text_file)
+        self.text = open(self.text_file, 'w', encoding='utf-8')
+        self.writers: List[PagedWriter] = []
+        try:
+            for document_format in formats:
+                self.writers.append(WRITERS[document_format](self.text_file.with_suffix(f".{document_format}"), header))
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def documents(self) -> List[Path]:
+        """分页文档的路径"""
+        return [writer.path for writer in self.writers]
+
+    def write(self, text: str):
+        self.text.write(text)
+        for writer in self.writers:
+            writer.write(text)
+
+    def write_file(self, path: Path):
+        """
+        追加 UTF-8 文本文件（换行符为 \\n）的内容
+
+        不生成分页文档且文本模式不转换换行符时，按字节（copy_file_bytes）追加到 .txt，不解码再编码
+        """
+        if self.writers or os.linesep != '\n':
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                shutil.copyfileobj(f, self, STREAM_CHUNK_SIZE)
+            return
+
+        self.text.flush()
+        copy_file_bytes(path, self.text.fileno())
+        # 文件位置已在文本层之外移动，重新定位到末尾
+        self.text.seek(0, os.SEEK_END)
+
+    def close(self):
+        try:
+            for writer in self.writers:
+                writer.close()
+        finally:
+            self.text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
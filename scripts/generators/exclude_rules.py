@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+源代码排除规则模块 (Python版本)
+功能：把 gitignore 风格的排除规则编译为集合和正则，供文件索引在遍历时使用
+
+规则语法（与 .gitignore 基本一致，不区分大小写）：
+- node_modules/      以 / 结尾只匹配目录，命中的目录在遍历时整体跳过
+- .DS_Store          不含 / 的规则匹配任意层级的文件名或目录名
+- *.log              只含一个 * 前缀的扩展名规则，按文件名后缀匹配
+- backend/docs/*.md  含 / 的规则按相对 output_sourcecode/ 的完整路径匹配，支持 * ? [] 和 **
+- !build/            以 ! 开头的规则重新包含（优先于所有排除规则）
+
+默认规则见 DEFAULT_EXCLUDE_RULES；ai-copyright-config.json 中的
+source_exclude 列表追加在默认规则之后
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+CONFIG_FILE_NAME = "ai-copyright-config.json"
+CONFIG_KEY = "source_exclude"
+
+# 默认排除规则：依赖目录、构建产物、版本控制及IDE目录、编译产物和临时文件
+DEFAULT_EXCLUDE_RULES = [
+    'node_modules/', 'target/', 'build/', 'dist/',
+    '.git/', '.svn/', '.hg/', '__pycache__/',
+    '.idea/', '.vscode/', '.gradle/', '.mvn/', '.cache/',
+    '*.class', '*.pyc', '*.pyo',
+    '*.log', '*.tmp', '*.temp', '*.bak', '*.backup'
+]
+
+GLOB_CHARS = set('*?[')
+
+def glob_to_regex(pattern: str) -> str:
+    """把 gitignore 风格的通配符转换为正则表达式（* 和 ? 不跨越 /）"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+class ExcludeRules:
+    """编译后的排除规则"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self.names = set()          # 匹配任意文件名或目录名
+        self.dir_names = set()      # 只匹配目录名
+        self.suffixes = set()       # 文件名后缀
+        name_globs, dir_name_globs = [], []
+        path_globs, dir_path_globs = [], []
+        negated = []
+
+        for raw in patterns:
+            pattern = raw.strip()
+            if not pattern or pattern.startswith('#'):
+                continue
+            self.patterns.append(pattern)
+
+            if pattern.startswith('!'):
+                negated.append(pattern[1:])
+                continue
+
+            pattern = pattern.lower()
+            dir_only = pattern.endswith('/')
+            pattern = pattern.strip('/') if dir_only else pattern
+            anchored = '/' in pattern.lstrip('/') or raw.strip().startswith('/')
+            pattern = pattern.lstrip('/')
+            if not pattern:
+                continue
+
+            if anchored:
+                (dir_path_globs if dir_only else path_globs).append(glob_to_regex(pattern))
+            elif not GLOB_CHARS & set(pattern):
+                (self.dir_names if dir_only else self.names).add(pattern)
+            elif (not dir_only and pattern.startswith('*.') and
+                  not GLOB_CHARS & set(pattern[1:])):
+                self.suffixes.add(pattern[1:])
+            else:
+                (dir_name_globs if dir_only else name_globs).append(glob_to_regex(pattern))
+
+        self.suffix_tuple = tuple(self.suffixes)
+        self.name_regex = self._compile(name_globs)
+        self.dir_name_regex = self._compile(name_globs + dir_name_globs)
+        self.path_regex = self._compile(path_globs)
+        self.dir_path_regex = self._compile(path_globs + dir_path_globs)
+        self.include = ExcludeRules(negated) if negated else None
+
+    @staticmethod
+    def _compile(regexes: List[str]):
+        if not regexes:
+            return None
+        return re.compile('|'.join(f"(?:{regex})" for regex in regexes))
+
+    def _matches_dir(self, rel_path: str, name: str) -> bool:
+        return (name in self.names or
+                name in self.dir_names or
+                (self.dir_name_regex is not None and self.dir_name_regex.fullmatch(name) is not None) or
+                (self.dir_path_regex is not None and self.dir_path_regex.fullmatch(rel_path) is not None))
+
+    def _matches_file(self, rel_path: str, name: str) -> bool:
+        return (name in self.names or
+                (self.suffix_tuple and name.endswith(self.suffix_tuple)) or
+                (self.name_regex is not None and self.name_regex.fullmatch(name) is not None) or
+                (self.path_regex is not None and self.path_regex.fullmatch(rel_path) is not None))
+
+    def excludes_dir(self, rel_path: str) -> bool:
+        """目录（相对路径，/ 分隔）是否应在遍历时整体跳过"""
+        rel_path = rel_path.lower()
+        name = rel_path.rsplit('/', 1)[-1]
+        if not self._matches_dir(rel_path, name):
+            return False
+        return self.include is None or not self.include._matches_dir(rel_path, name)
+
+    def excludes_file(self, rel_path: str) -> bool:
+        """文件（相对路径，/ 分隔）是否应被排除"""
+        rel_path = rel_path.lower()
+        name = rel_path.rsplit('/', 1)[-1]
+        if not self._matches_file(rel_path, name):
+            return False
+        return self.include is None or not self.include._matches_file(rel_path, name)
+
+def load_exclude_rules(config_file: Optional[Path] = None) -> ExcludeRules:
+    """
+    读取排除规则：默认规则加上配置文件中的 source_exclude 列表
+
+    配置文件不存在、格式错误或未设置 source_exclude 时只使用默认规则
+    """
+    patterns = list(DEFAULT_EXCLUDE_RULES)
+    config_file = Path(config_file) if config_file is not None else Path(CONFIG_FILE_NAME)
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            extra = json.load(f).get(CONFIG_KEY, [])
+    except (OSError, ValueError, AttributeError):
+        extra = []
+
+    if isinstance(extra, str):
+        extra = [extra]
+    if isinstance(extra, list):
+        patterns.extend(str(pattern) for pattern in extra)
+    return ExcludeRules(patterns)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+后端源文件分类与排序清单模块 (Python版本)
+功能：按声明式规则表把后端源文件分为构建配置、配置文件、启动类、实体、数据访问、业务逻辑、
+控制器等类别，按各后端技术的排序策略得到拼接顺序，并把结果保存为清单供生成脚本和拼接脚本复用
+
+分类规则（依次判断，命中即停止）：
+1. 文件名表：pom.xml、package.json、go.mod 等构建文件
+2. 扩展名表：.yml/.yaml、.properties、.sql、.md 等
+3. 入口文件名表：main.py、app.js、main.go 等
+4. 类名后缀（Java、Kotlin、C# 等）：UserController、UserServiceImpl、UserDTO、OrderVO ...
+5. 其他语言的文件名最后一段：user.controller.ts、user_service.go、models.py、views.py
+6. 目录（Java 包）层次：从最深的目录向上，按完整目录名匹配 entity、mapper、service、controller ...
+
+目录名和类名都按完整单词匹配，favorite、provider 等名称不会被误判为 VO
+
+排序策略：ORDERING_POLICIES 按后端技术定义类别顺序，同类文件按相对路径排列；
+ai-copyright-config.json 中的 backend_file_order 列表可以调整类别顺序（未列出的类别保持默认顺序排在后面）
+
+清单缓存：output_docs/.cache/backend_manifest.json，只与文件相对路径和排序策略有关，
+文件内容修改不会使清单失效；新增、删除、重命名文件或修改排序策略时重新分类
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Union
+
+from file_index import PROJECT_ROOT, get_file_index
+from exclude_rules import CONFIG_FILE_NAME
+
+CLASSIFIER_VERSION = 1
+ORDER_CONFIG_KEY = "backend_file_order"
+MANIFEST_FILE_NAME = "backend_manifest.json"
+CACHE_DIR_NAME = ".cache"
+
+# 类别及其在报告中的名称
+CATEGORY_LABELS = {
+    'build': '构建配置',
+    'settings': '配置文件',
+    'properties': '属性文件',
+    'main': '启动入口',
+    'entity': '实体',
+    'mapper': '数据访问',
+    'service': '业务逻辑',
+    'controller': '控制器',
+    'dto': 'DTO',
+    'vo': 'VO',
+    'configuration': '配置类',
+    'util': '工具类',
+    'sql': 'SQL脚本',
+    'other': '其他',
+    'docs': '文档',
+}
+
+# 1. 构建文件（小写文件名）和构建文件扩展名
+BUILD_FILES = {
+    'pom.xml', 'build.gradle', 'build.gradle.kts', 'settings.gradle', 'settings.gradle.kts',
+    'package.json', 'requirements.txt', 'pyproject.toml', 'setup.py', 'setup.cfg', 'pipfile',
+    'go.mod', 'composer.json', 'gemfile', 'cargo.toml', 'cmakelists.txt', 'makefile',
+}
+BUILD_SUFFIXES = {'.csproj', '.sln', '.gradle'}
+
+# 2. 扩展名
+SUFFIX_CATEGORIES = {
+    '.yml': 'settings', '.yaml': 'settings', '.toml': 'settings', '.ini': 'settings',
+    '.cfg': 'settings', '.conf': 'settings', '.env': 'settings',
+    '.properties': 'properties',
+    '.sql': 'sql',
+    '.md': 'docs', '.txt': 'docs',
+}
+
+# 3. 入口文件（小写文件名）
+MAIN_FILES = {
+    'main.py', 'app.py', 'manage.py', 'wsgi.py', 'asgi.py',
+    'main.go', 'app.js', 'server.js', 'main.js', 'app.ts', 'server.ts', 'main.ts',
+    'program.cs', 'startup.cs', 'index.php', 'main.rs', 'main.kt',
+}
+
+# 4. 类名后缀，只用于以下扩展名；后缀前不能紧跟大写字母（UserDTO 命中 DTO，ADTO 不命中）
+CLASS_SUFFIXES = {
+    'Application': 'main',
+    'Entity': 'entity', 'Model': 'entity', 'PO': 'entity', 'Po': 'entity',
+    'Mapper': 'mapper', 'Repository': 'mapper', 'Dao': 'mapper', 'DAO': 'mapper',
+    'Service': 'service',
+    'Controller': 'controller', 'Resource': 'controller',
+    'DTO': 'dto', 'Dto': 'dto', 'Request': 'dto', 'Param': 'dto', 'Query': 'dto', 'Form': 'dto',
+    'VO': 'vo', 'Vo': 'vo',
+    'Config': 'configuration', 'Configuration': 'configuration', 'Properties': 'configuration',
+    'Util': 'util', 'Utils': 'util', 'Helper': 'util', 'Tool': 'util', 'Tools': 'util',
+}
+CLASS_NAME_SUFFIXES = {'.java', '.kt', '.scala', '.groovy', '.cs', '.php', '.swift'}
+# 实现类按接口归类：UserServiceImpl -> Service
+IMPL_SUFFIX = 'Impl'
+
+# 5、6. 完整目录名或文件名最后一段中的层次名称（小写）
+LAYER_NAMES = {
+    'entity': ('entity', 'entities', 'model', 'models', 'domain', 'po', 'pojo', 'bean', 'beans'),
+    'mapper': ('mapper', 'mappers', 'dao', 'daos', 'repository', 'repositories', 'repo'),
+    'service': ('service', 'services'),
+    'controller': ('controller', 'controllers', 'web', 'api', 'rest', 'handler', 'handlers',
+                   'routes', 'router', 'routers', 'views'),
+    'dto': ('dto', 'dtos', 'request', 'requests', 'param', 'params', 'form', 'forms',
+            'schema', 'schemas', 'serializers'),
+    'vo': ('vo', 'vos'),
+    'configuration': ('config', 'configs', 'configuration', 'conf', 'settings'),
+    'util': ('util', 'utils', 'helper', 'helpers', 'tool', 'tools'),
+}
+
+# 各后端技术的类别顺序；未列出的类别与 other 同级
+# 分层架构（Spring Boot 等）：实体 -> 数据访问 -> 业务逻辑 -> 控制器 -> DTO/VO -> 配置类 -> 工具类
+LAYERED_ORDER = ['build', 'settings', 'properties', 'main', 'entity', 'mapper', 'service', 'controller',
+                 'dto', 'vo', 'configuration', 'util', 'sql', 'other', 'docs']
+# 脚本语言（Django/FastAPI、Express/NestJS、Go 等）：配置模块在前，数据结构先于使用它们的路由
+MODULE_ORDER = ['build', 'settings', 'properties', 'main', 'configuration', 'entity', 'mapper', 'dto', 'vo',
+                'service', 'controller', 'util', 'sql', 'other', 'docs']
+
+ORDERING_POLICIES = {
+    'Java': LAYERED_ORDER,
+    'Kotlin': LAYERED_ORDER,
+    'C#': LAYERED_ORDER,
+    'PHP': LAYERED_ORDER,
+    'Python': MODULE_ORDER,
+    'JavaScript': MODULE_ORDER,
+    'Node.js': MODULE_ORDER,
+    'Go': MODULE_ORDER,
+}
+DEFAULT_ORDER = LAYERED_ORDER
+
+OrderingPolicy = namedtuple('OrderingPolicy', ['tech', 'order'])
+ManifestEntry = namedtuple('ManifestEntry', ['rel_path', 'category'])
+
+_LAYERS = {name: category for category, names in LAYER_NAMES.items() for name in names}
+_CLASS_SUFFIX = re.compile(
+    r'(?<![A-Z])(?:' + '|'.join(sorted(CLASS_SUFFIXES, key=len, reverse=True)) + r')$')
+_NAME_SEPARATORS = re.compile(r'[._-]')
+
+def classify_file(rel_path: str) -> str:
+    """按规则表对相对后端目录的 POSIX 风格路径分类，返回 CATEGORY_LABELS 中的类别"""
+    directories, _, name = rel_path.rpartition('/')
+    lower_name = name.lower()
+    stem, suffix = os.path.splitext(name)
+    suffix = suffix.lower()
+
+    if lower_name in BUILD_FILES or suffix in BUILD_SUFFIXES:
+        return 'build'
+    category = SUFFIX_CATEGORIES.get(suffix)
+    if category:
+        return category
+    if lower_name in MAIN_FILES:
+        return 'main'
+
+    if suffix in CLASS_NAME_SUFFIXES:
+        if stem.endswith(IMPL_SUFFIX) and len(stem) > len(IMPL_SUFFIX):
+            stem = stem[:-len(IMPL_SUFFIX)]
+        match = _CLASS_SUFFIX.search(stem)
+        if match:
+            return CLASS_SUFFIXES[match.group()]
+    else:
+        category = _LAYERS.get(_NAME_SEPARATORS.split(stem)[-1].lower())
+        if category:
+            return category
+
+    if directories:
+        for directory in reversed(directories.lower().split('/')):
+            category = _LAYERS.get(directory)
+            if category:
+                return category
+    return 'other'
+
+def load_ordering_policy(config_file: Optional[Path] = None, tech: Optional[str] = None) -> OrderingPolicy:
+    """
+    读取排序策略：配置文件中 backend 对应的默认顺序，按 backend_file_order 调整
+
+    tech 不为 None 时代替配置文件中的 backend；配置文件不存在或格式错误时按 Java 处理
+    """
+    config_file = Path(config_file) if config_file is not None else PROJECT_ROOT / CONFIG_FILE_NAME
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            config = {}
+    except (OSError, ValueError):
+        config = {}
+
+    tech = tech or config.get('backend') or 'Java'
+    order = list(ORDERING_POLICIES.get(tech, DEFAULT_ORDER))
+    custom = config.get(ORDER_CONFIG_KEY)
+    if isinstance(custom, str):
+        custom = [custom]
+    if isinstance(custom, list):
+        preferred = [category for category in dict.fromkeys(map(str, custom)) if category in CATEGORY_LABELS]
+        order = preferred + [category for category in order if category not in preferred]
+    return OrderingPolicy(str(tech), order)
+
+class BackendManifest:
+    """后端源文件的分类结果和拼接顺序"""
+
+    def __init__(self, backend_dir: Union[str, Path], policy: OrderingPolicy, entries: List[ManifestEntry]):
+        self.backend_dir = os.path.abspath(backend_dir)
+        self.policy = policy
+        self.entries = entries
+        self.positions = {os.path.join(self.backend_dir, *entry.rel_path.split('/')): position
+                          for position, entry in enumerate(entries)}
+        self.categories = {entry.rel_path: entry.category for entry in entries}
+
+    def sort(self, paths: Iterable[Union[str, Path]]) -> list:
+        """按清单顺序排列文件路径（绝对路径），清单中没有的文件按原顺序排在最后"""
+        last = len(self.positions)
+        return sorted(paths, key=lambda path: self.positions.get(str(path), last))
+
+    def category(self, rel_path: Union[str, Path]) -> str:
+        """相对后端目录的文件路径对应的类别，清单中没有时现场分类"""
+        rel_path = Path(rel_path).as_posix()
+        return self.categories.get(rel_path) or classify_file(rel_path)
+
+def order_entries(rel_paths: Iterable[str], policy: OrderingPolicy) -> List[ManifestEntry]:
+    """分类并按策略排序：类别顺序优先，同类文件按相对路径（忽略大小写）排列"""
+    ranks = {category: rank for rank, category in enumerate(policy.order)}
+    other_rank = ranks.get('other', len(ranks))
+    entries = [ManifestEntry(rel_path, classify_file(rel_path)) for rel_path in rel_paths]
+    entries.sort(key=lambda entry: (ranks.get(entry.category, other_rank), entry.rel_path.lower(), entry.rel_path))
+    return entries
+
+def _signature(rel_paths: List[str], policy: OrderingPolicy) -> str:
+    digest = hashlib.sha256(f"{CLASSIFIER_VERSION}\n{policy.tech}\n{','.join(policy.order)}\n".encode('utf-8'))
+    for rel_path in rel_paths:
+        digest.update(rel_path.encode('utf-8', 'surrogateescape'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+def _load_manifest_file(manifest_file: Path, signature: str) -> Optional[List[ManifestEntry]]:
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('signature') != signature:
+        return None
+    try:
+        return [ManifestEntry(rel_path, category) for rel_path, category in data['files']]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def _save_manifest_file(manifest_file: Path, signature: str, policy: OrderingPolicy, entries: List[ManifestEntry]):
+    try:
+        manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = manifest_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CLASSIFIER_VERSION, 'signature': signature, 'tech': policy.tech,
+                       'order': policy.order, 'files': [list(entry) for entry in entries]},
+                      f, ensure_ascii=False)
+        os.replace(tmp_file, manifest_file)
+    except OSError:
+        # 清单只是缓存，写入失败不影响本次结果
+        pass
+
+_manifests: Dict[tuple, BackendManifest] = {}
+
+def get_backend_manifest(backend_dir: Union[str, Path], policy: Optional[OrderingPolicy] = None,
+                         output_dir: Union[str, Path, None] = None, use_cache: bool = True) -> BackendManifest:
+    """
+    获取后端目录的分类清单，包含文件索引中该目录下的全部文件
+
+    文件列表和排序策略与 output_dir/.cache/backend_manifest.json 一致时直接使用其中的分类和顺序，
+    否则重新分类并更新清单文件；同一进程内只计算一次
+    """
+    backend_dir = os.path.abspath(backend_dir)
+    policy = policy if policy is not None else load_ordering_policy()
+    key = (backend_dir, policy.tech, tuple(policy.order))
+    manifest = _manifests.get(key)
+    if manifest is not None:
+        return manifest
+
+    index = get_file_index(os.path.dirname(backend_dir))
+    prefix_length = len(os.path.basename(backend_dir)) + 1
+    rel_paths = [entry.rel_path[prefix_length:] for entry in index.files(backend_dir)]
+    signature = _signature(rel_paths, policy)
+
+    output_dir = Path(output_dir) if output_dir is not None else PROJECT_ROOT / "output_docs"
+    manifest_file = output_dir / CACHE_DIR_NAME / MANIFEST_FILE_NAME
+    entries = _load_manifest_file(manifest_file, signature) if use_cache else None
+    if entries is None:
+        entries = order_entries(rel_paths, policy)
+        if use_cache:
+            _save_manifest_file(manifest_file, signature, policy, entries)
+
+    manifest = BackendManifest(backend_dir, policy, entries)
+    _manifests[key] = manifest
+    return manifest
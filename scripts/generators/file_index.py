@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+源代码目录文件索引模块 (Python版本)
+功能：用 os.scandir 遍历一次 output_sourcecode/，建立内存中的文件索引，
+供生成脚本、拼接脚本和质量检查工具共享
+
+特点：
+- 每个进程只遍历一次目录树，同一根目录的索引会被缓存复用
+- 记录每个文件的路径、扩展名、大小和修改时间，筛选时无需再次 stat
+- 按排除规则（见 exclude_rules.py，可在 ai-copyright-config.json 中配置）在遍历时
+  整体跳过 node_modules、target、.git 等目录，被排除的文件不进入索引
+- 通过 files() 按子目录、扩展名、是否递归等条件得到筛选视图
+"""
+
+import os
+from pathlib import Path
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Union
+
+from exclude_rules import CONFIG_FILE_NAME, ExcludeRules, load_exclude_rules
+
+# 项目根目录及默认索引的源代码目录
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SOURCE_ROOT = PROJECT_ROOT / "output_sourcecode"
+
+class FileEntry(namedtuple('FileEntry', ['path', 'rel_path', 'suffix', 'size', 'mtime_ns'])):
+    """
+    索引中的一个文件
+
+    path 为绝对路径，rel_path 为相对索引根目录的 POSIX 风格路径，suffix 为小写扩展名
+    """
+    __slots__ = ()
+
+    @property
+    def name(self) -> str:
+        return self.rel_path.rsplit('/', 1)[-1]
+
+class FileIndex:
+    """某个根目录下全部文件的索引"""
+
+    def __init__(self, root: Union[str, Path], rules: Optional[ExcludeRules] = None):
+        self.root = Path(os.path.abspath(root))
+        # 默认读取与 output_sourcecode/ 同级的项目配置文件中的规则
+        self.rules = rules if rules is not None else load_exclude_rules(self.root.parent / CONFIG_FILE_NAME)
+        self.entries: List[FileEntry] = self._scan()
+
+    def _scan(self) -> List[FileEntry]:
+        """用 os.scandir 遍历目录树，不跟随目录符号链接"""
+        rules = self.rules
+        entries = []
+        stack = [(str(self.root), '')]
+
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                iterator = os.scandir(directory)
+            except OSError:
+                continue
+
+            with iterator:
+                for item in iterator:
+                    rel_path = rel_dir + item.name
+                    try:
+                        if item.is_dir(follow_symlinks=False):
+                            if not rules.excludes_dir(rel_path):
+                                stack.append((item.path, rel_path + '/'))
+                        elif item.is_file() and not rules.excludes_file(rel_path):
+                            stat = item.stat()
+                            entries.append(FileEntry(
+                                item.path,
+                                rel_path,
+                                os.path.splitext(item.name)[1].lower(),
+                                stat.st_size,
+                                stat.st_mtime_ns
+                            ))
+                    except OSError:
+                        continue
+
+        entries.sort(key=lambda entry: entry.rel_path.lower())
+        return entries
+
+    def _prefix(self, directory: Union[str, Path, None]) -> str:
+        """把子目录路径转换为 rel_path 前缀"""
+        if directory is None:
+            return ''
+        prefix = Path(os.path.relpath(os.path.abspath(directory), self.root)).as_posix()
+        return '' if prefix == '.' else prefix + '/'
+
+    def exists(self, directory: Union[str, Path, None] = None) -> bool:
+        """子目录下是否存在任何（未被剪枝的）文件"""
+        prefix = self._prefix(directory)
+        return any(entry.rel_path.startswith(prefix) for entry in self.entries)
+
+    def files(self, directory: Union[str, Path, None] = None,
+              suffixes: Optional[Iterable[str]] = None,
+              recursive: bool = True,
+              exclude_dirs: Iterable[str] = ()) -> List[FileEntry]:
+        """
+        返回筛选后的文件视图，按相对路径（忽略大小写）排序
+
+        directory    : 子目录路径，默认为整个索引
+        suffixes     : 只保留这些扩展名（小写，含点号）
+        recursive    : 为 False 时只保留子目录下一层的文件
+        exclude_dirs : 额外排除路径中包含这些目录名的文件
+        """
+        prefix = self._prefix(directory)
+        suffixes = {suffix.lower() for suffix in suffixes} if suffixes is not None else None
+        exclude_dirs = set(exclude_dirs)
+
+        result = []
+        for entry in self.entries:
+            if not entry.rel_path.startswith(prefix):
+                continue
+            if suffixes is not None and entry.suffix not in suffixes:
+                continue
+            rest = entry.rel_path[len(prefix):]
+            if not recursive and '/' in rest:
+                continue
+            if exclude_dirs and not exclude_dirs.isdisjoint(rest.split('/')[:-1]):
+                continue
+            result.append(entry)
+        return result
+
+_indexes: Dict[str, FileIndex] = {}
+
+def get_file_index(root: Union[str, Path, None] = None, refresh: bool = False) -> FileIndex:
+    """
+    获取根目录（默认 output_sourcecode/）的文件索引，同一进程内只遍历一次
+
+    目录内容在本进程中被修改后，传入 refresh=True 重新遍历
+    """
+    root = Path(root) if root is not None else SOURCE_ROOT
+    key = os.path.realpath(root)
+
+    index = _indexes.get(key)
+    if index is None or refresh:
+        index = FileIndex(root)
+        _indexes[key] = index
+    return index
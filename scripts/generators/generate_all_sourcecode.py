@@ -6,11 +6,42 @@
 """
 
 import os
+import importlib
 import subprocess
 import sys
 from datetime import datetime
 
-def run_script(script_name, description):
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def run_script_in_process(script_name, description):
+    """
+    在当前进程内导入脚本模块并调用其 main()
+    """
+    module_name = os.path.splitext(script_name)[0]
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    
+    # 被调用脚本按自身的命令行参数解析，不能看到本脚本的参数
+    saved_argv = sys.argv
+    sys.argv = [os.path.join(SCRIPT_DIR, script_name)]
+    try:
+        exit_code = importlib.import_module(module_name).main()
+    except SystemExit as e:
+        exit_code = e.code
+    except Exception as e:
+        print(f"❌ 执行 {description} 时出错: {e}")
+        return False
+    finally:
+        sys.argv = saved_argv
+    
+    if exit_code is None or exit_code == 0:
+        print(f"✅ {description} 执行成功！")
+        return True
+    
+    print(f"❌ {description} 执行失败！")
+    return False
+
+def run_script(script_name, description, in_process=False):
     """
     运行指定的脚本
     """
@@ -19,14 +50,20 @@ def run_script(script_name, description):
     print(f"脚本: {script_name}")
     print(f"{'='*60}")
     
+    # 脚本与本文件位于同一目录
+    script_path = os.path.join(SCRIPT_DIR, script_name)
+    
     try:
         # 检查脚本是否存在
-        if not os.path.exists(script_name):
-            print(f"❌ 错误：脚本文件不存在 {script_name}")
+        if not os.path.exists(script_path):
+            print(f"❌ 错误：脚本文件不存在 {script_path}")
             return False
         
+        if in_process:
+            return run_script_in_process(script_name, description)
+        
         # 运行脚本
-        result = subprocess.run([sys.executable, script_name], 
+        result = subprocess.run([sys.executable, script_path], 
                                capture_output=True, 
                                text=True, 
                                encoding='utf-8')
@@ -54,6 +91,9 @@ def main():
     print("="*80)
     print(f"开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # --in-process: 在当前进程内调用各生成脚本，省去子解释器启动开销
+    in_process = '--in-process' in sys.argv[1:]
+    
     # 定义要执行的脚本
     scripts = [
         ("generate_frontend_sourcecode.py", "前端源代码文档生成"),
@@ -65,7 +105,7 @@ def main():
     
     # 逐个执行脚本
     for script_name, description in scripts:
-        if run_script(script_name, description):
+        if run_script(script_name, description, in_process):
             success_count += 1
     
     # 输出总结
@@ -7,83 +7,28 @@
 """
 
 import os
-import glob
 from datetime import datetime
 
-def get_file_type_priority(file_path):
-    """
-    获取文件类型优先级，用于排序
-    """
-    if file_path.endswith('pom.xml'):
-        return 1
-    elif file_path.endswith('.yml') or file_path.endswith('.yaml'):
-        return 2
-    elif file_path.endswith('.properties'):
-        return 3
-    elif file_path.endswith('Application.java'):
-        return 4
-    elif 'entity' in file_path.lower():
-        return 5
-    elif 'mapper' in file_path.lower():
-        return 6
-    elif 'service' in file_path.lower():
-        return 7
-    elif 'controller' in file_path.lower():
-        return 8
-    elif 'dto' in file_path.lower():
-        return 9
-    elif 'vo' in file_path.lower():
-        return 10
-    elif 'config' in file_path.lower():
-        return 11
-    elif 'util' in file_path.lower():
-        return 12
-    else:
-        return 13
+from file_index import get_file_index
+from file_classifier import get_backend_manifest
 
 def extract_backend_files(backend_dir):
     """
     提取后端目录中的所有源代码文件
     """
-    file_patterns = [
-        '**/*.java',
-        '**/*.xml',
-        '**/*.yml',
-        '**/*.yaml',
-        '**/*.properties',
-        '**/*.sql'
-    ]
-    
-    all_files = []
-    if os.path.exists(backend_dir):
-        for pattern in file_patterns:
-            files = glob.glob(os.path.join(backend_dir, pattern), recursive=True)
-            all_files.extend(files)
-    
-    # 过滤掉一些不需要的文件
-    excluded_patterns = [
-        'target/',
-        '.class',
-        'test/',
-        'Test.java',
-        '.git/',
-        'node_modules/'
-    ]
+    source_suffixes = {'.java', '.xml', '.yml', '.yaml', '.properties', '.sql'}
     
+    # 从共享的文件索引中筛选；target、.git、node_modules 等目录在遍历时已整体跳过，
+    # 这里额外排除 test 目录和测试类
     filtered_files = []
-    for file_path in all_files:
-        should_exclude = False
-        for pattern in excluded_patterns:
-            if pattern in file_path:
-                should_exclude = True
-                break
-        if not should_exclude:
-            filtered_files.append(file_path)
-    
-    # 按照文件类型和路径排序
-    filtered_files.sort(key=lambda x: (get_file_type_priority(x), x))
+    if os.path.exists(backend_dir):
+        index = get_file_index(os.path.dirname(backend_dir))
+        for entry in index.files(backend_dir, suffixes=source_suffixes, exclude_dirs={'test'}):
+            if not entry.name.endswith('Test.java'):
+                filtered_files.append(entry.path)
     
-    return filtered_files
+    # 按分类清单排序：类别顺序由 ai-copyright-config.json 中的 backend 技术决定（见 file_classifier.py）
+    return get_backend_manifest(backend_dir).sort(filtered_files)
 
 def get_relative_path(file_path, backend_dir):
     """
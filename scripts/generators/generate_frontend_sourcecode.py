@@ -16,87 +16,176 @@ CSS处理策略：
 
 import os
 import re
+import sys
 import math
+import argparse
+import html.parser
 
-def remove_css_content(html_content):
+from token_estimator import get_token_counter
+from batch_planner import BATCH_HEADER_TOKENS, BATCH_STRATEGIES, DEFAULT_BATCH_STRATEGY, plan_batches
+from boilerplate_dedup import COMMON_SECTION_TITLE, deduplicate_pages, render_components_section
+
+CSS_BLOCK_PLACEHOLDER = '\n    <!-- CSS样式已省略，完整CSS请查看原始HTML文件 -->\n'
+CSS_LINK_PLACEHOLDER = '    <!-- CSS外部链接已省略 -->'
+READ_CHUNK_SIZE = 64 * 1024
+
+# 仅作用于单个开始标签文本，用于去掉其中的 style="..." 属性
+INLINE_STYLE_ATTR = re.compile(r'\s+style\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+
+class CSSStripper(html.parser.HTMLParser):
     """
-    彻底移除HTML中的CSS样式内容，只保留HTML结构和JavaScript逻辑
+    流式CSS剥离器，基于 html.parser 的事件流对输入做一次前向扫描：
+    - <style> 块整体替换为省略标记
+    - rel="stylesheet" 的 <link> 替换为省略标记
+    - 开始标签中的 style 属性被移除
+    其余内容（标签、文本、实体、注释、声明、脚本）按原文逐字输出：
+    每个事件从上一个事件结束处开始，两个事件开始位置之间的原文即为前一个事件的原文
     """
-    # 移除 <style> 标签及其内容
-    html_content = re.sub(r'<style[^>]*>.*?</style>', 
-                         '\n    <!-- CSS样式已省略，完整CSS请查看原始HTML文件 -->\n', 
-                         html_content, flags=re.DOTALL)
     
-    # 移除CSS外部链接（保留JavaScript和字体链接）
-    html_content = re.sub(r'<link[^>]*rel=["\']stylesheet["\'][^>]*>', 
-                         '    <!-- CSS外部链接已省略 -->', 
-                         html_content, flags=re.IGNORECASE)
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self._parts = []
+        self._in_style = False
+        # 已输入内容的行首偏移，用于把 getpos() 换算为绝对偏移
+        self._line_starts = [0]
+        self._fed = 0
+        # 尚未输出的原文（从 _source_start 开始），以及上一个事件的开始位置和是否按原文输出
+        self._source = ''
+        self._source_start = 0
+        self._mark = 0
+        self._keep = True
     
-    # 移除内联样式属性
-    html_content = re.sub(r'\s+style=["\'][^"\']*["\']', '', html_content)
+    def feed(self, data):
+        self._line_starts.extend(self._fed + match.end() for match in re.finditer('\n', data))
+        self._fed += len(data)
+        self._source = self._source[self._mark - self._source_start:] + data
+        self._source_start = self._mark
+        super().feed(data)
     
-    # 移除CSS相关的class属性（可选，保留功能性class）
-    # 这里我们保留class属性，因为它们可能对JavaScript功能重要
+    def close(self):
+        super().close()
+        self._flush(self._fed, True)
     
-    return html_content
+    def _flush(self, offset, keep):
+        """输出上一个事件的原文（keep 为 False 的事件已自行输出或需要丢弃），offset 处开始新的事件"""
+        if self._keep:
+            self._parts.append(self._source[self._mark - self._source_start:offset - self._source_start])
+        self._mark = offset
+        self._keep = keep
+    
+    def _event(self, keep=True):
+        line, column = self.getpos()
+        self._flush(self._line_starts[line - 1] + column, keep and not self._in_style)
+    
+    def _emit_starttag(self, tag, attrs):
+        if tag == 'link':
+            rel = next((value or '' for name, value in attrs if name == 'rel'), '')
+            if 'stylesheet' in rel.lower().split():
+                self._event(keep=False)
+                self._parts.append(CSS_LINK_PLACEHOLDER)
+                return
+        
+        if any(name == 'style' for name, _ in attrs):
+            self._event(keep=False)
+            self._parts.append(INLINE_STYLE_ATTR.sub('', self.get_starttag_text()))
+            return
+        self._event()
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'style':
+            self._event(keep=False)
+            self._in_style = True
+            self._parts.append(CSS_BLOCK_PLACEHOLDER)
+            return
+        self._emit_starttag(tag, attrs)
+    
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'style':
+            # 自闭合的 <style/> 没有内容，只输出省略标记
+            self._event(keep=False)
+            self._parts.append(CSS_BLOCK_PLACEHOLDER)
+            return
+        self._emit_starttag(tag, attrs)
+    
+    def handle_endtag(self, tag):
+        self._event()
+        if tag == 'style':
+            # 结束标签本身也属于省略的 <style> 块
+            self._keep = False
+            self._in_style = False
+    
+    def handle_data(self, data):
+        self._event()
+    
+    def handle_entityref(self, name):
+        self._event()
+    
+    def handle_charref(self, name):
+        self._event()
+    
+    def handle_comment(self, data):
+        self._event()
+    
+    def handle_decl(self, decl):
+        self._event()
+    
+    def handle_pi(self, data):
+        self._event()
+    
+    def unknown_decl(self, data):
+        self._event()
+    
+    def getvalue(self):
+        """返回目前为止已剥离CSS的内容"""
+        pending = self._source[self._mark - self._source_start:self._fed - self._source_start] if self._keep else ''
+        return ''.join(self._parts) + pending
 
-def estimate_tokens(text):
+def strip_css_stream(chunks):
+    """
+    对分块输入做单次流式CSS剥离，返回清理后的完整内容
+    """
+    stripper = CSSStripper()
+    for chunk in chunks:
+        stripper.feed(chunk)
+    stripper.close()
+    return stripper.getvalue()
+
+def remove_css_content(html_content):
     """
-    估算文本的token数量 (粗略估算：1 token ≈ 4 个字符)
+    彻底移除HTML中的CSS样式内容，只保留HTML结构和JavaScript逻辑
     """
-    return len(text) // 4
+    # 保留class属性，因为它们可能对JavaScript功能重要
+    return strip_css_stream([html_content])
 
-def split_content_by_token_limit(html_files, front_dir, max_tokens=30000):
+def read_clean_html(file_path, chunk_size=READ_CHUNK_SIZE):
     """
-    根据token限制智能分批HTML文件
+    分块读取HTML文件并在读取过程中剥离CSS，每个文件只读取一次
     """
-    batches = []
-    current_batch = []
-    current_tokens = 0
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return strip_css_stream(iter(lambda: f.read(chunk_size), ''))
+
+def load_clean_contents(html_files, front_dir):
+    """
+    读取并清理所有HTML文件，供分批和写入阶段共用
     
+    返回 {文件名: 清理后内容或读取异常}
+    """
+    clean_contents = {}
     for html_file in html_files:
-        file_path = os.path.join(front_dir, html_file)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # 移除CSS后估算token数
-            clean_content = remove_css_content(content)
-            file_tokens = estimate_tokens(clean_content)
-            
-            # 如果单个文件就超过限制，需要进一步处理
-            if file_tokens > max_tokens:
-                # 如果当前批次不为空，先保存
-                if current_batch:
-                    batches.append(current_batch)
-                    current_batch = []
-                    current_tokens = 0
-                
-                # 将大文件单独作为一个批次（或进一步拆分）
-                batches.append([html_file])
-                print(f"⚠️  文件 {html_file} 较大 (~{file_tokens} tokens)，单独处理")
-                continue
-            
-            # 检查加入当前文件后是否超限
-            if current_tokens + file_tokens > max_tokens and current_batch:
-                # 保存当前批次，开始新批次
-                batches.append(current_batch)
-                current_batch = [html_file]
-                current_tokens = file_tokens
-            else:
-                # 加入当前批次
-                current_batch.append(html_file)
-                current_tokens += file_tokens
-                
+            clean_contents[html_file] = read_clean_html(os.path.join(front_dir, html_file))
         except Exception as e:
-            print(f"⚠️  读取文件 {html_file} 时出错: {e}")
-            current_batch.append(html_file)  # 仍然加入批次，稍后处理
-    
-    # 保存最后一个批次
-    if current_batch:
-        batches.append(current_batch)
+            clean_contents[html_file] = e
+    return clean_contents
+
+def estimate_tokens(text):
+    """
+    估算文本的token数量
     
-    return batches
+    默认使用中日韩字符感知的离线估算器（见 token_estimator.py），
+    可通过环境变量 AI_COPYRIGHT_TOKEN_COUNTER 切换计数后端 (heuristic/char4/tiktoken)
+    """
+    return get_token_counter().count(text)
 
 def compress_html_content(html_content, compression_level=1):
     """
@@ -113,8 +202,8 @@ def compress_html_content(html_content, compression_level=1):
         html_content = re.sub(r'^\s+', '', html_content, flags=re.MULTILINE)  # 移除行首空白
         
     if compression_level >= 2:
-        # 移除HTML注释
-        html_content = re.sub(r'<!--[^>]*-->', '', html_content, flags=re.DOTALL)
+        # 移除HTML注释（保留公共组件去重的引用标记）
+        html_content = re.sub(r'<!--(?! 公共组件 )[^>]*-->', '', html_content, flags=re.DOTALL)
         # 移除多余的标签属性（保留重要的id, class, onclick等）
         # 这里可以根据需要进一步定制
         
@@ -140,9 +229,32 @@ def extract_html_files(front_dir):
     html_files.sort()
     return html_files
 
-def generate_frontend_sourcecode():
+def dedup_clean_contents(html_files, clean_contents):
+    """
+    对已清理的页面内容做公共组件去重（见 boilerplate_dedup.py），原地替换 clean_contents 中的页面内容
+
+    存在公共组件时把“公共组件”部分作为第一个条目加入，返回新的文件列表
+    """
+    pages = {name: content for name, content in clean_contents.items() if not isinstance(content, Exception)}
+    result = deduplicate_pages(pages)
+    if not result.components:
+        print("\n🧩 公共组件去重: 未发现跨页面重复的组件")
+        return html_files
+
+    clean_contents.update(result.pages)
+    clean_contents[COMMON_SECTION_TITLE] = render_components_section(result.components)
+    saved = estimate_tokens(''.join(pages.values())) - sum(estimate_tokens(content) for content in
+                                                          [clean_contents[COMMON_SECTION_TITLE], *result.pages.values()])
+    print(f"\n🧩 公共组件去重: {len(result.components)} 个公共组件，"
+          f"{result.original_chars:,} → {result.deduplicated_chars:,} 字符 (约减少 {saved} tokens)")
+    return [COMMON_SECTION_TITLE] + list(html_files)
+
+def generate_frontend_sourcecode(strategy=DEFAULT_BATCH_STRATEGY, max_tokens=25000, split_oversized=True, dedup=False):
     """
     生成前端源代码文档
+    
+    strategy 为分批策略（见 batch_planner.py），split_oversized 控制是否在DOM边界处拆分超大页面，
+    dedup 为 True 时跨页面去除重复的公共组件
     """
     # 定义路径 (脚本移动到子目录后需要调整相对路径)
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # 回到项目根目录
@@ -164,13 +276,28 @@ def generate_frontend_sourcecode():
     for file in html_files:
         print(f"  - {file}")
     
+    # 每个文件只读取并清理一次，分批和写入阶段共用结果
+    clean_contents = load_clean_contents(html_files, front_dir)
+    
+    # 公共组件去重：各页面中重复的DOM子树和脚本函数只在“公共组件”部分输出一次
+    if dedup:
+        html_files = dedup_clean_contents(html_files, clean_contents)
+
     # 智能分批处理以避免token超限
-    print("\n🔍 分析文件大小并智能分批...")
-    batches = split_content_by_token_limit(html_files, front_dir, max_tokens=25000)
+    print(f"\n🔍 分析文件大小并智能分批 (策略: {strategy}, 上限: {max_tokens} tokens)...")
+    for html_file, content in clean_contents.items():
+        if isinstance(content, Exception):
+            print(f"⚠️  读取文件 {html_file} 时出错: {content}")
+    batches = plan_batches(html_files, clean_contents, max_tokens, estimate_tokens,
+                           strategy=strategy, split_oversized=split_oversized)
     
     print(f"📊 将生成 {len(batches)} 个文档文件:")
     for i, batch in enumerate(batches, 1):
-        print(f"  批次 {i}: {len(batch)} 个文件")
+        batch_tokens = sum(item.tokens for item in batch)
+        print(f"  批次 {i}: {len(batch)} 个文件/片段 (~{batch_tokens} tokens)")
+        for item in batch:
+            if item.label != item.name:
+                print(f"    ✂️  {item.label} (超大页面已按DOM边界拆分)")
     
     
     # 开始生成文档
@@ -193,24 +320,22 @@ def generate_frontend_sourcecode():
             # 写入批次说明头部
             if len(batches) > 1:
                 f.write(f"前端源代码文档 - 第 {batch_idx} 部分\n")
-                f.write(f"包含文件: {', '.join(batch)}\n")
+                f.write(f"包含文件: {', '.join(item.label for item in batch)}\n")
                 f.write(f"生成时间: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
                 f.write(f"{'='*80}\n\n")
             
             total_tokens = 0
             
             # 处理当前批次的每个HTML文件
-            for i, html_file in enumerate(batch, 1):
-                file_path = os.path.join(front_dir, html_file)
-                
+            for i, item in enumerate(batch, 1):
+                html_file = item.label
                 print(f"  处理文件 {i}/{len(batch)}: {html_file}")
                 
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as html_f:
-                        html_content = html_f.read()
-                    
-                    # 移除CSS内容
-                    html_content = remove_css_content(html_content)
+                    # 使用已清理CSS的内容（超大页面为拆分后的片段）
+                    html_content = item.content
+                    if html_content is None:
+                        raise clean_contents[item.name]
                     
                     # 如果内容仍然过大，进行压缩
                     file_tokens = estimate_tokens(html_content)
@@ -285,12 +410,24 @@ def main():
     """
     主函数
     """
+    parser = argparse.ArgumentParser(description='前端源代码拼接脚本')
+    parser.add_argument('--strategy', choices=BATCH_STRATEGIES, default=DEFAULT_BATCH_STRATEGY,
+                        help=f'分批策略 (默认: {DEFAULT_BATCH_STRATEGY})')
+    parser.add_argument('--max-tokens', type=int, default=25000, help='每个分段的token上限 (默认: 25000)')
+    parser.add_argument('--no-split', action='store_true', help='不拆分超大页面，超大页面单独成段')
+    parser.add_argument('--dedup', action='store_true',
+                        help='跨页面去重：重复的页头、侧边栏、页脚和脚本函数只在“公共组件”部分输出一次')
+    args = parser.parse_args(sys.argv[1:])
+    if args.max_tokens <= BATCH_HEADER_TOKENS:
+        parser.error(f"--max-tokens 必须大于分段头部预留的 {BATCH_HEADER_TOKENS} tokens")
+    
     print("=" * 60)
     print("前端源代码拼接脚本")
     print("=" * 60)
     
     try:
-        generate_frontend_sourcecode()
+        generate_frontend_sourcecode(strategy=args.strategy, max_tokens=args.max_tokens,
+                                     split_oversized=not args.no_split, dedup=args.dedup)
     except Exception as e:
         print(f"❌ 脚本执行失败: {e}")
         return 1
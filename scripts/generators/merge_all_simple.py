@@ -6,8 +6,10 @@
 功能：一键执行前端、后端、数据库所有代码的拼接，并生成完整的申请材料包
 
 特点：
-- 一键执行所有合并脚本
+- 一键执行所有合并脚本（前端、后端、数据库合并相互独立，默认并发执行）
 - 生成完整的申请材料清单
+- 可同时生成带页眉和页码的分页 DOCX/PDF 文档（见 document_writer.py）
+- 合并完成后对前端、后端源代码文档分页，提取前30页和后30页（见 paginate_sourcecode.py）
 - 跨平台兼容（Windows/Linux/macOS）
 - 智能错误处理和恢复
 """
@@ -16,10 +18,14 @@ import os
 import sys
 import json
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from paginate_sourcecode import paginate_documents, page_ranges
+from document_writer import DOCUMENT_FORMATS
+
 # 颜色输出类
 class Colors:
     RED = '\033[0;31m'
@@ -64,8 +70,14 @@ def get_project_config() -> Optional[dict]:
         print_error(f"读取配置文件失败: {e}")
         return None
 
-def run_merge_script(script_name: str, script_path: Path) -> Dict[str, any]:
-    """运行单个合并脚本"""
+def run_merge_script(script_name: str, script_path: Path, verbose: bool = True,
+                     script_args: List[str] = ()) -> Dict[str, any]:
+    """
+    运行单个合并脚本，script_args 为传给脚本的命令行参数
+    
+    verbose 为 False 时不直接打印，输出全部收集在返回结果中，
+    由调用方在任务结束后统一打印，避免并发执行时日志交错
+    """
     result = {
         'script': script_name,
         'success': False,
@@ -74,41 +86,61 @@ def run_merge_script(script_name: str, script_path: Path) -> Dict[str, any]:
         'execution_time': 0
     }
     
+    start_time = datetime.now()
+    
     try:
-        print_info(f"执行脚本: {script_name}")
-        start_time = datetime.now()
+        if verbose:
+            print_info(f"执行脚本: {script_name}")
         
         # 运行Python脚本
         process = subprocess.run(
-            [sys.executable, str(script_path)],
+            [sys.executable, str(script_path), *script_args],
             capture_output=True,
             text=True,
             cwd=Path.cwd(),
             timeout=300  # 5分钟超时
         )
         
-        end_time = datetime.now()
-        result['execution_time'] = (end_time - start_time).total_seconds()
         result['output'] = process.stdout
         result['error'] = process.stderr
         result['success'] = process.returncode == 0
-        
-        if result['success']:
-            print_success(f"{script_name} 执行成功 (用时: {result['execution_time']:.1f}秒)")
-        else:
-            print_error(f"{script_name} 执行失败")
-            if result['error']:
-                print_error(f"错误信息: {result['error']}")
     
     except subprocess.TimeoutExpired:
-        print_error(f"{script_name} 执行超时")
         result['error'] = "执行超时"
     except Exception as e:
-        print_error(f"{script_name} 执行异常: {e}")
         result['error'] = str(e)
     
+    result['execution_time'] = (datetime.now() - start_time).total_seconds()
+    
+    if verbose:
+        print_merge_result(result)
+    
     return result
 
+def print_merge_result(result: Dict[str, any]):
+    """打印单个合并脚本的执行结果"""
+    script_name = result['script']
+    
+    if result['success']:
+        print_success(f"{script_name} 执行成功 (用时: {result['execution_time']:.1f}秒)")
+    elif result['error'] == "执行超时":
+        print_error(f"{script_name} 执行超时")
+    else:
+        print_error(f"{script_name} 执行失败")
+        if result['error']:
+            print_error(f"错误信息: {result['error']}")
+
+def run_merge_scripts_parallel(scripts: List[tuple], script_args: List[str] = ()) -> List[Dict[str, any]]:
+    """
+    并发执行多个合并脚本，每个脚本运行在独立的子进程中
+    
+    各任务的输出分别收集，全部结束后按原顺序返回结果
+    """
+    with ThreadPoolExecutor(max_workers=len(scripts)) as executor:
+        futures = [executor.submit(run_merge_script, name, script_path, False, script_args)
+                   for name, script_path in scripts]
+        return [future.result() for future in futures]
+
 def check_generated_files() -> Dict[str, Dict[str, any]]:
     """检查生成的文件"""
     output_dir = Path("output_docs")
@@ -141,7 +173,16 @@ def check_generated_files() -> Dict[str, Dict[str, any]]:
     
     return file_status
 
-def generate_application_summary(config: dict, file_status: Dict, execution_results: List[Dict]) -> str:
+def run_pagination() -> List:
+    """对前端、后端源代码文档分页，提取前30页和后30页，失败时返回空列表"""
+    try:
+        return paginate_documents()
+    except Exception as e:
+        print_error(f"源代码分页失败: {e}")
+        return []
+
+def generate_application_summary(config: dict, file_status: Dict, execution_results: List[Dict],
+                                 wall_time: Optional[float] = None, pagination_results: Optional[List] = None) -> str:
     """生成申请材料总结报告"""
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -183,6 +224,14 @@ def generate_application_summary(config: dict, file_status: Dict, execution_resu
     
     summary += f"总计: {total_files} 个文件，{total_size:,} 字节 ({total_size / (1024 * 1024):.2f} MB)\n\n"
     
+    if pagination_results:
+        summary += f"{'-' * 80}\n源代码分页提取\n{'-' * 80}\n\n"
+        for result in pagination_results:
+            summary += f"✓ {result.output.name}\n"
+            summary += f"  源文档: {result.source.name} (共 {result.total_pages} 页，{result.total_lines:,} 行)\n"
+            summary += f"  提取页码: {page_ranges(result.extracted_pages) or '无'}\n"
+            summary += f"  页码索引: {result.index}\n\n"
+    
     # 执行结果统计
     summary += f"{'-' * 80}\n执行结果统计\n{'-' * 80}\n\n"
     
@@ -192,7 +241,10 @@ def generate_application_summary(config: dict, file_status: Dict, execution_resu
     summary += f"执行脚本数量: {len(execution_results)}\n"
     summary += f"成功执行: {success_count}\n"
     summary += f"失败执行: {len(execution_results) - success_count}\n"
-    summary += f"总执行时间: {total_time:.1f} 秒\n\n"
+    summary += f"总执行时间: {total_time:.1f} 秒\n"
+    if wall_time is not None:
+        summary += f"实际耗时: {wall_time:.1f} 秒 (并发执行)\n"
+    summary += "\n"
     
     for result in execution_results:
         status_symbol = "✓" if result['success'] else "✗"
@@ -226,8 +278,11 @@ def generate_application_summary(config: dict, file_status: Dict, execution_resu
     
     return summary
 
-def merge_all_sources():
-    """执行所有源代码合并"""
+def merge_all_sources(parallel: bool = True, paginate: bool = True, formats: List[str] = (), dedup: bool = False):
+    """
+    执行所有源代码合并，formats 为同时生成的分页文档格式（docx/pdf），
+    dedup 为 True 时前端源代码跨页面去除重复的公共组件
+    """
     print_header("开始执行完整软著申请材料生成")
     
     # 1. 读取项目配置
@@ -246,7 +301,15 @@ def merge_all_sources():
     print_info(f"项目: {config.get('title', '未设置')}")
     print_info(f"技术栈: {config.get('front', '未设置')} + {config.get('backend', '未设置')}")
     print_info(f"生成模式: {config.get('generation_mode', '未设置')}")
+    if formats:
+        print_info(f"分页文档格式: {', '.join(formats)}")
+    if dedup:
+        print_info("前端公共组件去重: 已启用")
     print()
+    script_args = [f"--{document_format}" for document_format in formats]
+    if dedup:
+        # 只有前端合并脚本使用该参数，其他脚本忽略
+        script_args.append("--dedup")
     
     # 2. 定义合并脚本
     script_dir = Path(__file__).parent
@@ -271,14 +334,33 @@ def merge_all_sources():
     
     print()
     
-    # 4. 逐个执行合并脚本
+    # 4. 执行合并脚本（三类合并互不依赖，默认并发执行）
     execution_results = []
+    wall_time = None
     
-    for i, (name, script_path) in enumerate(available_scripts, 1):
-        print_header(f"第 {i}/{len(available_scripts)} 步: {name}")
-        result = run_merge_script(name, script_path)
-        execution_results.append(result)
+    if parallel and len(available_scripts) > 1:
+        print_header(f"并发执行 {len(available_scripts)} 个合并脚本")
+        for name, _ in available_scripts:
+            print_info(f"执行脚本: {name}")
+        
+        start_time = datetime.now()
+        execution_results = run_merge_scripts_parallel(available_scripts, script_args)
+        wall_time = (datetime.now() - start_time).total_seconds()
+        
+        print()
+        for i, result in enumerate(execution_results, 1):
+            print_header(f"第 {i}/{len(execution_results)} 步: {result['script']}")
+            print_merge_result(result)
+            print()
+        
+        print_info(f"并发执行完成，实际耗时 {wall_time:.1f} 秒")
         print()
+    else:
+        for i, (name, script_path) in enumerate(available_scripts, 1):
+            print_header(f"第 {i}/{len(available_scripts)} 步: {name}")
+            result = run_merge_script(name, script_path, script_args=script_args)
+            execution_results.append(result)
+            print()
     
     # 5. 检查生成的文件
     print_header("检查生成的申请材料文档")
@@ -292,13 +374,20 @@ def merge_all_sources():
     
     print()
     
-    # 6. 生成总结报告
+    # 6. 源代码文档分页，提取前30页和后30页
+    pagination_results = []
+    if paginate:
+        print_header("源代码文档分页提取")
+        pagination_results = run_pagination()
+        print()
+    
+    # 7. 生成总结报告
     print_info("生成申请材料总结报告...")
     
     output_dir = Path("output_docs")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    summary = generate_application_summary(config, file_status, execution_results)
+    summary = generate_application_summary(config, file_status, execution_results, wall_time, pagination_results)
     
     # 保存总结报告
     summary_file = output_dir / "软著申请材料总结报告.txt"
@@ -309,7 +398,7 @@ def merge_all_sources():
     except Exception as e:
         print_error(f"保存总结报告失败: {e}")
     
-    # 7. 输出最终结果
+    # 8. 输出最终结果
     success_count = sum(1 for r in execution_results if r['success'])
     total_scripts = len(execution_results)
     existing_files = sum(1 for s in file_status.values() if s['exists'])
@@ -331,14 +420,24 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
         print("全部源代码拼接脚本 (Python版本)")
         print("\n用法:")
-        print("  python3 merge_all_simple.py")
+        print("  python3 merge_all_simple.py [--sequential] [--no-paginate] [--docx] [--pdf] [--dedup]")
+        print("\n选项:")
+        print("  --sequential  逐个执行合并脚本（默认并发执行）")
+        print("  --no-paginate 不生成源代码分页提取文档")
+        print("  --docx        同时生成带页眉和页码的分页 DOCX 文档")
+        print("  --pdf         同时生成带页眉和页码的分页 PDF 文档")
+        print("  --dedup       前端源代码跨页面去重，重复的公共组件只输出一次")
         print("\n功能:")
         print("  一键执行前端、后端、数据库所有代码的拼接")
         print("  生成完整的软著申请材料包")
+        print("  前端、后端源代码文档按每页50行分页，提取前30页和后30页")
         print("\n输出文件:")
         print("  output_docs/前端源代码.txt")
         print("  output_docs/后端源代码.txt")
         print("  output_docs/数据库源代码.txt")
+        print("  output_docs/*源代码.docx / .pdf（指定 --docx / --pdf 时）")
+        print("  output_docs/*源代码_分页提取.txt")
+        print("  output_docs/*源代码_页码索引.txt")
         print("  output_docs/软著申请材料总结报告.txt")
         print("  output_docs/*拼接报告.txt")
         print("\n注意:")
@@ -346,7 +445,10 @@ def main():
         print("  运行前请检查 output_sourcecode/ 目录内容")
         return
     
-    success = merge_all_sources()
+    formats = [document_format for document_format in DOCUMENT_FORMATS if f'--{document_format}' in sys.argv[1:]]
+    success = merge_all_sources(parallel='--sequential' not in sys.argv[1:],
+                                paginate='--no-paginate' not in sys.argv[1:], formats=formats,
+                                dedup='--dedup' in sys.argv[1:])
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -17,7 +17,15 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterable
+
+from merge_cache import FragmentCache, stream_decode
+from document_writer import DOCUMENT_FORMATS, MergedOutput, page_header
+from file_index import FileEntry, get_file_index
+from file_classifier import CATEGORY_LABELS, get_backend_manifest, load_ordering_policy
+
+# 源代码文件的编码回退顺序
+SOURCE_ENCODINGS = ['utf-8', 'gb2312', 'gbk', 'iso-8859-1', 'latin-1']
 
 # 颜色输出类
 class Colors:
@@ -74,8 +82,8 @@ def get_source_file_extensions() -> Dict[str, List[str]]:
         'Common': ['.sql', '.yml', '.yaml', '.txt', '.md', '.xml', '.json', '.properties', '.env']
     }
 
-def collect_source_files(backend_dir: Path, backend_tech: str) -> List[Path]:
-    """收集所有源代码文件"""
+def collect_source_files(backend_dir: Path, backend_tech: str, use_cache: bool = True) -> List[Path]:
+    """收集所有源代码文件，按 backend_tech 的分类排序策略排列（见 file_classifier.py）"""
     if not backend_dir.exists():
         return []
     
@@ -96,74 +104,35 @@ def collect_source_files(backend_dir: Path, backend_tech: str) -> List[Path]:
         for exts in extensions_map.values():
             target_extensions.update(exts)
     
-    source_files = []
+    # 从共享的文件索引中筛选（node_modules、target、.git 等目录在遍历时已整体跳过）
+    index = get_file_index(backend_dir.parent)
+    source_files = [Path(entry.path)
+                    for entry in index.files(backend_dir, suffixes=target_extensions)
+                    if not should_exclude_file(entry)]
     
-    # 递归搜索源代码文件
-    for file_path in backend_dir.rglob('*'):
-        if file_path.is_file():
-            # 检查文件扩展名
-            if file_path.suffix.lower() in target_extensions:
-                # 排除某些不需要的文件
-                if not should_exclude_file(file_path):
-                    source_files.append(file_path)
-    
-    # 按相对路径排序，确保一致的输出顺序
-    source_files.sort(key=lambda x: str(x.relative_to(backend_dir)).lower())
-    return source_files
+    # 按分类清单排序（同类文件按相对路径），与 generate_backend_sourcecode.py 共用同一清单
+    manifest = get_backend_manifest(backend_dir, load_ordering_policy(tech=backend_tech), use_cache=use_cache)
+    return manifest.sort(source_files)
 
-def should_exclude_file(file_path: Path) -> bool:
-    """判断是否应该排除某个文件"""
-    exclude_patterns = [
-        '__pycache__',
-        '.git',
-        '.svn',
-        'node_modules',
-        '.class',
-        '.pyc',
-        '.pyo',
-        '.log',
-        '.tmp',
-        '.temp',
-        'target',
-        'build',
-        'dist'
-    ]
-    
-    file_str = str(file_path).lower()
-    for pattern in exclude_patterns:
-        if pattern in file_str:
-            return True
-    
+def should_exclude_file(entry: FileEntry) -> bool:
+    """判断是否应该排除某个文件（排除规则已在文件索引遍历时应用，这里只检查大小）"""
     # 排除空文件或过大的文件
-    try:
-        file_size = file_path.stat().st_size
-        if file_size == 0 or file_size > 10 * 1024 * 1024:  # 10MB限制
-            return True
-    except:
+    if entry.size == 0 or entry.size > 10 * 1024 * 1024:  # 10MB限制
         return True
     
     return False
 
-def read_source_file(file_path: Path) -> str:
-    """安全读取源代码文件内容"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except UnicodeDecodeError:
-        # 尝试其他编码
-        encodings = ['gb2312', 'gbk', 'iso-8859-1', 'latin-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except:
-                continue
-        
+def stream_source_fragment(reader, output, file_path: Path) -> dict:
+    """
+    流式生成单个源代码文件的拼接片段（内容确保以换行结束）
+
+    编码只根据文件开头的样本检测一次，其余内容按固定大小分块转码写出
+    """
+    encoding = stream_decode(reader, output, SOURCE_ENCODINGS)
+    if encoding is None:
         print_warning(f"无法读取文件 {file_path.name}: 编码问题")
-        return f"// 文件读取失败: {file_path.name} (编码问题)"
-    except Exception as e:
-        print_warning(f"无法读取文件 {file_path.name}: {e}")
-        return f"// 文件读取失败: {file_path.name}"
+        output.write(f"// 文件读取失败: {file_path.name} (编码问题)\n")
+    return {'encoding': encoding}
 
 def generate_header(config: dict, file_count: int, backend_tech: str) -> str:
     """生成文档头部信息"""
@@ -201,7 +170,7 @@ def generate_footer() -> str:
 """
     return footer
 
-def merge_backend_files():
+def merge_backend_files(use_cache: bool = True, formats: Iterable[str] = ()):
     """主要的后端文件合并逻辑"""
     print_info("🔄 开始拼接后端源代码...")
     
@@ -238,7 +207,7 @@ def merge_backend_files():
     backend_tech = config.get('backend', 'Java')
     
     # 5. 收集源代码文件
-    source_files = collect_source_files(backend_dir, backend_tech)
+    source_files = collect_source_files(backend_dir, backend_tech, use_cache)
     if not source_files:
         print_error(f"在 {backend_dir} 中未发现源代码文件")
         print_info("💡 请先生成后端源代码文件")
@@ -258,9 +227,14 @@ def merge_backend_files():
     for ext, count in sorted(file_stats.items()):
         print_info(f"  {ext or '(无扩展名)'}: {count} 个文件")
     
-    # 7. 开始合并文件
+    # 7. 开始合并文件（未变化的文件直接复用增量缓存中的片段；合法 UTF-8 文件校验后按字节原样拷贝，
+    #    其余文件分块流式转码；片段按字节追加到输出文档，文件大小和哈希在读取时一并得到，
+    #    内存占用与后端代码总量无关）
+    cache = FragmentCache(output_dir, "backend", enabled=use_cache)
+    file_sizes = []
+    
     try:
-        with open(output_file, 'w', encoding='utf-8') as output:
+        with MergedOutput(output_file, formats, page_header(config)) as output:
             # 写入文档头部
             output.write(generate_header(config, len(source_files), backend_tech))
             
@@ -269,25 +243,29 @@ def merge_backend_files():
                 rel_path = source_file.relative_to(backend_dir)
                 print_info(f"处理文件 {i}/{len(source_files)}: {rel_path}")
                 
+                try:
+                    entry = cache.fetch_stream(source_file, rel_path.as_posix(),
+                                               lambda reader, out, path=source_file:
+                                                   stream_source_fragment(reader, out, path))
+                except OSError as e:
+                    print_warning(f"无法读取文件 {source_file.name}: {e}")
+                    entry = {'size': 0, 'fragment': f"// 文件读取失败: {source_file.name}\n"}
+                file_sizes.append(entry['size'])
+                
                 # 添加文件分隔标识
                 separator = f"""
 {'=' * 80}
 文件 {i}: {source_file.name}
 文件路径: output_sourcecode/backend/{rel_path}
 文件类型: {source_file.suffix or '(无扩展名)'}
-文件大小: {source_file.stat().st_size} 字节
+文件大小: {entry['size']} 字节
 {'=' * 80}
 
 """
                 output.write(separator)
                 
-                # 读取并写入文件内容
-                content = read_source_file(source_file)
-                output.write(content)
-                
-                # 确保文件内容以换行结束
-                if content and not content.endswith('\n'):
-                    output.write('\n')
+                # 写入文件内容
+                cache.write_fragment(entry, output)
                 
                 # 添加文件结束标识
                 output.write(f"\n\n{'=' * 80}\n文件 {i} 结束: {source_file.name}\n{'=' * 80}\n\n")
@@ -295,18 +273,26 @@ def merge_backend_files():
             # 写入文档尾部
             output.write(generate_footer())
         
+        cache.save()
+        if use_cache:
+            print_info(f"增量缓存: 复用 {cache.hits} 个文件，重新处理 {cache.misses} 个文件")
+        
         # 8. 输出统计信息
         file_size = output_file.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
         
         print_success("✅ 后端源代码拼接完成")
         print_info(f"📄 输出文件: {output_file}")
+        for document in output.documents:
+            print_info(f"📄 分页文档: {document}")
         print_info(f"📊 文件统计:")
         print_info(f"   - 源代码文件数量: {len(source_files)}")
         print_info(f"   - 总文件大小: {file_size:,} 字节 ({file_size_mb:.2f} MB)")
         print_info(f"   - 平均文件大小: {file_size // len(source_files):,} 字节")
         
         # 9. 生成详细报告
+        manifest = get_backend_manifest(backend_dir, load_ordering_policy(tech=backend_tech), use_cache=use_cache)
+        categories = [manifest.category(source_file.relative_to(backend_dir)) for source_file in source_files]
         with open(output_dir / "后端拼接报告.txt", 'w', encoding='utf-8') as report:
             report.write(f"后端源代码拼接报告\n")
             report.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -316,13 +302,18 @@ def merge_backend_files():
             for ext, count in sorted(file_stats.items()):
                 report.write(f"  {ext or '(无扩展名)'}: {count} 个文件\n")
             
+            report.write(f"\n文件分类统计（按拼接顺序）:\n")
+            for category in manifest.policy.order:
+                count = categories.count(category)
+                if count:
+                    report.write(f"  {CATEGORY_LABELS[category]}: {count} 个文件\n")
+            
             report.write(f"\n文件列表:\n")
-            for i, source_file in enumerate(source_files, 1):
+            for i, (source_file, file_size, category) in enumerate(zip(source_files, file_sizes, categories), 1):
                 rel_path = source_file.relative_to(backend_dir)
-                file_size = source_file.stat().st_size
-                report.write(f"{i:3d}. {rel_path} ({file_size:,} 字节)\n")
+                report.write(f"{i:3d}. [{CATEGORY_LABELS[category]}] {rel_path} ({file_size:,} 字节)\n")
             
-            total_size = sum(f.stat().st_size for f in source_files)
+            total_size = sum(file_sizes)
             report.write(f"\n总计: {len(source_files)} 个文件，{total_size:,} 字节\n")
         
         print_success("📋 生成详细报告: 后端拼接报告.txt")
@@ -337,7 +328,11 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
         print("后端源代码拼接脚本 (Python版本)")
         print("\n用法:")
-        print("  python3 merge_backend_simple.py")
+        print("  python3 merge_backend_simple.py [--no-cache] [--docx] [--pdf]")
+        print("\n选项:")
+        print("  --no-cache  不使用 output_docs/.cache 增量缓存，全部重新处理")
+        print("  --docx      同时生成带页眉和页码的分页 DOCX 文档")
+        print("  --pdf       同时生成带页眉和页码的分页 PDF 文档")
         print("\n说明:")
         print("  将 output_sourcecode/backend/ 目录下的所有源代码文件")
         print("  拼接成单一的源代码文档用于软著申请")
@@ -348,10 +343,12 @@ def main():
                 print(f"  - {tech}")
         print("\n输出:")
         print("  output_docs/后端源代码.txt")
+        print("  output_docs/后端源代码.docx / .pdf（指定 --docx / --pdf 时）")
         print("  output_docs/后端拼接报告.txt")
         return
     
-    success = merge_backend_files()
+    formats = [document_format for document_format in DOCUMENT_FORMATS if f'--{document_format}' in sys.argv[1:]]
+    success = merge_backend_files(use_cache='--no-cache' not in sys.argv[1:], formats=formats)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+拼接脚本增量缓存模块 (Python版本)
+功能：为 merge_*_simple.py 提供按内容寻址的持久化片段缓存
+
+缓存策略：
+- 以文件路径为键，记录 mtime、文件大小和内容哈希 (SHA-256)
+- mtime 与大小均未变化时直接复用缓存，不再读取源文件
+- mtime 变化但内容哈希相同时只刷新元数据
+- 只有内容真正变化的文件才重新处理
+- 拼接时按顺序把缓存片段直接拷贝进输出文档
+- fetch_stream 分块读取和转码源文件，读取的同时计算哈希和大小，内存占用与文件大小无关
+- 合法 UTF-8 且不含 \r 的源文件只做校验，按字节原样写入片段，不解码再编码
+- 片段写入输出文档时优先使用 os.copy_file_range / os.sendfile 在内核中拷贝（见 copy_file_bytes）
+
+缓存目录结构：
+  output_docs/.cache/<命名空间>/index.json        路径索引
+  output_docs/.cache/<命名空间>/fragments/*.txt   以内容哈希命名的片段
+"""
+
+import os
+import sys
+import json
+import codecs
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Optional, TextIO, Tuple
+
+CACHE_DIR_NAME = ".cache"
+CACHE_VERSION = 1
+
+# 流式处理的分块大小，以及用于检测编码的开头样本大小
+STREAM_CHUNK_SIZE = 64 * 1024
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# 处理函数：接收源文件原始字节，返回 (片段文本, 附加元数据)
+Processor = Callable[[bytes], Tuple[str, dict]]
+
+class HashingReader:
+    """包装二进制文件，读取的同时累计内容哈希 (SHA-256) 和字节数"""
+
+    def __init__(self, source: BinaryIO):
+        self.source = source
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = STREAM_CHUNK_SIZE) -> bytes:
+        data = self.source.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        return data
+
+    def drain(self):
+        """读完剩余内容（只为计算哈希和大小）"""
+        while self.read(STREAM_CHUNK_SIZE):
+            pass
+
+    def rewind(self):
+        """回到文件开头并重置哈希和字节数"""
+        self.source.seek(0)
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def hexdigest(self) -> str:
+        return self.sha256.hexdigest()
+
+# 流式处理函数：从 HashingReader 分块读取源文件，把片段写入文本流，返回附加元数据
+StreamProcessor = Callable[[HashingReader, TextIO], dict]
+
+class FragmentCache:
+    """单个拼接脚本的片段缓存"""
+
+    def __init__(self, output_dir: Path, namespace: str, enabled: bool = True, processor_version: int = 1):
+        self.root = Path(output_dir) / CACHE_DIR_NAME / namespace
+        # 处理逻辑变化时提高 processor_version，使旧片段全部失效
+        self.processor_version = processor_version
+        self.fragments_dir = self.root / "fragments"
+        self.index_file = self.root / "index.json"
+        self.enabled = enabled
+        self.entries: Dict[str, dict] = self._load_index() if enabled else {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _load_index(self) -> Dict[str, dict]:
+        """读取路径索引，版本不符或损坏时视为空缓存"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return {}
+        if data.get('processor_version', 1) != self.processor_version:
+            return {}
+        return data.get('entries', {})
+
+    def fragment_path(self, digest: str) -> Path:
+        return self.fragments_dir / f"{digest}.txt"
+
+    def _is_fresh(self, entry: Optional[dict], stat: os.stat_result) -> bool:
+        return (entry is not None and
+                entry.get('mtime_ns') == stat.st_mtime_ns and
+                entry.get('size') == stat.st_size and
+                self.fragment_path(entry['sha256']).exists())
+
+    def fetch(self, file_path: Path, key: str, processor: Processor) -> dict:
+        """
+        获取文件对应的缓存条目，缓存失效时调用 processor 重新处理
+
+        返回的条目包含 size、sha256 和 meta（processor 返回的附加元数据）
+        """
+        stat = file_path.stat()
+        self.seen.add(key)
+        entry = self.entries.get(key)
+
+        if self.enabled and self._is_fresh(entry, stat):
+            self.hits += 1
+            return entry
+
+        data = file_path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if self.enabled and entry and entry.get('sha256') == digest and self.fragment_path(digest).exists():
+            # 仅 mtime 变化（如 touch 或重新检出），内容未变
+            entry['mtime_ns'] = stat.st_mtime_ns
+            entry['size'] = stat.st_size
+            self.hits += 1
+            return entry
+
+        fragment, meta = processor(data)
+        self.misses += 1
+
+        entry = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'meta': meta
+        }
+
+        if self.enabled:
+            self.fragments_dir.mkdir(parents=True, exist_ok=True)
+            fragment_file = self.fragment_path(digest)
+            tmp_file = fragment_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+                f.write(fragment)
+            os.replace(tmp_file, fragment_file)
+            self.entries[key] = entry
+        else:
+            # 未启用缓存时片段只在内存中保留到写出为止
+            entry = dict(entry, fragment=fragment)
+
+        return entry
+
+    def fetch_stream(self, file_path: Path, key: str, processor: StreamProcessor) -> dict:
+        """
+        fetch 的流式版本：processor 把片段直接写入临时文件，不在内存中保留整个文件
+
+        源文件只读取一次，内容哈希和大小在读取过程中得到；
+        仅 mtime 变化而内容未变时丢弃新生成的片段，继续使用原有片段
+        """
+        stat = file_path.stat()
+        self.seen.add(key)
+        entry = self.entries.get(key)
+
+        if self.enabled and self._is_fresh(entry, stat):
+            self.hits += 1
+            return entry
+
+        if self.enabled:
+            self.fragments_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=self.fragments_dir)
+        else:
+            fd, tmp_name = tempfile.mkstemp(suffix=".txt")
+
+        try:
+            with open(file_path, 'rb') as source, \
+                 open(fd, 'w', encoding='utf-8', newline='') as target:
+                reader = HashingReader(source)
+                meta = processor(reader, target)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+
+        digest = reader.hexdigest()
+        new_entry = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': reader.size,
+            'sha256': digest,
+            'meta': meta
+        }
+
+        if not self.enabled:
+            # 未启用缓存时片段保存在临时文件中，写出后删除
+            self.misses += 1
+            return dict(new_entry, fragment_file=tmp_name)
+
+        if entry and entry.get('sha256') == digest and self.fragment_path(digest).exists():
+            os.remove(tmp_name)
+            entry['mtime_ns'] = stat.st_mtime_ns
+            entry['size'] = reader.size
+            self.hits += 1
+            return entry
+
+        os.replace(tmp_name, self.fragment_path(digest))
+        self.misses += 1
+        self.entries[key] = new_entry
+        return new_entry
+
+    def write_fragment(self, entry: dict, output):
+        """
+        把条目对应的片段写入输出流
+
+        output 提供 write_file(path) 时（如 MergedOutput）由它直接追加片段文件，可以按字节拷贝
+        """
+        if 'fragment' in entry:
+            output.write(entry.pop('fragment'))
+            return
+
+        if 'fragment_file' in entry:
+            fragment_file = entry.pop('fragment_file')
+            try:
+                _copy_fragment(fragment_file, output)
+            finally:
+                os.remove(fragment_file)
+            return
+
+        _copy_fragment(self.fragment_path(entry['sha256']), output)
+
+    def save(self):
+        """保存索引，并清理本次未出现的文件及无引用的片段"""
+        if not self.enabled:
+            return
+
+        self.entries = {key: entry for key, entry in self.entries.items() if key in self.seen}
+        referenced = {entry['sha256'] for entry in self.entries.values()}
+
+        if self.fragments_dir.exists():
+            for fragment_file in self.fragments_dir.glob("*.txt"):
+                if fragment_file.stem not in referenced:
+                    try:
+                        fragment_file.unlink()
+                    except OSError:
+                        pass
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'processor_version': self.processor_version,
+                       'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+def _copy_fragment(fragment_file, output):
+    if hasattr(output, 'write_file'):
+        output.write_file(fragment_file)
+        return
+    with open(fragment_file, 'r', encoding='utf-8', newline='') as f:
+        shutil.copyfileobj(f, output, STREAM_CHUNK_SIZE)
+
+def _kernel_copies():
+    """可用的内核内拷贝函数 (源fd, 目标fd, 字节数) -> 已拷贝字节数，按优先顺序排列"""
+    if not sys.platform.startswith('linux'):
+        # 其他平台的 sendfile 只支持写入套接字
+        return []
+    copies = []
+    if hasattr(os, 'copy_file_range'):
+        copies.append(lambda source_fd, target_fd, count: os.copy_file_range(source_fd, target_fd, count))
+    if hasattr(os, 'sendfile'):
+        copies.append(lambda source_fd, target_fd, count: os.sendfile(target_fd, source_fd, None, count))
+    return copies
+
+KERNEL_COPIES = _kernel_copies()
+
+def copy_file_bytes(source_path, target_fd: int) -> int:
+    """
+    把文件内容按字节追加到已打开的文件描述符 target_fd 的当前位置，返回拷贝的字节数
+
+    依次尝试 os.copy_file_range、os.sendfile（数据不经过用户态），
+    不支持时（如跨文件系统、非 Linux 平台）从已拷贝的位置开始改用缓冲区分块拷贝。
+    调用前需要先 flush 目标文件对象的缓冲区
+    """
+    with open(source_path, 'rb') as source:
+        source_fd = source.fileno()
+        size = os.fstat(source_fd).st_size
+        copied = 0
+        for copy in KERNEL_COPIES:
+            try:
+                while copied < size:
+                    count = copy(source_fd, target_fd, size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+            except OSError:
+                continue
+            if copied >= size:
+                return copied
+
+        # 内核拷贝同时移动了源文件位置，这里重新定位后拷贝剩余部分
+        source.seek(copied)
+        with open(target_fd, 'wb', closefd=False) as target:
+            while True:
+                data = source.read(STREAM_CHUNK_SIZE)
+                if not data:
+                    break
+                target.write(data)
+                copied += len(data)
+        return copied
+
+def decode_bytes(data: bytes, encodings: Iterable[str]) -> Optional[str]:
+    """按顺序尝试多种编码解码，全部失败时返回 None"""
+    for encoding in encodings:
+        try:
+            return data.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return None
+
+def detect_encoding(sample: bytes, encodings: Iterable[str], final: bool = False) -> Optional[str]:
+    """
+    返回能解码样本的第一个编码
+
+    final 为 False 时样本只是文件开头，末尾被截断的多字节字符不算解码失败
+    """
+    for encoding in encodings:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final)
+            return encoding
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return None
+
+def _transcode(reader: HashingReader, output: TextIO, sample: bytes, encoding: str, chunk_size: int):
+    """按指定编码分块解码并写出，统一换行符为 \\n，并保证以换行结束"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    data = sample
+    pending_cr = False
+    last_char = ''
+
+    while True:
+        text = decoder.decode(data, not data)
+        if pending_cr:
+            text = '\r' + text
+        # 块末尾的 \r 可能与下一块开头的 \n 组成 \r\n，留到下一块处理
+        pending_cr = bool(data) and text.endswith('\r')
+        if pending_cr:
+            text = text[:-1]
+
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if text:
+            output.write(text)
+            last_char = text[-1]
+
+        if not data:
+            break
+        data = reader.read(chunk_size)
+
+    if last_char and last_char != '\n':
+        output.write('\n')
+
+def _copy_utf8(reader: HashingReader, output: TextIO, chunk_size: int) -> bool:
+    """
+    UTF-8 快速路径：分块校验 UTF-8，内容按字节原样写入 output 的底层缓冲区，不解码再编码
+
+    与 _transcode 的输出逐字节相同；内容不是合法的 UTF-8 或包含 \\r（需要统一换行符）时
+    回到开头并清空 output，返回 False
+    """
+    target = getattr(output, 'buffer', None)
+    if target is None:
+        return False
+
+    validator = codecs.getincrementaldecoder('utf-8')()
+    output.flush()
+    last_byte = b''
+    verbatim = True
+    while verbatim:
+        data = reader.read(chunk_size)
+        # 纯 ASCII 的块（且前一块末尾没有未完成的多字节字符）一定合法，不需要解码校验
+        if not data.isascii() or validator.getstate()[0]:
+            try:
+                # 只用于校验，末尾被截断的多字节字符留到下一块，最后一次调用时检查
+                validator.decode(data, not data)
+            except UnicodeDecodeError:
+                verbatim = False
+                break
+        if not data:
+            break
+        verbatim = b'\r' not in data
+        target.write(data)
+        last_byte = data[-1:]
+
+    if not verbatim:
+        reader.rewind()
+        output.seek(0)
+        output.truncate()
+        return False
+
+    if last_byte and last_byte != b'\n':
+        target.write(b'\n')
+    return True
+
+def stream_decode(reader: HashingReader, output: TextIO, encodings: Iterable[str],
+                  chunk_size: int = STREAM_CHUNK_SIZE) -> Optional[str]:
+    """
+    把二进制流转码为文本写入 output（统一换行符为 \\n，并保证以换行结束）
+
+    编码只根据开头 ENCODING_SAMPLE_SIZE 字节的样本检测一次，其余内容分块转码；
+    样本之后出现该编码无法解码的字节时，回到开头改用下一个候选编码。
+    首选编码为 UTF-8 时先尝试按字节原样拷贝（见 _copy_utf8），只有其他文件才需要转码。
+    返回实际使用的编码，全部编码都失败时返回 None，此时 output 为空
+    """
+    candidates = list(encodings)
+    if candidates and codecs.lookup(candidates[0]).name == 'utf-8' and _copy_utf8(reader, output, chunk_size):
+        return candidates[0]
+    while candidates:
+        sample = reader.read(ENCODING_SAMPLE_SIZE)
+        encoding = detect_encoding(sample, candidates, final=len(sample) < ENCODING_SAMPLE_SIZE)
+        if encoding is None:
+            break
+
+        try:
+            _transcode(reader, output, sample, encoding, chunk_size)
+            return encoding
+        except UnicodeDecodeError:
+            candidates = candidates[candidates.index(encoding) + 1:]
+            reader.rewind()
+            output.seek(0)
+            output.truncate()
+
+    reader.drain()
+    return None
@@ -17,7 +17,18 @@ import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Iterable
+
+from merge_cache import FragmentCache, decode_bytes
+from document_writer import DOCUMENT_FORMATS, MergedOutput, page_header
+from file_index import FileEntry, get_file_index
+from sql_lexer import count_statements
+
+# 片段处理逻辑版本（SQL统计方式改变时递增，使增量缓存失效）
+DATABASE_FRAGMENT_VERSION = 2
+
+# 数据库文件的编码回退顺序
+DATABASE_ENCODINGS = ['utf-8', 'gb2312', 'gbk', 'iso-8859-1', 'latin-1']
 
 # 颜色输出类
 class Colors:
@@ -70,87 +81,62 @@ def collect_database_files(db_dir: Path) -> List[Path]:
     
     db_files = []
     
-    # 递归搜索数据库文件
-    for file_path in db_dir.rglob('*'):
-        if file_path.is_file():
-            # 检查文件扩展名或包含SQL关键词的文件
-            if (file_path.suffix.lower() in db_extensions or 
-                'sql' in file_path.name.lower() or
-                'database' in file_path.name.lower() or
-                'schema' in file_path.name.lower()):
-                
-                if not should_exclude_file(file_path):
-                    db_files.append(file_path)
+    # 从共享的文件索引中筛选（.git、.svn 等目录在遍历时已整体跳过）
+    for entry in get_file_index(db_dir.parent).files(db_dir):
+        # 检查文件扩展名或包含SQL关键词的文件
+        name = entry.name.lower()
+        if (entry.suffix in db_extensions or 
+            'sql' in name or
+            'database' in name or
+            'schema' in name):
+            
+            if not should_exclude_file(entry):
+                db_files.append(Path(entry.path))
     
     # 按相对路径排序，确保一致的输出顺序
     db_files.sort(key=lambda x: str(x.relative_to(db_dir)).lower())
     return db_files
 
-def should_exclude_file(file_path: Path) -> bool:
-    """判断是否应该排除某个文件"""
-    exclude_patterns = [
-        '.git',
-        '.svn',
-        '.log',
-        '.tmp',
-        '.temp',
-        '.bak',
-        '.backup'
-    ]
-    
-    file_str = str(file_path).lower()
-    for pattern in exclude_patterns:
-        if pattern in file_str:
-            return True
-    
+def should_exclude_file(entry: FileEntry) -> bool:
+    """判断是否应该排除某个文件（排除规则已在文件索引遍历时应用，这里只检查大小）"""
     # 排除空文件或过大的文件
-    try:
-        file_size = file_path.stat().st_size
-        if file_size == 0 or file_size > 50 * 1024 * 1024:  # 50MB限制
-            return True
-    except:
+    if entry.size == 0 or entry.size > 50 * 1024 * 1024:  # 50MB限制
         return True
     
     return False
 
-def read_database_file(file_path: Path) -> str:
-    """安全读取数据库文件内容"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except UnicodeDecodeError:
-        # 尝试其他编码
-        encodings = ['gb2312', 'gbk', 'iso-8859-1', 'latin-1']
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except:
-                continue
-        
+def decode_database_bytes(data: bytes, file_path: Path) -> str:
+    """解码数据库文件原始字节，依次尝试 DATABASE_ENCODINGS 中的编码"""
+    content = decode_bytes(data, DATABASE_ENCODINGS)
+    if content is None:
         print_warning(f"无法读取文件 {file_path.name}: 编码问题")
         return f"-- 文件读取失败: {file_path.name} (编码问题)"
-    except Exception as e:
-        print_warning(f"无法读取文件 {file_path.name}: {e}")
-        return f"-- 文件读取失败: {file_path.name}"
+    # 与文本模式读取一致，统一换行符
+    return content.replace('\r\n', '\n').replace('\r', '\n')
 
 def analyze_sql_content(content: str) -> Dict[str, int]:
-    """分析SQL内容，统计各种语句类型"""
-    content_upper = content.upper()
-    stats = {
-        'CREATE TABLE': content_upper.count('CREATE TABLE'),
-        'CREATE VIEW': content_upper.count('CREATE VIEW'),
-        'CREATE INDEX': content_upper.count('CREATE INDEX'),
-        'CREATE PROCEDURE': content_upper.count('CREATE PROCEDURE'),
-        'CREATE FUNCTION': content_upper.count('CREATE FUNCTION'),
-        'INSERT INTO': content_upper.count('INSERT INTO'),
-        'UPDATE': content_upper.count('UPDATE'),
-        'DELETE FROM': content_upper.count('DELETE FROM'),
-        'SELECT': content_upper.count('SELECT'),
-        'ALTER TABLE': content_upper.count('ALTER TABLE'),
-        'DROP TABLE': content_upper.count('DROP TABLE'),
-    }
-    return {k: v for k, v in stats.items() if v > 0}
+    """分析SQL内容，统计各种语句类型（单次扫描，忽略注释和字符串中的关键字）"""
+    return count_statements(content)
+
+def build_database_fragment(data: bytes, file_path: Path) -> Tuple[str, dict]:
+    """生成单个数据库文件的拼接片段（SQL统计 + 内容），并返回SQL统计信息"""
+    content = decode_database_bytes(data, file_path)
+    sql_stats = analyze_sql_content(content)
+    
+    parts = []
+    if sql_stats:
+        parts.append("SQL语句统计:\n")
+        for stmt_type, count in sql_stats.items():
+            parts.append(f"  {stmt_type}: {count}\n")
+        parts.append("\n")
+    
+    parts.append(content)
+    
+    # 确保文件内容以换行结束
+    if content and not content.endswith('\n'):
+        parts.append('\n')
+    
+    return ''.join(parts), {'sql_stats': sql_stats}
 
 def generate_header(config: dict, file_count: int) -> str:
     """生成文档头部信息"""
@@ -188,7 +174,7 @@ def generate_footer() -> str:
 """
     return footer
 
-def merge_database_files():
+def merge_database_files(use_cache: bool = True, formats: Iterable[str] = ()):
     """主要的数据库文件合并逻辑"""
     print_info("🔄 开始拼接数据库源代码...")
     
@@ -243,11 +229,14 @@ def merge_database_files():
     for ext, count in sorted(file_stats.items()):
         print_info(f"  {ext}: {count} 个文件")
     
-    # 7. 开始合并文件
+    # 7. 开始合并文件（未变化的文件直接复用增量缓存中的片段）
     total_sql_stats = {}
+    cache = FragmentCache(output_dir, "database", enabled=use_cache,
+                          processor_version=DATABASE_FRAGMENT_VERSION)
+    file_sizes = []
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as output:
+        with MergedOutput(output_file, formats, page_header(config)) as output:
             # 写入文档头部
             output.write(generate_header(config, len(db_files)))
             
@@ -256,11 +245,17 @@ def merge_database_files():
                 rel_path = db_file.relative_to(db_dir)
                 print_info(f"处理文件 {i}/{len(db_files)}: {rel_path}")
                 
-                # 读取文件内容
-                content = read_database_file(db_file)
+                # 读取文件内容并分析SQL（未变化时直接使用缓存结果）
+                try:
+                    entry = cache.fetch(db_file, rel_path.as_posix(),
+                                        lambda data, path=db_file: build_database_fragment(data, path))
+                except OSError as e:
+                    print_warning(f"无法读取文件 {db_file.name}: {e}")
+                    entry = {'size': 0, 'meta': {'sql_stats': {}},
+                             'fragment': f"-- 文件读取失败: {db_file.name}\n"}
+                file_sizes.append(entry['size'])
                 
-                # 分析SQL内容
-                sql_stats = analyze_sql_content(content)
+                sql_stats = entry['meta']['sql_stats']
                 for stmt_type, count in sql_stats.items():
                     if stmt_type not in total_sql_stats:
                         total_sql_stats[stmt_type] = 0
@@ -272,25 +267,14 @@ def merge_database_files():
 文件 {i}: {db_file.name}
 文件路径: output_sourcecode/db/{rel_path}
 文件类型: {db_file.suffix or '(无扩展名)'}
-文件大小: {db_file.stat().st_size} 字节
+文件大小: {entry['size']} 字节
 {'=' * 80}
 
 """
                 output.write(separator)
                 
-                # 如果有SQL统计信息，添加到分隔符中
-                if sql_stats:
-                    output.write("SQL语句统计:\n")
-                    for stmt_type, count in sql_stats.items():
-                        output.write(f"  {stmt_type}: {count}\n")
-                    output.write("\n")
-                
-                # 写入文件内容
-                output.write(content)
-                
-                # 确保文件内容以换行结束
-                if content and not content.endswith('\n'):
-                    output.write('\n')
+                # 写入SQL统计信息和文件内容
+                cache.write_fragment(entry, output)
                 
                 # 添加文件结束标识
                 output.write(f"\n\n{'=' * 80}\n文件 {i} 结束: {db_file.name}\n{'=' * 80}\n\n")
@@ -310,12 +294,18 @@ def merge_database_files():
             # 写入文档尾部
             output.write(generate_footer())
         
+        cache.save()
+        if use_cache:
+            print_info(f"增量缓存: 复用 {cache.hits} 个文件，重新处理 {cache.misses} 个文件")
+        
         # 8. 输出统计信息
         file_size = output_file.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
         
         print_success("✅ 数据库源代码拼接完成")
         print_info(f"📄 输出文件: {output_file}")
+        for document in output.documents:
+            print_info(f"📄 分页文档: {document}")
         print_info(f"📊 文件统计:")
         print_info(f"   - 数据库文件数量: {len(db_files)}")
         print_info(f"   - 总文件大小: {file_size:,} 字节 ({file_size_mb:.2f} MB)")
@@ -340,12 +330,11 @@ def merge_database_files():
                     report.write(f"  {stmt_type}: {count}\n")
             
             report.write(f"\n文件列表:\n")
-            for i, db_file in enumerate(db_files, 1):
+            for i, (db_file, file_size) in enumerate(zip(db_files, file_sizes), 1):
                 rel_path = db_file.relative_to(db_dir)
-                file_size = db_file.stat().st_size
                 report.write(f"{i:3d}. {rel_path} ({file_size:,} 字节)\n")
             
-            total_size = sum(f.stat().st_size for f in db_files)
+            total_size = sum(file_sizes)
             report.write(f"\n总计: {len(db_files)} 个文件，{total_size:,} 字节\n")
         
         print_success("📋 生成详细报告: 数据库拼接报告.txt")
@@ -360,7 +349,11 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
         print("数据库源代码拼接脚本 (Python版本)")
         print("\n用法:")
-        print("  python3 merge_database_simple.py")
+        print("  python3 merge_database_simple.py [--no-cache] [--docx] [--pdf]")
+        print("\n选项:")
+        print("  --no-cache  不使用 output_docs/.cache 增量缓存，全部重新处理")
+        print("  --docx      同时生成带页眉和页码的分页 DOCX 文档")
+        print("  --pdf       同时生成带页眉和页码的分页 PDF 文档")
         print("\n说明:")
         print("  将 output_sourcecode/db/ 目录下的所有数据库文件")
         print("  拼接成单一的源代码文档用于软著申请")
@@ -371,10 +364,12 @@ def main():
         print("  - database_schema.sql - 建表语句")
         print("\n输出:")
         print("  output_docs/数据库源代码.txt")
+        print("  output_docs/数据库源代码.docx / .pdf（指定 --docx / --pdf 时）")
         print("  output_docs/数据库拼接报告.txt")
         return
     
-    success = merge_database_files()
+    formats = [document_format for document_format in DOCUMENT_FORMATS if f'--{document_format}' in sys.argv[1:]]
+    success = merge_database_files(use_cache='--no-cache' not in sys.argv[1:], formats=formats)
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
@@ -17,11 +17,20 @@
 - 跨平台兼容（Windows/Linux/macOS）
 """
 
+import io
 import sys
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Iterable
+
+from merge_cache import FragmentCache, decode_bytes
+from document_writer import DOCUMENT_FORMATS, MergedOutput, page_header
+from boilerplate_dedup import deduplicate_pages, render_components_section
+from file_index import get_file_index
+
+# HTML文件的编码回退顺序
+HTML_ENCODINGS = ['utf-8', 'gb2312', 'latin-1']
 
 # 颜色输出类
 class Colors:
@@ -65,32 +74,21 @@ def collect_html_files(front_dir: Path) -> List[Path]:
     if not front_dir.exists():
         return []
     
-    html_files = []
-    for file_path in front_dir.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() == '.html':
-            html_files.append(file_path)
+    index = get_file_index(front_dir.parent)
+    html_files = [Path(entry.path) for entry in index.files(front_dir, suffixes={'.html'}, recursive=False)]
     
     # 按文件名排序，确保一致的输出顺序
     html_files.sort(key=lambda x: x.name.lower())
     return html_files
 
-def read_html_file(file_path: Path) -> str:
-    """安全读取HTML文件内容"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except UnicodeDecodeError:
-        # 尝试其他编码
-        try:
-            with open(file_path, 'r', encoding='gb2312') as f:
-                return f.read()
-        except:
-            try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return f.read()
-            except Exception as e:
-                print_warning(f"无法读取文件 {file_path.name}: {e}")
-                return f"<!-- 文件读取失败: {file_path.name} -->"
+def decode_html_bytes(data: bytes, file_path: Path) -> str:
+    """解码HTML文件原始字节，依次尝试 UTF-8、GB2312、Latin-1"""
+    content = decode_bytes(data, HTML_ENCODINGS)
+    if content is None:
+        print_warning(f"无法读取文件 {file_path.name}: 编码问题")
+        return f"<!-- 文件读取失败: {file_path.name} -->"
+    # 与文本模式读取一致，统一换行符
+    return content.replace('\r\n', '\n').replace('\r', '\n')
 
 def generate_header(config: dict, file_count: int) -> str:
     """生成文档头部信息"""
@@ -129,8 +127,37 @@ def generate_footer() -> str:
 """
     return footer
 
-def merge_frontend_files():
-    """主要的前端文件合并逻辑"""
+def fetch_entry(cache: FragmentCache, html_file: Path) -> dict:
+    """读取HTML文件（或复用增量缓存中的片段），读取失败时返回错误说明片段"""
+    try:
+        return cache.fetch(html_file, html_file.name,
+                           lambda data, path=html_file: (decode_html_bytes(data, path), {}))
+    except OSError as e:
+        print_warning(f"无法读取文件 {html_file.name}: {e}")
+        return {'size': 0, 'fragment': f"<!-- 文件读取失败: {html_file.name} -->"}
+
+def deduplicate_entries(cache: FragmentCache, html_files: List[Path]):
+    """
+    公共组件去重：先读取全部页面，再把各页面中跨页面重复的组件替换为引用标记
+
+    返回 ({HTML文件: 去重后的条目}, 去重结果)；返回的条目是副本，不会写回增量缓存
+    """
+    entries = {}
+    contents = {}
+    for html_file in html_files:
+        entry = fetch_entry(cache, html_file)
+        buffer = io.StringIO()
+        cache.write_fragment(entry, buffer)
+        entries[html_file] = entry
+        contents[html_file.name] = buffer.getvalue()
+
+    result = deduplicate_pages(contents)
+    deduplicated = {html_file: dict(entry, fragment=result.pages[html_file.name])
+                    for html_file, entry in entries.items()}
+    return deduplicated, result
+
+def merge_frontend_files(use_cache: bool = True, formats: Iterable[str] = (), dedup: bool = False):
+    """主要的前端文件合并逻辑，dedup 为 True 时跨页面去除重复的公共组件"""
     print_info("🔄 开始拼接前端页面源代码...")
     
     # 1. 确定项目根目录
@@ -173,30 +200,46 @@ def merge_frontend_files():
     
     print_success(f"发现 {len(html_files)} 个HTML文件")
     
-    # 6. 开始合并文件
+    # 6. 开始合并文件（未变化的文件直接复用增量缓存中的片段）
+    cache = FragmentCache(output_dir, "frontend", enabled=use_cache)
+    file_sizes = []
+    entries = {}
+    dedup_result = None
+    
     try:
-        with open(output_file, 'w', encoding='utf-8') as output:
+        if dedup:
+            entries, dedup_result = deduplicate_entries(cache, html_files)
+            print_info(f"🧩 公共组件去重: {len(dedup_result.components)} 个公共组件，"
+                       f"{dedup_result.original_chars:,} → {dedup_result.deduplicated_chars:,} 字符")
+        
+        with MergedOutput(output_file, formats, page_header(config)) as output:
             # 写入文档头部
             output.write(generate_header(config, len(html_files)))
             
+            # 公共组件只输出一次，各页面中以引用标记代替
+            if dedup_result and dedup_result.components:
+                output.write(render_components_section(dedup_result.components))
+            
             # 逐个处理HTML文件
             for i, html_file in enumerate(html_files, 1):
                 print_info(f"处理文件 {i}/{len(html_files)}: {html_file.name}")
                 
+                entry = entries.get(html_file) or fetch_entry(cache, html_file)
+                file_sizes.append(entry['size'])
+                
                 # 添加文件分隔标识
                 separator = f"""
 {'=' * 80}
 文件 {i}: {html_file.name}
 文件路径: output_sourcecode/front/{html_file.name}
-文件大小: {html_file.stat().st_size} 字节
+文件大小: {entry['size']} 字节
 {'=' * 80}
 
 """
                 output.write(separator)
                 
-                # 读取并写入文件内容
-                content = read_html_file(html_file)
-                output.write(content)
+                # 写入文件内容
+                cache.write_fragment(entry, output)
                 
                 # 添加文件结束标识
                 output.write(f"\n\n{'=' * 80}\n文件 {i} 结束: {html_file.name}\n{'=' * 80}\n\n")
@@ -204,12 +247,18 @@ def merge_frontend_files():
             # 写入文档尾部
             output.write(generate_footer())
         
+        cache.save()
+        if use_cache:
+            print_info(f"增量缓存: 复用 {cache.hits} 个文件，重新处理 {cache.misses} 个文件")
+        
         # 7. 输出统计信息
         file_size = output_file.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
         
         print_success("✅ 前端源代码拼接完成")
         print_info(f"📄 输出文件: {output_file}")
+        for document in output.documents:
+            print_info(f"📄 分页文档: {document}")
         print_info(f"📊 文件统计:")
         print_info(f"   - HTML文件数量: {len(html_files)}")
         print_info(f"   - 总文件大小: {file_size:,} 字节 ({file_size_mb:.2f} MB)")
@@ -220,11 +269,16 @@ def merge_frontend_files():
             report.write(f"前端源代码拼接报告\n")
             report.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             report.write(f"文件列表:\n")
-            for i, html_file in enumerate(html_files, 1):
-                file_size = html_file.stat().st_size
+            for i, (html_file, file_size) in enumerate(zip(html_files, file_sizes), 1):
                 report.write(f"{i:2d}. {html_file.name} ({file_size:,} 字节)\n")
             
-            report.write(f"\n总计: {len(html_files)} 个文件，{sum(f.stat().st_size for f in html_files):,} 字节\n")
+            report.write(f"\n总计: {len(html_files)} 个文件，{sum(file_sizes):,} 字节\n")
+            if dedup_result:
+                report.write(f"公共组件去重: {len(dedup_result.components)} 个公共组件，"
+                             f"{dedup_result.original_chars:,} → {dedup_result.deduplicated_chars:,} 字符\n")
+                for component in dedup_result.components:
+                    report.write(f"  {component.id}. {component.label} "
+                                 f"({len(component.pages)} 个页面，共 {component.occurrences} 处)\n")
         
         print_success("📋 生成详细报告: 前端拼接报告.txt")
         return True
@@ -238,16 +292,24 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
         print("前端页面源代码拼接脚本 (Python版本)")
         print("\n用法:")
-        print("  python3 merge_frontend_simple.py")
+        print("  python3 merge_frontend_simple.py [--no-cache] [--docx] [--pdf] [--dedup]")
+        print("\n选项:")
+        print("  --no-cache  不使用 output_docs/.cache 增量缓存，全部重新处理")
+        print("  --docx      同时生成带页眉和页码的分页 DOCX 文档")
+        print("  --pdf       同时生成带页眉和页码的分页 PDF 文档")
+        print("  --dedup     跨页面去重，重复的页头、侧边栏、页脚和脚本函数只在“公共组件”部分输出一次")
         print("\n说明:")
         print("  将 output_sourcecode/front/ 目录下的所有HTML文件")
         print("  拼接成单一的源代码文档用于软著申请")
         print("\n输出:")
         print("  output_docs/前端源代码.txt")
+        print("  output_docs/前端源代码.docx / .pdf（指定 --docx / --pdf 时）")
         print("  output_docs/前端拼接报告.txt")
         return
     
-    success = merge_frontend_files()
+    formats = [document_format for document_format in DOCUMENT_FORMATS if f'--{document_format}' in sys.argv[1:]]
+    success = merge_frontend_files(use_cache='--no-cache' not in sys.argv[1:], formats=formats,
+                                   dedup='--dedup' in sys.argv[1:])
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
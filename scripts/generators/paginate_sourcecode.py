@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+源代码文档分页提取脚本 (Python版本)
+功能：按软著申请格式（每页约50行）对拼接生成的源代码文档分页，
+只输出前30页和后30页，并生成全部页面的页码索引
+
+特点：
+- 单次流式扫描源文档，超过行宽的长行按显示宽度折行（中文等全角字符按2列计），折行后每页固定行数
+- 前30页边扫描边写出，只保留最后30页所在的源文本块，结束时写出；
+  中间部分只统计行数和折行，不保存也不写出，内存占用与文档大小无关
+- 总页数不超过60页时输出全部页面
+- 页与页之间用换页符 (\f) 分隔，文字处理软件和打印机会按换页符分页
+- 页码索引记录每页对应的源文档行号范围和所属源文件（来自拼接文档中的“文件 N: 名称”标记）
+
+输出文件（以 前端源代码.txt 为例）：
+  output_docs/前端源代码_分页提取.txt   前30页和后30页
+  output_docs/前端源代码_页码索引.txt   所有页面的页码索引
+"""
+
+import re
+import sys
+import argparse
+import unicodedata
+from pathlib import Path
+from bisect import bisect_right
+from itertools import accumulate, compress
+from collections import deque, namedtuple
+from typing import Iterable, List, Optional
+
+# 颜色输出类
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    PURPLE = '\033[0;35m'
+    NC = '\033[0m'  # No Color
+
+def print_success(message: str):
+    print(f"{Colors.GREEN}✓ {message}{Colors.NC}")
+
+def print_info(message: str):
+    print(f"{Colors.BLUE}ℹ {message}{Colors.NC}")
+
+def print_warning(message: str):
+    print(f"{Colors.YELLOW}⚠ {message}{Colors.NC}")
+
+def print_error(message: str):
+    print(f"{Colors.RED}✗ {message}{Colors.NC}")
+
+OUTPUT_DIR = Path("output_docs")
+# 默认分页的拼接文档（软著申请提交前端、后端源代码）
+DEFAULT_DOCUMENTS = ["前端源代码.txt", "后端源代码.txt"]
+
+LINES_PER_PAGE = 50
+HEAD_PAGES = 30
+TAIL_PAGES = 30
+# 每行的显示宽度（半角字符数），超过时折行
+LINE_WIDTH = 80
+TAB_SIZE = 4
+PAGE_BREAK = '\f'
+# 流式读取的块大小（字符数）
+READ_BLOCK_SIZE = 1024 * 1024
+
+EXTRACT_SUFFIX = "_分页提取.txt"
+INDEX_SUFFIX = "_页码索引.txt"
+
+# 拼接文档中每个源文件开头的标记行
+FILE_MARKER = re.compile(r"文件 \d+: (.+)")
+
+PageInfo = namedtuple('PageInfo', ['number', 'first_line', 'last_line', 'files'])
+PaginationResult = namedtuple('PaginationResult', [
+    'source', 'output', 'index', 'total_pages', 'total_lines', 'extracted_pages'
+])
+
+def char_width(char: str) -> int:
+    """字符的显示宽度：全角/宽字符为2，组合字符为0，其余为1"""
+    if unicodedata.combining(char):
+        return 0
+    if unicodedata.east_asian_width(char) in ('W', 'F'):
+        return 2
+    return 1
+
+class _WidthTable(dict):
+    """str.translate 使用的映射表：码位 -> 显示宽度对应的单个字符，首次遇到时计算"""
+
+    def __missing__(self, code: int) -> str:
+        value = chr(char_width(chr(code)))
+        self[code] = value
+        return value
+
+_WIDTHS = _WidthTable()
+
+def wrap_line(line: str, width: int = LINE_WIDTH) -> List[str]:
+    """按显示宽度把一行折为若干行（不含换行符），空行返回一个空字符串"""
+    if '\t' in line:
+        line = line.expandtabs(TAB_SIZE)
+    if line.isascii():
+        if len(line) <= width:
+            return [line]
+        return [line[start:start + width] for start in range(0, len(line), width)]
+    if len(line) * 2 <= width:
+        # 即使全部是宽字符也不会超出行宽
+        return [line]
+
+    # 一次 translate 得到每个字符的宽度，累加后二分查找每段的结束位置
+    columns = list(accumulate(line.translate(_WIDTHS).encode('latin-1'), initial=0))
+    if columns[-1] <= width:
+        return [line]
+    segments = []
+    start = 0
+    length = len(line)
+    while start < length:
+        end = bisect_right(columns, columns[start] + width, start) - 1
+        if end <= start:
+            # 行宽不足一个宽字符时每行至少放一个字符
+            end = start + 1
+        segments.append(line[start:end])
+        start = end
+    return segments
+
+# 列字符串中宽字符后半部分的占位符
+_SECOND_HALF = '\uffff'
+_NON_BMP = re.compile('[\uffff\U00010000-\U0010ffff]')
+_column_patterns = None
+
+def _character_class(codes: List[int]) -> str:
+    """把码位列表压缩为正则字符类"""
+    ranges = []
+    for code in codes:
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return '[' + ''.join(re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+                         for first, last in ranges) + ']'
+
+def _get_column_patterns():
+    """基本多文种平面内宽字符和组合字符的正则，首次使用时生成（只含 BMP 字符时正则引擎按位图查表）"""
+    global _column_patterns
+    if _column_patterns is None:
+        widths = [(code, char_width(chr(code))) for code in range(0x80, 0x10000)]
+        _column_patterns = (re.compile(_character_class([code for code, width in widths if width == 2])),
+                            re.compile(_character_class([code for code, width in widths if width == 0])))
+    return _column_patterns
+
+def wrapped_line_count(line: str, width: int = LINE_WIDTH) -> int:
+    """
+    折行后的行数，与 len(wrap_line(line, width)) 相同（width 至少为2）
+
+    中间页面只需要计数：把行转换为每个字符占一列的列字符串（宽字符占两列，组合字符不占列），
+    由正则引擎完成，然后按行宽整段跳过，宽字符跨越行尾时提前折行
+    """
+    if '\t' in line:
+        line = line.expandtabs(TAB_SIZE)
+    if line.isascii():
+        return max(1, -(-len(line) // width))
+    length = len(line)
+    if length * 2 <= width:
+        return 1
+    # 宽字符的 UTF-8 编码至少3字节，(字节数 - 字符数) // 2 不小于宽字符数，可以不转换列字符串直接排除短行
+    if length + (len(line.encode('utf-8', 'surrogatepass')) - length) // 2 <= width:
+        return 1
+    columns = column_text(line)
+    if columns is None:
+        return len(wrap_line(line, width))
+    return _column_line_count(columns, width)
+
+def column_text(text: str) -> Optional[str]:
+    """
+    把文本转换为每个字符占一列的列字符串：宽字符替换为两个字符，组合字符删除，换行位置不变；
+    文本含 BMP 以外的字符（扩展汉字、表情符号等）时返回 None
+    """
+    if text.isascii():
+        return text
+    if _NON_BMP.search(text):
+        return None
+    wide, zero = _get_column_patterns()
+    return wide.sub('W' + _SECOND_HALF, zero.sub('', text))
+
+def _column_line_count(columns: str, width: int) -> int:
+    """列字符串中一行折行后的行数：按行宽整段跳过，宽字符跨越行尾时提前折行"""
+    length = len(columns)
+    count = 1
+    position = 0
+    while length - position > width:
+        end = position + width
+        if columns[end] == _SECOND_HALF:
+            end -= 1
+        position = end
+        count += 1
+    return count
+
+class PageWriter:
+    """按行接收文本，折行后每 lines_per_page 行一页写入输出流，最多写出 limit 页"""
+
+    def __init__(self, output, lines_per_page: int, width: int, limit: Optional[int] = None,
+                 separate_first: bool = False):
+        self.output = output
+        self.lines_per_page = lines_per_page
+        self.width = width
+        self.limit = limit
+        self.page_lines: List[str] = []
+        self.written = 0
+        # 输出流中已有页面时，第一页之前也需要换页符
+        self.separate_first = separate_first
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and self.written >= self.limit
+
+    def feed(self, lines: Iterable[str], skip_segments: int = 0):
+        """写入若干行；skip_segments 为第一行开头需要跳过的折行数（属于上一页）"""
+        for line in lines:
+            segments = wrap_line(line, self.width)
+            if skip_segments:
+                segments = segments[skip_segments:]
+                skip_segments = 0
+            for segment in segments:
+                if self.done:
+                    return
+                self.page_lines.append(segment)
+                if len(self.page_lines) == self.lines_per_page:
+                    self._write_page()
+
+    def _write_page(self):
+        if self.written or self.separate_first:
+            self.output.write(PAGE_BREAK)
+        self.output.write('\n'.join(self.page_lines))
+        self.output.write('\n')
+        self.page_lines = []
+        self.written += 1
+
+    def close(self):
+        if self.page_lines and not self.done:
+            self._write_page()
+        self.page_lines = []
+
+def _split_lines(text: str) -> List[str]:
+    """按换行拆分文本块，末尾的换行不产生空行"""
+    return text[:-1].split('\n') if text.endswith('\n') else text.split('\n')
+
+def _long_line_indexes(lines: List[str], length: int) -> Iterable[int]:
+    """超过 length 个字符的行的序号（在 C 层完成筛选）"""
+    return compress(range(len(lines)), map(length.__lt__, map(len, lines)))
+
+def _line_matches(text: str, pattern):
+    """逐个返回 (行序号, 匹配)，行序号从0开始"""
+    index = position = 0
+    for match in pattern.finditer(text):
+        index += text.count('\n', position, match.start())
+        position = match.start()
+        yield index, match
+
+class Paginator:
+    """
+    流式分页器：按块接收源文档文本，为所有页面建立页码索引，
+    前 head_pages 页直接写入输出流，保留最后 tail_pages 页所在的源文本，结束时写出
+
+    中间部分只计数：源文件标记行由正则查找，纯 ASCII 块按行长度整块判断是否需要折行，
+    只有标记行和可能需要折行的长行交给 Python 处理
+    """
+
+    def __init__(self, output, lines_per_page: int = LINES_PER_PAGE, head_pages: int = HEAD_PAGES,
+                 tail_pages: int = TAIL_PAGES, width: int = LINE_WIDTH):
+        self.output = output
+        self.lines_per_page = lines_per_page
+        self.head_pages = head_pages
+        self.tail_pages = tail_pages
+        self.width = width
+        self.head = PageWriter(output, lines_per_page, width, limit=head_pages)
+        # 页面表：[首行行号, 首行跳过的折行数, 末行行号, 源文件列表]
+        self.pages: List[list] = []
+        self.page_fill = 0
+        self.current_file: Optional[str] = None
+        self.source_line = 0
+        # 保留的源文本块：(首行行号, 文本, 折行后的行数)
+        self.retained = deque()
+        self.retained_lines = 0
+        self.markers = re.compile(rf"^{FILE_MARKER.pattern}$", re.M)
+
+    def _advance(self, count: int):
+        """count 行均不折行"""
+        while count:
+            if self.page_fill == 0:
+                self.pages.append([self.source_line + 1, 0, 0, [self.current_file] if self.current_file else []])
+            take = min(count, self.lines_per_page - self.page_fill)
+            self.source_line += take
+            self.page_fill += take
+            count -= take
+            if self.page_fill == self.lines_per_page:
+                self.pages[-1][2] = self.source_line
+                self.page_fill = 0
+
+    def _advance_wrapped(self, segments: int):
+        """一行折为 segments 行"""
+        self.source_line += 1
+        done = 0
+        while done < segments:
+            if self.page_fill == 0:
+                self.pages.append([self.source_line, done, 0, [self.current_file] if self.current_file else []])
+            take = min(segments - done, self.lines_per_page - self.page_fill)
+            self.page_fill += take
+            done += take
+            if self.page_fill == self.lines_per_page:
+                self.pages[-1][2] = self.source_line
+                self.page_fill = 0
+
+    def feed(self, text: str):
+        """接收以换行结尾的完整行（最后一块可以不以换行结尾）"""
+        if not text:
+            return
+        if '\t' in text:
+            text = text.expandtabs(TAB_SIZE)
+        first_line = self.source_line + 1
+        physical_before = self.physical_lines_so_far()
+
+        lines = _split_lines(text)
+        if not self.head.done:
+            self.head.feed(lines)
+
+        # 事件：(块内行序号, 0, 文件名) 为源文件标记，(块内行序号, 1, 折行数) 为需要折行的行
+        events = []
+        if '文件 ' in text:
+            events.extend((index, 0, match.group(1)) for index, match in _line_matches(text, self.markers))
+        width = self.width
+        if text.isascii():
+            # 纯 ASCII 块中只有超过 width 个字符的行需要折行，多数块一次 max 即可排除
+            if max(map(len, lines)) > width:
+                events.extend((index, 1, -(-len(lines[index]) // width))
+                              for index in _long_line_indexes(lines, width))
+        else:
+            # 至少 width//2+1 个字符的行才可能超出行宽（全角字符按2列计）
+            for index in _long_line_indexes(lines, width // 2):
+                line = lines[index]
+                if len(line) > width or not line.isascii():
+                    segments = wrapped_line_count(line, width)
+                    if segments > 1:
+                        events.append((index, 1, segments))
+        events.sort()
+
+        position = 0
+        for index, kind, value in events:
+            self._advance(index - position)
+            position = index
+            if kind == 0:
+                self.current_file = value
+                if self.page_fill and value not in self.pages[-1][3]:
+                    self.pages[-1][3].append(value)
+            else:
+                self._advance_wrapped(value)
+                position += 1
+
+        self._advance(len(lines) - position)
+
+        if self.tail_pages > 0:
+            chunk_lines = self.physical_lines_so_far() - physical_before
+            self.retained.append((first_line, text, chunk_lines))
+            self.retained_lines += chunk_lines
+            # 去掉最早的块后仍足够覆盖最后 tail_pages 页时丢弃该块
+            while self.retained_lines - self.retained[0][2] >= self.tail_pages * self.lines_per_page:
+                self.retained_lines -= self.retained.popleft()[2]
+
+    def physical_lines_so_far(self) -> int:
+        return (len(self.pages) - (1 if self.page_fill else 0)) * self.lines_per_page + self.page_fill
+
+    def close(self) -> List[int]:
+        """写出最后几页，返回输出的页码列表"""
+        if self.page_fill:
+            self.pages[-1][2] = self.source_line
+            self.page_fill = 0
+        self.head.close()
+        total = len(self.pages)
+        written = list(range(1, min(self.head_pages, total) + 1))
+
+        tail_start = max(self.head_pages + 1, total - self.tail_pages + 1)
+        if self.tail_pages > 0 and tail_start <= total:
+            start_line, skip_segments = self.pages[tail_start - 1][0], self.pages[tail_start - 1][1]
+            tail = PageWriter(self.output, self.lines_per_page, self.width, separate_first=self.head.written > 0)
+            for first_line, text, _ in self.retained:
+                lines = _split_lines(text)
+                last_line = first_line + len(lines) - 1
+                if last_line < start_line:
+                    continue
+                if first_line < start_line:
+                    lines = lines[start_line - first_line:]
+                tail.feed(lines, skip_segments)
+                skip_segments = 0
+            tail.close()
+            written.extend(range(tail_start, total + 1))
+        self.retained.clear()
+        return written
+
+    def page_index(self) -> List[PageInfo]:
+        return [PageInfo(number, first_line, last_line, files)
+                for number, (first_line, _, last_line, files) in enumerate(self.pages, 1)]
+
+def page_ranges(numbers: List[int]) -> str:
+    """把页码列表格式化为区间，如 1-30, 71-100"""
+    ranges = []
+    for number in numbers:
+        if ranges and ranges[-1][1] == number - 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ', '.join(f"{start}-{end}" if start != end else str(start) for start, end in ranges)
+
+def write_page_index(index_file: Path, source: Path, pages: List[PageInfo], extracted: List[int],
+                     lines_per_page: int, width: int):
+    """写出页码索引"""
+    extracted_set = set(extracted)
+    with open(index_file, 'w', encoding='utf-8') as f:
+        f.write("源代码文档页码索引\n")
+        f.write(f"源文档: {source}\n")
+        f.write(f"分页规则: 每页 {lines_per_page} 行，每行最多 {width} 个半角字符宽度，超出部分折行\n")
+        f.write(f"总页数: {len(pages)}\n")
+        f.write(f"提取页码: {page_ranges(extracted) or '无'}\n\n")
+        f.write(f"{'页码':>6}  {'提取':<4}  {'源文档行号':<17}  源文件\n")
+        for page in pages:
+            mark = '是' if page.number in extracted_set else ''
+            lines = f"{page.first_line}-{page.last_line}"
+            f.write(f"{page.number:>6}  {mark:<4}  {lines:<17}  {', '.join(page.files)}\n")
+
+def paginate_document(source: Path, output_dir: Optional[Path] = None, lines_per_page: int = LINES_PER_PAGE,
+                      head_pages: int = HEAD_PAGES, tail_pages: int = TAIL_PAGES,
+                      width: int = LINE_WIDTH) -> PaginationResult:
+    """对单个拼接文档分页，写出提取页面和页码索引"""
+    source = Path(source)
+    output_dir = Path(output_dir) if output_dir is not None else source.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"{source.stem}{EXTRACT_SUFFIX}"
+    index_file = output_dir / f"{source.stem}{INDEX_SUFFIX}"
+
+    with open(source, 'r', encoding='utf-8', errors='replace') as f, \
+         open(output_file, 'w', encoding='utf-8') as output:
+        paginator = Paginator(output, lines_per_page, head_pages, tail_pages, width)
+        pending = ''
+        while True:
+            block = f.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            # 按完整行分块，块末尾不完整的行留到下一块
+            cut = block.rfind('\n') + 1
+            if cut == 0:
+                pending += block
+                continue
+            paginator.feed(pending + block[:cut])
+            pending = block[cut:]
+        paginator.feed(pending)
+        extracted = paginator.close()
+
+    pages = paginator.page_index()
+    write_page_index(index_file, source, pages, extracted, lines_per_page, width)
+    return PaginationResult(source, output_file, index_file, len(pages), paginator.source_line, extracted)
+
+def paginate_documents(documents: Optional[List[str]] = None, output_dir: Path = OUTPUT_DIR,
+                       **options) -> List[PaginationResult]:
+    """对 output_docs/ 下的拼接文档分页，不存在的文档跳过"""
+    results = []
+    for name in documents or DEFAULT_DOCUMENTS:
+        source = Path(name)
+        if not source.is_absolute() and not source.exists():
+            source = output_dir / name
+        if not source.exists():
+            print_warning(f"文档不存在，跳过分页: {source}")
+            continue
+        result = paginate_document(source, output_dir, **options)
+        results.append(result)
+
+        minimum = options.get('head_pages', HEAD_PAGES) + options.get('tail_pages', TAIL_PAGES)
+        print_success(f"{source.name}: 共 {result.total_pages} 页，已提取第 {page_ranges(result.extracted_pages) or '无'} 页")
+        if result.total_pages < minimum:
+            print_warning(f"{source.name} 不足 {minimum} 页，已输出全部页面")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='源代码文档分页提取（软著申请前30页和后30页）')
+    parser.add_argument('documents', nargs='*',
+                        help=f"要分页的拼接文档（默认 output_docs/ 下的 {'、'.join(DEFAULT_DOCUMENTS)}）")
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR), help='输出目录（默认 output_docs）')
+    parser.add_argument('--lines-per-page', type=int, default=LINES_PER_PAGE, help='每页行数（默认50）')
+    parser.add_argument('--head-pages', type=int, default=HEAD_PAGES, help='提取开头的页数（默认30）')
+    parser.add_argument('--tail-pages', type=int, default=TAIL_PAGES, help='提取结尾的页数（默认30）')
+    parser.add_argument('--width', type=int, default=LINE_WIDTH, help='每行最大显示宽度，超出折行（默认80）')
+    args = parser.parse_args()
+
+    if args.lines_per_page <= 0 or args.width <= 1 or args.head_pages < 0 or args.tail_pages < 0:
+        print_error("每页行数必须大于0，行宽必须大于1，提取页数不能为负数")
+        return 1
+
+    results = paginate_documents(args.documents, Path(args.output_dir), lines_per_page=args.lines_per_page,
+                                 head_pages=args.head_pages, tail_pages=args.tail_pages, width=args.width)
+    if not results:
+        print_error("没有可分页的源代码文档，请先执行拼接脚本")
+        return 1
+
+    for result in results:
+        print_info(f"提取页面: {result.output}")
+        print_info(f"页码索引: {result.index}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
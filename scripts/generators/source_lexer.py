@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+源代码词法分析模块 (Python版本)
+功能：单次线性扫描后端源文件，按语言识别注释、字符串和关键字，
+统计函数/类定义数量、分支数量（圈复杂度）和注释占比，供质量监控工具使用
+
+特点：
+- 支持 Java、Python、JavaScript/TypeScript、PHP、Go，以及 C#、Ruby；其他扩展名按类 C 语法处理
+- 注释和字符串整体跳过，其中的关键字不计数；关键字按完整单词匹配，
+  modifier、format 等标识符中的 if、for 不会被误计
+- 只匹配需要统计的词法单元，其余代码由正则引擎整块跳过，不逐个字符处理
+- 圈复杂度 = 分支数 + 函数数（没有函数定义时按 1 计），分支包括 if/elif、循环、case、catch 和 && / ||
+"""
+
+import re
+from functools import lru_cache
+from collections import namedtuple
+from typing import Optional
+
+SourceMetrics = namedtuple('SourceMetrics', [
+    'functions', 'classes', 'decisions', 'complexity',
+    'error_handlers', 'comment_chars', 'total_chars'
+])
+
+# 语言定义：
+#   comments / strings   注释和字符串的正则分支
+#   decisions            计入圈复杂度的关键字
+#   functions / classes  函数定义和类型定义关键字（前面紧跟 . 的不计，如 Foo.class）
+#   errors               错误处理关键字
+#   operators            计入圈复杂度的逻辑运算符
+#   declarations         方法声明：'typed' 为类 Java 的 [返回类型] 名称 ( 参数 ) [throws ...] {，
+#                        'untyped' 为 JS/TS 类方法 名称 ( 参数 ) [: 返回类型] {，None 为不识别
+#   docstrings           三引号字符串按文档字符串计入注释
+Language = namedtuple('Language', [
+    'comments', 'strings', 'decisions', 'functions', 'classes', 'errors',
+    'operators', 'declarations', 'docstrings'
+])
+
+# 各分支都以固定字符开头，不使用分组和单词边界，正则引擎可以按首字符快速跳过其余代码
+_C_COMMENTS = r"//[^\n]*|/\*.*?(?:\*/|\Z)"
+_HASH_COMMENTS = r"#[^\n]*"
+_QUOTED = r""""(?:[^"\\\n]+|\\.)*(?:"|$)|'(?:[^'\\\n]+|\\.)*(?:'|$)"""
+_TRIPLE_QUOTED = r'"""(?:[^"\\]+|\\.|"(?!""))*(?:"""|\Z)' + r"|'''(?:[^'\\]+|\\.|'(?!''))*(?:'''|\Z)"
+_BACKTICK = r"`(?:[^`\\]+|\\.)*(?:`|\Z)"
+# 方法声明的参数列表结束处：) [throws ...] {，JS/TS 为 ) [: 返回类型] {
+_DECLARATION_ENDS = {
+    'typed': r"\)\s*(?:throws\s+[\w$.,\s<>]+)?\{",
+    'untyped': r"\)\s*(?::\s*[\w$][\w$.,\s<>\[\]|]*)?\{",
+}
+# 倒序文本：方法名、空白、前一个单词、再前一个字符
+_REVERSED_PREFIX = re.compile(r"\s*([\w$]+)\s*([\w$]*)(.?)", re.S)
+# 类型定义关键字后的类型名
+_TYPE_NAME = re.compile(r"\s+([\w$]+)")
+
+_C_ERRORS = ('try', 'catch', 'throw', 'throws', 'finally')
+_C_OPERATORS = ('&&', '||')
+
+LANGUAGES = {
+    'java': Language(_C_COMMENTS, _QUOTED,
+                     ('if', 'for', 'while', 'case', 'catch'), (),
+                     ('class', 'interface', 'enum', 'record'), _C_ERRORS, _C_OPERATORS, 'typed', False),
+    'csharp': Language(_C_COMMENTS, _QUOTED,
+                       ('if', 'for', 'foreach', 'while', 'case', 'catch'), (),
+                       ('class', 'interface', 'enum', 'struct', 'record'), _C_ERRORS, _C_OPERATORS, 'typed', False),
+    'javascript': Language(_C_COMMENTS, _QUOTED + '|' + _BACKTICK,
+                           ('if', 'for', 'while', 'case', 'catch'), ('function', '=>'),
+                           ('class', 'interface', 'enum'), _C_ERRORS, _C_OPERATORS, 'untyped', False),
+    'php': Language(_C_COMMENTS + '|' + _HASH_COMMENTS, _QUOTED,
+                    ('if', 'elseif', 'for', 'foreach', 'while', 'case', 'catch', 'and', 'or'), ('function',),
+                    ('class', 'interface', 'trait', 'enum'), _C_ERRORS, _C_OPERATORS, None, False),
+    'go': Language(_C_COMMENTS, _QUOTED + '|' + _BACKTICK,
+                   ('if', 'for', 'case'), ('func',),
+                   ('type',), ('err', 'panic', 'recover'), _C_OPERATORS, None, False),
+    'python': Language(_HASH_COMMENTS, _TRIPLE_QUOTED + '|' + _QUOTED,
+                       ('if', 'elif', 'for', 'while', 'except', 'and', 'or'), ('def',),
+                       ('class',), ('try', 'except', 'raise', 'finally'), (), None, True),
+    'ruby': Language(_HASH_COMMENTS, _QUOTED,
+                     ('if', 'elsif', 'unless', 'while', 'until', 'for', 'when', 'rescue', 'and', 'or'), ('def',),
+                     ('class', 'module'), ('begin', 'rescue', 'raise', 'ensure'), _C_OPERATORS, None, False),
+}
+
+EXTENSION_LANGUAGES = {
+    '.java': 'java', '.kt': 'java', '.scala': 'java',
+    '.cs': 'csharp',
+    '.js': 'javascript', '.jsx': 'javascript', '.mjs': 'javascript', '.ts': 'javascript', '.tsx': 'javascript',
+    '.php': 'php',
+    '.go': 'go',
+    '.py': 'python',
+    '.rb': 'ruby',
+}
+DEFAULT_LANGUAGE = 'java'
+
+# 方法声明名称之前不能出现的关键字（new Foo() { ... } 为匿名类，record Foo(...) { 等为类型定义，
+# function foo() { 已按 function 关键字计数）
+NON_DECLARATION_PREFIXES = {'new', 'return', 'else', 'throw', 'await', 'case',
+                            'class', 'struct', 'record', 'function'}
+# 以关键字开头、后面同样是 ( ... ) { 的语句
+NON_DECLARATION_NAMES = {'if', 'for', 'foreach', 'while', 'switch', 'catch', 'synchronized', 'using', 'lock',
+                         'fixed', 'return', 'new', 'super', 'this', 'try', 'do', 'else', 'with', 'function'}
+# JS/TS 类方法名称前（没有修饰符时）可以出现的字符：上一个成员的结尾、类体开头或装饰器参数
+UNTYPED_DECLARATION_AFTER = {'', ';', '{', '}', ',', ')'}
+
+
+def language_for(suffix: str) -> str:
+    """按扩展名（含点）判断语言，未知扩展名按类 C 语法处理"""
+    return EXTENSION_LANGUAGES.get(suffix.lower(), DEFAULT_LANGUAGE)
+
+def _alternatives(words) -> str:
+    # 长的在前，保证 throws 不会先匹配成 throw
+    return '|'.join(re.escape(word) for word in sorted(set(words), key=lambda word: (-len(word), word)))
+
+@lru_cache(maxsize=None)
+def _token_pattern(language: str):
+    """语言对应的扫描正则：注释、字符串、运算符、关键字（单词边界在扫描时检查），以及方法声明的参数列表结束处"""
+    spec = LANGUAGES[language]
+    words = spec.decisions + spec.functions + spec.classes + spec.errors + spec.operators
+    branches = [spec.comments, spec.strings]
+    if spec.declarations:
+        branches.append(_DECLARATION_ENDS[spec.declarations])
+    branches.append(_alternatives(words))
+    return re.compile('|'.join(branches), re.S | re.M)
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_' or char == '$'
+
+def _open_paren(content: str, close: int) -> int:
+    """与 close 处的右括号配对的左括号位置，找不到时返回 -1"""
+    depth = 1
+    position = close
+    while depth:
+        open_position = content.rfind('(', 0, position)
+        if open_position < 0:
+            return -1
+        depth += content.count(')', open_position + 1, position) - 1
+        position = open_position
+    return position
+
+def _is_declaration(content: str, close: int, style: str = 'typed', class_names=()) -> bool:
+    """
+    close 处的 ) ... { 是否结束一个方法声明：
+    括号前是方法名，方法名前是返回类型、修饰符或泛型参数（排除 if/for 等语句、方法调用和匿名类）；
+    class_names 为已出现的类型名，与类型名相同的是构造方法，前面可以没有修饰符
+    """
+    open_position = _open_paren(content, close)
+    if open_position < 0:
+        return False
+    # 在括号前的文本倒序后从头匹配：方法名、前一个单词、再前一个字符
+    match = _REVERSED_PREFIX.match(content[max(0, open_position - 96):open_position][::-1])
+    if match is None:
+        return False
+    name = match.group(1)[::-1]
+    if name in NON_DECLARATION_NAMES or name[0].isdigit():
+        return False
+
+    previous = match.group(2)
+    if previous:
+        return previous[::-1] not in NON_DECLARATION_PREFIXES
+    if style == 'untyped':
+        # JS/TS 类方法没有返回类型，如 constructor(...) {、render() {
+        return match.group(3) in UNTYPED_DECLARATION_AFTER
+    # 构造方法，如 Foo() {、@Inject(...) Foo(...) {
+    if name in class_names:
+        return True
+    # 其他情况只接受泛型返回类型或数组返回类型，如 List<User> list(...)、int[] ids(...)
+    return match.group(3) in ('>', ']')
+
+def analyze_source(content: str, language: Optional[str] = None) -> SourceMetrics:
+    """
+    单次扫描源代码文本
+
+    language 为 LANGUAGES 中的名称，缺省时按类 C 语法处理；
+    返回 SourceMetrics(函数数, 类型数, 分支数, 圈复杂度, 错误处理关键字数, 注释字符数, 总字符数)
+    """
+    language = language if language in LANGUAGES else DEFAULT_LANGUAGE
+    spec = LANGUAGES[language]
+    decisions_set = set(spec.decisions) | set(spec.operators)
+    functions_set = set(spec.functions)
+    classes_set = set(spec.classes)
+    errors_set = set(spec.errors)
+    length = len(content)
+    class_names = set()
+
+    functions = classes = decisions = error_handlers = comment_chars = 0
+    for match in _token_pattern(language).finditer(content):
+        token = match.group()
+        first = token[0]
+        start = match.start()
+
+        if first == '/' and token[1:2] in ('/', '*') or first == '#':
+            comment_chars += len(token)
+        elif first in '"\'`':
+            if spec.docstrings and token.startswith(('"""', "'''")):
+                comment_chars += len(token)
+        elif first == ')':
+            if 'throws' in token:
+                error_handlers += 1
+            if _is_declaration(content, start, spec.declarations, class_names):
+                functions += 1
+        else:
+            # 关键字必须是完整单词，且不是成员访问（如 Foo.class）
+            if first.isalpha():
+                if start and (_is_word_char(content[start - 1]) or content[start - 1] == '.'):
+                    continue
+                end = match.end()
+                if end < length and _is_word_char(content[end]):
+                    continue
+            if token in decisions_set:
+                decisions += 1
+            if token in functions_set:
+                functions += 1
+            if token in classes_set:
+                classes += 1
+                if spec.declarations == 'typed':
+                    type_name = _TYPE_NAME.match(content, match.end())
+                    if type_name:
+                        class_names.add(type_name.group(1))
+            if token in errors_set:
+                error_handlers += 1
+
+    complexity = decisions + max(functions, 1)
+    return SourceMetrics(functions, classes, decisions, complexity, error_handlers, comment_chars, len(content))
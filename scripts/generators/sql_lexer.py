@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SQL词法分析模块 (Python版本)
+功能：单次线性扫描SQL脚本，按语句开头的关键字统计各类语句数量，
+供数据库拼接脚本和质量监控工具共享
+
+特点：
+- 识别注释（--、#、/* */）和字符串（'...'、"..."、`...`、$tag$...$tag$），其中的关键字不计数
+- 只根据语句开头的关键字分类，ON UPDATE CURRENT_TIMESTAMP、视图中的 SELECT 等不会被误计
+- 支持 MySQL 的 DELIMITER 指令，以及存储过程中 BEGIN ... END 内部的分号
+- 表定义中的约束关键字用一个正则成段匹配统计，不逐个词法单元处理
+- 不需要解析的语句体直接查找下一个引号、注释或结束符，只在遇到引号和注释时使用整体匹配的正则
+- 连续的数据语句（大批量 INSERT 等）按大块批量统计：按引号和分号拆分后用 str 方法计数，
+  只有确认拆分结果与逐个词法单元扫描一致时才采用，否则退回逐条语句处理
+"""
+
+import re
+from functools import lru_cache
+from itertools import repeat
+from collections import Counter, namedtuple
+from typing import Dict, Optional
+
+# 统计结果中优先按此顺序排列的语句类型，其余类型按名称排序
+STATEMENT_TYPES = [
+    'CREATE TABLE', 'CREATE VIEW', 'CREATE INDEX', 'CREATE PROCEDURE', 'CREATE FUNCTION',
+    'INSERT INTO', 'UPDATE', 'DELETE FROM', 'SELECT', 'ALTER TABLE', 'DROP TABLE'
+]
+
+# CREATE / ALTER / DROP 之后的对象类型
+SCHEMA_OBJECTS = {
+    'TABLE', 'VIEW', 'INDEX', 'PROCEDURE', 'FUNCTION', 'TRIGGER', 'EVENT',
+    'DATABASE', 'SCHEMA', 'SEQUENCE', 'TYPE', 'USER', 'ROLE', 'EXTENSION'
+}
+
+# 语句开头关键字到语句类型的映射（未列出的按第一个关键字计）
+LEADING_KEYWORDS = {
+    'INSERT': 'INSERT INTO',
+    'REPLACE': 'REPLACE INTO',
+    'DELETE': 'DELETE FROM',
+    'UPDATE': 'UPDATE',
+    'SELECT': 'SELECT',
+    'WITH': 'SELECT',
+}
+
+# 语句体可能包含 BEGIN ... END 的语句类型
+ROUTINE_TYPES = {'CREATE PROCEDURE', 'CREATE FUNCTION', 'CREATE TRIGGER', 'CREATE EVENT'}
+
+# 需要逐个关键字扫描语句体的语句类型（统计约束）
+CONSTRAINT_TYPES = {'CREATE TABLE', 'ALTER TABLE'}
+
+# 分类 CREATE 语句时最多查看的关键字数（跳过 OR REPLACE、DEFINER=... 等修饰）
+MAX_HEAD_WORDS = 12
+
+# 不能批量统计的语句开头关键字（需要多个关键字分类、统计约束、跟踪 BEGIN ... END，或修改结束符）
+NON_DATA_KEYWORDS = {'CREATE', 'ALTER', 'DROP', 'DELIMITER'}
+
+# 批量统计每次处理的字符数：成功时逐步加大，大部分内容无法批量统计时缩回最小值，
+# 并在之后一段内容中不再尝试，这段距离随连续失败的次数加倍（同样不超过最大值）
+BULK_MIN_CHARS = 1 << 12
+BULK_MAX_CHARS = 1 << 17
+
+# 平均每条语句的引号数超过此值时，批量统计先尝试直接按分号拆分
+PLAIN_SPLIT_QUOTES = 10
+
+# 批量统计的片段中，字符串以外不能出现的内容（注释、双引号字符串、美元符号引用，以及字符串外的反斜杠）；
+# 两个字符的先检查第一个字符，单字符查找快得多
+_BULK_HAZARDS = (('-', '--'), ('#', '#'), ('/', '/*'), ('"', '"'), ('$', '$'), ('\x00', '\x00'))
+
+SQLAnalysis = namedtuple('SQLAnalysis', ['statements', 'constraints'])
+
+_STRINGS = r"""
+    '(?:[^'\\]+|\\.|'')*(?:'|\Z)
+  | "(?:[^"\\]+|\\.|"")*(?:"|\Z)
+  | `[^`]*(?:`|\Z)
+"""
+_COMMENTS = r"""
+    --[^\n]*
+  | \#[^\n]*
+  | /\*.*?(?:\*/|\Z)
+"""
+_DOLLAR = r"""\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?(?:\$(?P=tag)\$|\Z)"""
+
+@lru_cache(maxsize=None)
+def _token_pattern(delimiter: str):
+    """逐个词法单元扫描用的正则"""
+    return re.compile(rf"""
+        (?P<space>\s+)
+      | (?P<comment>{_COMMENTS})
+      | (?P<string>{_STRINGS})
+      | (?P<delim>{re.escape(delimiter)})
+      | (?P<dollar>{_DOLLAR})
+      | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+      | (?P<other>.)
+    """, re.S | re.X)
+
+_WORD_CHAR = r"[A-Za-z0-9_$]"
+
+# 扫描表定义（结束符为分号时）：约束关键字之外的词法单元成段匹配，只有约束关键字单独匹配，
+# 在结束符或文本末尾处匹配失败。各分支的开头字符互不冲突的按出现频率排列，
+# 冲突的（注释和减号、美元符号引用和美元符号等）保持 _token_pattern 的顺序，因此每次匹配的边界都与逐个词法单元扫描一致
+_CONSTRAINT_PATTERN = re.compile(rf"""
+    (?P<constraint>
+        (?ai:CONSTRAINT)(?!{_WORD_CHAR})
+      | (?ai:PRIMARY|FOREIGN)(?!{_WORD_CHAR})(?:\s+|{_COMMENTS})*(?ai:KEY)(?!{_WORD_CHAR})
+    )
+  | (?:
+        (?![CFPcfp])[A-Za-z_]{_WORD_CHAR}*
+      | \s+
+      | [^A-Za-z_;'"`$/\#\-\s]+
+      | (?!(?ai:CONSTRAINT|PRIMARY|FOREIGN)(?!{_WORD_CHAR}))[A-Za-z_]{_WORD_CHAR}*
+      | {_STRINGS}
+      | {_COMMENTS}
+      | {_DOLLAR}
+      | [-/$]
+    )+
+  | [A-Za-z_]{_WORD_CHAR}*
+""", re.S | re.X)
+
+# 语句开头的关键字
+_HEAD_WORD = re.compile(r"\s*([A-Za-z_][A-Za-z0-9_$]*)")
+
+@lru_cache(maxsize=None)
+def _stop_pattern(delimiter: str):
+    """语句体中需要逐个处理的字符：引号、注释和美元符号引用的开头，以及结束符的第一个字符"""
+    return re.compile('[' + re.escape('\'"`$/#-' + delimiter[0]) + ']')
+
+@lru_cache(maxsize=None)
+def _skip_pattern(delimiter: str):
+    """
+    跳过语句体用的正则：一次匹配整个语句体（普通字符按大块匹配，引号和注释整体匹配），
+    在结束符或文本末尾处停下
+    """
+    not_delimiter = f"(?!{re.escape(delimiter)})"
+
+    def guarded(alternative: str, start_chars: str) -> str:
+        # 只有可能以结束符开头的分支才需要排除结束符
+        return not_delimiter + alternative if delimiter[0] in start_chars else alternative
+
+    stop_chars = re.escape('\'"`$/#-' + delimiter[0])
+    strings = guarded(f"(?:{_STRINGS})", '\'"`')
+    comments = guarded(f"(?:{_COMMENTS})", '-#/')
+    dollar = guarded(_DOLLAR, '$')
+    return re.compile(rf"""
+        (?:
+            [^{stop_chars}]+
+          | {strings}
+          | {comments}
+          | {dollar}
+          | {not_delimiter}.
+        )*
+    """, re.S | re.X)
+
+def skip_statement_body(content: str, pos: int, delimiter: str) -> int:
+    """
+    跳过语句体，返回结束符之后的位置（没有结束符时返回文本长度）
+
+    先查找下一个引号、注释开头或结束符，是结束符时直接跳过，
+    否则从这里开始用 _skip_pattern 整体匹配语句体的其余部分
+    """
+    stop = _stop_pattern(delimiter).search(content, pos)
+    if stop is None:
+        return len(content) + len(delimiter)
+    if content.startswith(delimiter, stop.start()):
+        return stop.start() + len(delimiter)
+    return _skip_pattern(delimiter).match(content, stop.start()).end() + len(delimiter)
+
+def _has_hazards(text: str) -> bool:
+    """片段的字符串以外是否有注释、双引号等批量统计无法处理的内容"""
+    return any(char in text and hazard in text for char, hazard in _BULK_HAZARDS)
+
+def _backticks_paired(text: str) -> bool:
+    """
+    反引号标识符是否都不含单引号和分号
+
+    按出现顺序两两配对；字符串中的反引号使配对错位时，配对之间会出现单引号
+    """
+    pieces = text.split('`')
+    identifiers = ''.join(pieces[1::2])
+    return len(pieces) % 2 == 1 and "'" not in identifiers and ';' not in identifiers
+
+def _split_plain(text: str):
+    """
+    没有反斜杠、注释、双引号和美元符号的片段：直接按分号拆分，每段的单引号都成对时
+    所有分号都在字符串以外
+
+    返回 (完整语句列表, 拆分的文本, 最后一个分号的位置, 位置换算函数)，不满足条件时返回 None
+    """
+    if '\\' in text or _has_hazards(text):
+        return None
+    if '`' in text and not _backticks_paired(text):
+        return None
+    statements = text.split(';')
+    last = len(text) - len(statements.pop()) - 1
+    if any(map((1).__and__, map(str.count, statements, repeat("'")))):
+        return None
+    return statements, text, last, lambda stop: stop
+
+def _split_quoted(text: str):
+    """
+    按单引号拆分后去掉字符串内容，再按分号拆分；字符串以外出现注释、双引号等时返回 None
+
+    返回值同 _split_plain，语句和位置都是去掉字符串内容后的，位置换算函数把它换算回原文
+    """
+    used = len(text)
+    if '\\' in text:
+        if '\x00' in text:
+            return None
+        # 转义的反斜杠和引号替换为等长的占位符，字符串以外出现占位符时放弃批量统计
+        text = text.replace('\\\\', '\x00\x00').replace("\\'", '\x00\x00')
+    # 偶数位置在字符串以外；片段在字符串中间截断时丢弃最后一个不完整的字符串
+    parts = text.split("'")
+    if len(parts) % 2 == 0:
+        used -= len(parts.pop()) + 1
+    inside = parts[1::2]
+    # 每个字符串替换为 ''，长度变化只来自字符串内容
+    joined = "''".join(parts[0::2])
+    if _has_hazards(joined):
+        return None
+    if '`' in joined and not _backticks_paired(joined):
+        return None
+
+    def original_position(stop):
+        # stop 之后的每个 '' 在原文中还包含字符串内容（通常 stop 接近片段末尾）
+        tail_strings = joined.count("''", stop)
+        return used - (len(joined) - stop) - sum(map(len, inside[len(inside) - tail_strings:]))
+
+    statements = joined.split(';')
+    last = len(joined) - len(statements.pop()) - 1
+    return statements, joined, last, original_position
+
+def _leading_words(statements, text: str, last: int):
+    """
+    统计连续数据语句的开头关键字，返回 ({关键字: 数量}, 统计的语句数)；
+    在第一条非数据语句或不以关键字开头的语句之前停下
+
+    text 是拆分出 statements 的文本，last 是其中最后一个分号的位置
+    """
+    head = _HEAD_WORD.match(statements[0])
+    if head is None:
+        return {}, 0
+    # 常见情况：每条语句都以相同的空白、关键字和其后的字符开头。text 中的分号都是语句分隔，
+    # 前缀不含分号时，每处“分号 + 前缀”正好对应一条以前缀开头的语句
+    prefix = statements[0][:head.end() + 1]
+    if (len(prefix) > head.end() and ';' not in prefix
+            and text.count(';' + prefix, 0, last) == len(statements) - 1):
+        if head.group(1).upper() in NON_DATA_KEYWORDS:
+            return {}, 0
+        return {head.group(1): len(statements)}, len(statements)
+
+    heads = list(map(_HEAD_WORD.match, statements))
+    if None in heads:
+        # 空语句或不以关键字开头的语句交给逐条处理
+        heads = heads[:heads.index(None)]
+    words = [head.group(1) for head in heads]
+    stops = [words.index(word) for word in set(words) if word.upper() in NON_DATA_KEYWORDS]
+    if stops:
+        words = words[:min(stops)]
+    return Counter(words), len(words)
+
+def count_data_statements(content: str, start: int, end: int):
+    """
+    批量统计 content[start:end] 中从 start 开始的连续数据语句（结束符为分号）
+
+    返回 ({语句类型: 数量}, 最后一条完整语句之后的位置)；片段中字符串以外出现注释、双引号字符串等
+    无法确认拆分结果的内容时返回 None。遇到 CREATE / ALTER / DROP / DELIMITER 开头的语句时在它之前停下
+    """
+    text = content[start:end]
+    # 两种拆分方式的开销分别与分号数和引号数成正比，字符串很多时先尝试直接按分号拆分
+    split = None
+    if text.count("'") > PLAIN_SPLIT_QUOTES * text.count(';'):
+        split = _split_plain(text)
+    split = split or _split_quoted(text)
+    if split is None or not split[0]:
+        return None
+    statements, split_text, last, original_position = split
+    words, consumed = _leading_words(statements, split_text, last)
+    if not consumed:
+        return None
+
+    counts = {}
+    for word, count in words.items():
+        statement_type = classify_statement([word.upper()])
+        counts[statement_type] = counts.get(statement_type, 0) + count
+    # 最后一条统计的语句之后的分号位置
+    if consumed < len(statements):
+        last = sum(map(len, statements[:consumed])) + consumed - 1
+    return counts, start + original_position(last) + 1
+
+def classify_statement(words) -> Optional[str]:
+    """
+    根据语句开头的关键字（大写）分类
+
+    返回语句类型；还需要更多关键字才能判断时返回 None
+    """
+    first = words[0]
+    if first in ('CREATE', 'ALTER', 'DROP'):
+        for word in words[1:]:
+            if word in SCHEMA_OBJECTS:
+                return f"{first} {word}"
+        return None if len(words) < MAX_HEAD_WORDS else first
+    return LEADING_KEYWORDS.get(first, first)
+
+def analyze_sql(content: str) -> SQLAnalysis:
+    """
+    单次扫描SQL文本
+
+    返回 SQLAnalysis(statements={语句类型: 数量}, constraints=约束关键字数量)，
+    约束关键字为 CREATE TABLE / ALTER TABLE 语句中的 CONSTRAINT、PRIMARY KEY 和 FOREIGN KEY
+    """
+    counts = {}
+    constraints = 0
+    length = len(content)
+    delimiter = ';'
+    pos = 0
+    # 批量统计：本次处理的字符数；上次大部分内容无法批量统计时，在 bulk_from 之前不再尝试
+    bulk_chars = bulk_backoff = BULK_MIN_CHARS
+    bulk_from = 0
+
+    while pos < length:
+        token_pattern = _token_pattern(delimiter)
+
+        if delimiter == ';' and pos >= bulk_from:
+            head = _HEAD_WORD.match(content, pos)
+            if head and head.group(1).upper() not in NON_DATA_KEYWORDS:
+                bulk = count_data_statements(content, pos, min(length, pos + bulk_chars))
+                consumed = bulk[1] - pos if bulk else 0
+                if bulk:
+                    for statement_type, count in bulk[0].items():
+                        counts[statement_type] = counts.get(statement_type, 0) + count
+                    pos = bulk[1]
+                if consumed * 2 < bulk_chars:
+                    # 处理的内容不到一半：这一段交给逐条处理，避免反复拆分同一段文本
+                    bulk_from = pos - consumed + bulk_backoff
+                    bulk_chars = BULK_MIN_CHARS
+                    bulk_backoff = min(bulk_backoff * 2, BULK_MAX_CHARS)
+                else:
+                    bulk_chars = min(bulk_chars * 2, BULK_MAX_CHARS)
+                    bulk_backoff = BULK_MIN_CHARS
+                if consumed:
+                    continue
+
+        # 1. 读取语句开头的关键字直到能够分类
+        words = []
+        statement_type = None
+        ended = False
+        while pos < length:
+            match = token_pattern.match(content, pos)
+            kind = match.lastgroup
+            if kind == 'word':
+                word = match.group().upper()
+                if not words and word == 'DELIMITER':
+                    # 客户端指令，修改语句结束符，作用到行尾
+                    line_end = content.find('\n', match.end())
+                    line_end = length if line_end == -1 else line_end
+                    new_delimiter = content[match.end():line_end].strip()
+                    if new_delimiter:
+                        delimiter = new_delimiter
+                    pos = line_end
+                    ended = True
+                    break
+                words.append(word)
+                statement_type = classify_statement(words)
+            pos = match.end()
+            if kind == 'delim':
+                ended = True
+                break
+            if statement_type is not None:
+                break
+
+        if not words:
+            continue
+        if statement_type is None:
+            statement_type = words[0]
+        counts[statement_type] = counts.get(statement_type, 0) + 1
+        if ended:
+            continue
+
+        # 2. 处理语句体直到结束符
+        if statement_type in CONSTRAINT_TYPES and delimiter == ';':
+            match = _CONSTRAINT_PATTERN.match(content, pos)
+            while match:
+                if match.group('constraint'):
+                    constraints += 1
+                pos = match.end()
+                match = _CONSTRAINT_PATTERN.match(content, pos)
+            pos += 1
+        elif statement_type in CONSTRAINT_TYPES or (statement_type in ROUTINE_TYPES and delimiter == ';'):
+            track_blocks = statement_type in ROUTINE_TYPES
+            depth = case_depth = 0
+            pending_end = False
+            previous = ''
+            while pos < length:
+                match = token_pattern.match(content, pos)
+                pos = match.end()
+                kind = match.lastgroup
+
+                if kind == 'word':
+                    word = match.group().upper()
+                    if word == 'CONSTRAINT' or (word == 'KEY' and previous in ('PRIMARY', 'FOREIGN')):
+                        constraints += 1
+                    previous = word
+
+                    if track_blocks:
+                        if pending_end:
+                            # END IF / END LOOP 等结束的是控制语句；END CASE 结束 CASE；其余为块结束
+                            pending_end = False
+                            if word in ('IF', 'LOOP', 'WHILE', 'REPEAT'):
+                                continue
+                            if word == 'CASE':
+                                case_depth = max(0, case_depth - 1)
+                                continue
+                            if case_depth:
+                                case_depth -= 1
+                            else:
+                                depth = max(0, depth - 1)
+                        if word == 'BEGIN':
+                            depth += 1
+                        elif word == 'CASE':
+                            case_depth += 1
+                        elif word == 'END':
+                            pending_end = True
+                elif kind == 'delim':
+                    if pending_end:
+                        pending_end = False
+                        if case_depth:
+                            case_depth -= 1
+                        else:
+                            depth = max(0, depth - 1)
+                    if depth == 0:
+                        break
+                elif kind != 'space' and kind != 'comment':
+                    previous = ''
+        else:
+            pos = skip_statement_body(content, pos, delimiter)
+
+    ordered = {name: counts[name] for name in STATEMENT_TYPES if name in counts}
+    for name in sorted(counts):
+        if name not in ordered:
+            ordered[name] = counts[name]
+    return SQLAnalysis(ordered, constraints)
+
+def count_statements(content: str) -> Dict[str, int]:
+    """按语句类型统计数量"""
+    return analyze_sql(content).statements
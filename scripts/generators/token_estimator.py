@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Token数量估算模块
+为前端源代码分批提供可插拔的token计数接口
+
+内置计数后端：
+- heuristic : 离线的BPE/中日韩字符感知估算器（默认），系数来自 token_calibration.json
+- char4     : 旧版粗略估算（1 token ≈ 4 个字符），中文内容会严重低估
+- tiktoken  : 使用 tiktoken 精确计数（可选依赖，需已安装并缓存词表）
+
+所有后端都按内容哈希缓存计数结果，同一内容只计算一次
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+
+CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'token_calibration.json')
+
+# 未找到校准表时使用的默认系数（与 token_calibration.json 一致）
+DEFAULT_CALIBRATION = {
+    'cjk_per_char': 1.118,
+    'other_per_char': 1.044,
+    'word_chars_per_token': 9,
+    'digit_chars_per_token': 1,
+    'punct_per_char': 0.374,
+    'newline_per_run': 1.368,
+    'space_per_run': 0.0,
+    'safety_margin': 1.143
+}
+
+# 单次扫描把文本切分为若干字符类别的连续片段
+TOKEN_CLASS_PATTERN = re.compile(
+    r'(?P<cjk>[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+)'
+    r'|(?P<word>[A-Za-z]+)'
+    r'|(?P<digit>[0-9]+)'
+    r'|(?P<newline>\n[ \t]*)'
+    r'|(?P<space>[ \t\r\f\v]{2,})'
+    r'|(?P<punct>[!-/:-@\[-`{-~]+)'
+    r'|(?P<other>[^\sA-Za-z0-9!-/:-@\[-`{-~]+)'
+)
+
+# 按字符数或片段数线性计费的类别及其系数名
+LINEAR_COEFFICIENTS = {
+    'cjk': 'cjk_per_char',
+    'other': 'other_per_char',
+    'punct': 'punct_per_char',
+    'newline': 'newline_per_run',
+    'space': 'space_per_run',
+}
+
+# 拟合系数时尝试的英文单词、数字折算长度
+WORD_CHARS_CANDIDATES = tuple(range(3, 13))
+DIGIT_CHARS_CANDIDATES = (1, 2, 3, 4)
+
+def class_features(text, word_chars_per_token, digit_chars_per_token):
+    """
+    统计文本中各字符类别的计费量：英文单词和数字为折算后的token数，
+    中日韩、其他字符和标点为字符数，换行缩进和连续空白为片段数
+    """
+    features = dict.fromkeys(['word', 'digit', *LINEAR_COEFFICIENTS], 0)
+    for match in TOKEN_CLASS_PATTERN.finditer(text):
+        kind = match.lastgroup
+        length = match.end() - match.start()
+        if kind == 'word':
+            features['word'] += math.ceil(length / word_chars_per_token)
+        elif kind == 'digit':
+            features['digit'] += math.ceil(length / digit_chars_per_token)
+        elif kind in ('newline', 'space'):
+            features[kind] += 1
+        else:
+            features[kind] += length
+    return features
+
+def _least_squares(rows, targets):
+    """非负最小二乘（逐步去掉为负的系数后重新求解正规方程），返回各列系数"""
+    active = list(range(len(rows[0])))
+    while True:
+        size = len(active)
+        # 正规方程的增广矩阵，高斯消元求解
+        matrix = [[sum(row[i] * row[j] for row in rows) for j in active] +
+                  [sum(row[i] * target for row, target in zip(rows, targets))] for i in active]
+        for col in range(size):
+            pivot = max(range(col, size), key=lambda r: abs(matrix[r][col]))
+            matrix[col], matrix[pivot] = matrix[pivot], matrix[col]
+            if abs(matrix[col][col]) < 1e-12:
+                continue
+            for r in range(size):
+                if r != col:
+                    factor = matrix[r][col] / matrix[col][col]
+                    matrix[r] = [a - factor * b for a, b in zip(matrix[r], matrix[col])]
+        solution = {index: (matrix[i][size] / matrix[i][i] if abs(matrix[i][i]) >= 1e-12 else 0.0)
+                    for i, index in enumerate(active)}
+        negative = [index for index, value in solution.items() if value < 0]
+        if not negative:
+            return [solution.get(index, 0.0) for index in range(len(rows[0]))]
+        active = [index for index in active if index not in negative]
+
+def fit_calibration(samples):
+    """
+    根据参考样本 [(文本, 实际token数), ...] 拟合 heuristic 后端的系数
+
+    在候选折算长度中选择相对误差平方和最小的组合，其余系数用非负最小二乘求出；
+    safety_margin 取使所有样本都不被低估的最小值
+    """
+    best = None
+    for word_chars in WORD_CHARS_CANDIDATES:
+        for digit_chars in DIGIT_CHARS_CANDIDATES:
+            features = [class_features(text, word_chars, digit_chars) for text, _ in samples]
+            # 按实际token数归一化，使长短样本的相对误差权重相同
+            rows = [[f[kind] / tokens for kind in LINEAR_COEFFICIENTS] for f, (_, tokens) in zip(features, samples)]
+            targets = [1 - (f['word'] + f['digit']) / tokens for f, (_, tokens) in zip(features, samples)]
+            weights = _least_squares(rows, targets)
+            error = sum((sum(w * x for w, x in zip(weights, row)) - target) ** 2
+                        for row, target in zip(rows, targets))
+            if best is None or error < best[0]:
+                best = (error, word_chars, digit_chars, weights)
+
+    _, word_chars, digit_chars, weights = best
+    calibration = {key: round(weight, 3) for key, weight in zip(LINEAR_COEFFICIENTS.values(), weights)}
+    calibration['word_chars_per_token'] = word_chars
+    calibration['digit_chars_per_token'] = digit_chars
+    margin = max(tokens / (f['word'] + f['digit'] + sum(f[kind] * calibration[key] for kind, key in LINEAR_COEFFICIENTS.items()))
+                 for f, (_, tokens) in zip((class_features(text, word_chars, digit_chars) for text, _ in samples), samples))
+    # 向上取整到千分位，保证取整后仍不低估
+    calibration['safety_margin'] = math.ceil(margin * 1000) / 1000
+    return calibration
+
+def load_calibration(path=CALIBRATION_FILE):
+    """
+    读取token估算校准表，缺失或格式错误时使用默认系数
+    """
+    calibration = dict(DEFAULT_CALIBRATION)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        calibration.update({k: v for k, v in data.get('coefficients', {}).items() if k in calibration})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return calibration
+
+def load_reference_samples(path=CALIBRATION_FILE):
+    """
+    读取校准表中的参考样本，返回 ([(文本, 实际token数), ...], 允许的最大相对误差)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reference = json.load(f)['reference']
+    samples = [(sample['text'], sample['tokens']) for sample in reference['samples']]
+    return samples, reference['max_relative_error']
+
+class TokenCounter:
+    """
+    token计数器基类，子类实现 _count()；count() 按内容哈希缓存结果
+    """
+    name = 'base'
+
+    def __init__(self):
+        self._memo = {}
+
+    def count(self, text):
+        if not text:
+            return 0
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        tokens = self._memo.get(key)
+        if tokens is None:
+            tokens = self._count(text)
+            self._memo[key] = tokens
+        return tokens
+
+    def _count(self, text):
+        raise NotImplementedError
+
+class CharRatioCounter(TokenCounter):
+    """
+    旧版估算：1 token ≈ 4 个字符
+    """
+    name = 'char4'
+
+    def _count(self, text):
+        return len(text) // 4
+
+class HeuristicCounter(TokenCounter):
+    """
+    离线BPE近似估算器
+
+    按字符类别分别计费：中日韩字符逐字计费，英文单词按长度折算，
+    数字按位数折算，标点、换行缩进和连续空白单独计费，
+    最后乘以安全系数，保证估算值不低于常见BPE分词器的实际结果
+    """
+    name = 'heuristic'
+
+    def __init__(self, calibration=None):
+        super().__init__()
+        self.calibration = calibration or load_calibration()
+
+    def _count(self, text):
+        c = self.calibration
+        features = class_features(text, c['word_chars_per_token'], c['digit_chars_per_token'])
+        total = features['word'] + features['digit'] + sum(
+            features[kind] * c[key] for kind, key in LINEAR_COEFFICIENTS.items())
+        return math.ceil(total * c['safety_margin'])
+
+class TiktokenCounter(TokenCounter):
+    """
+    基于 tiktoken 的精确计数（可选依赖）
+    """
+    name = 'tiktoken'
+
+    def __init__(self, encoding_name='cl100k_base'):
+        super().__init__()
+        import tiktoken
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def _count(self, text):
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+TOKEN_COUNTERS = {
+    CharRatioCounter.name: CharRatioCounter,
+    HeuristicCounter.name: HeuristicCounter,
+    TiktokenCounter.name: TiktokenCounter,
+}
+
+_counter_instances = {}
+
+def register_token_counter(name, factory):
+    """
+    注册自定义token计数后端，factory 返回 TokenCounter 实例
+    """
+    TOKEN_COUNTERS[name] = factory
+    _counter_instances.pop(name, None)
+
+def get_token_counter(name=None):
+    """
+    获取token计数器（同名后端只创建一次，共享缓存）
+
+    未指定名称时读取环境变量 AI_COPYRIGHT_TOKEN_COUNTER，默认为 heuristic；
+    后端不可用（如未安装 tiktoken）时回退到 heuristic
+    """
+    name = name or os.environ.get('AI_COPYRIGHT_TOKEN_COUNTER') or HeuristicCounter.name
+
+    counter = _counter_instances.get(name)
+    if counter is not None:
+        return counter
+
+    factory = TOKEN_COUNTERS.get(name)
+    try:
+        if factory is None:
+            raise ValueError(f"未知的token计数后端: {name}")
+        counter = factory()
+    except Exception as e:
+        print(f"⚠️  token计数后端 {name} 不可用 ({e})，改用 {HeuristicCounter.name}")
+        counter = get_token_counter(HeuristicCounter.name)
+
+    # 回退时同样记录在请求的名称下，避免重复尝试和重复警告
+    _counter_instances[name] = counter
+    return counter
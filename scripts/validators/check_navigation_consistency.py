@@ -9,14 +9,73 @@
 
 import os
 import sys
+import argparse
 import json
 import re
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import html.parser
 import difflib
 
+# 没有结束标签的元素
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# 开始这些标签时，如果当前打开的是同类元素则先隐式关闭（如未闭合的 <li>）
+IMPLICIT_CLOSE = {
+    'li': {'li'}, 'p': {'p'}, 'option': {'option'}, 'tr': {'tr'},
+    'td': {'td', 'th'}, 'th': {'td', 'th'}
+}
+
+class Element:
+    """轻量级DOM元素，提供检查器用到的 BeautifulSoup Tag 接口（name/get/children/find_all/get_text）"""
+    
+    __slots__ = ('name', 'attrs', 'children', 'parent')
+    
+    def __init__(self, name, attrs, parent=None):
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+        self.parent = parent
+        
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+        
+    def descendants(self):
+        """按文档顺序返回所有后代元素"""
+        stack = [child for child in reversed(self.children) if isinstance(child, Element)]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(child for child in reversed(element.children) if isinstance(child, Element))
+            
+    def find_all(self, name=None):
+        """查找后代元素，name 可以是标签名或标签名列表"""
+        if name is None:
+            return list(self.descendants())
+        names = {name} if isinstance(name, str) else set(name)
+        return [element for element in self.descendants() if element.name in names]
+        
+    def strings(self):
+        """按文档顺序返回所有文本"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Element):
+                stack.extend(reversed(node.children))
+            else:
+                yield node
+                
+    def get_text(self, strip=False):
+        if strip:
+            return ''.join(text.strip() for text in self.strings() if text.strip())
+        return ''.join(self.strings())
+
 class SimpleHTMLParser(html.parser.HTMLParser):
-    """简单的HTML解析器，用于提取导航结构"""
+    """简单的HTML解析器，用于提取导航结构，同时构建页面元素树（self.root）"""
     
     def __init__(self):
         super().__init__()
@@ -25,12 +84,27 @@ class SimpleHTMLParser(html.parser.HTMLParser):
         self.current_element = None
         self.nav_tags = {'header', 'nav', 'aside', 'div'}
         self.nav_classes = {'header', 'navigation', 'nav', 'sidebar', 'breadcrumb', 'menu'}
+        self.root = Element('[document]', {})
+        self.open_elements = [self.root]
         
     def handle_starttag(self, tag, attrs):
-        attrs_dict = dict(attrs)
+        attrs_dict = {name: value or '' for name, value in attrs}
         classes = attrs_dict.get('class', '').split()
         element_id = attrs_dict.get('id', '')
         
+        # 构建元素树
+        closes = IMPLICIT_CLOSE.get(tag)
+        if closes and self.open_elements[-1].name in closes:
+            self.open_elements.pop()
+        parent = self.open_elements[-1]
+        element_attrs = dict(attrs_dict)
+        if 'class' in element_attrs:
+            element_attrs['class'] = classes
+        element = Element(tag, element_attrs, parent)
+        parent.children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.open_elements.append(element)
+        
         # 检查是否是导航相关元素
         if (tag in self.nav_tags or 
             any(nav_class in classes for nav_class in self.nav_classes) or
@@ -44,9 +118,188 @@ class SimpleHTMLParser(html.parser.HTMLParser):
             }
             
     def handle_endtag(self, tag):
+        # 关闭最近的同名元素，没有对应开始标签的结束标签忽略
+        for index in range(len(self.open_elements) - 1, 0, -1):
+            if self.open_elements[index].name == tag:
+                del self.open_elements[index:]
+                break
+                
         if self.current_element and self.current_element['tag'] == tag:
             self.nav_elements.append(self.current_element)
             self.current_element = None
+            
+    def handle_data(self, data):
+        self.open_elements[-1].children.append(data)
+
+# CSS选择器：支持标签、*、.class、#id、[attr]、[attr=v]、[attr*=v]、[attr^=v]、[attr$=v]、
+# [attr~=v]，后代组合（空格）和逗号分组
+SELECTOR_PART = re.compile(r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \.(?P<cls>[\w-]+)
+  | \#(?P<id>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+""", re.X)
+SELECTOR_COMPOUND = re.compile(r"(?:\[[^\]]*\]|[^\s\[])+")
+
+ATTRIBUTE_TESTS = {
+    None: lambda actual, expected: True,
+    '=': lambda actual, expected: actual == expected,
+    '*=': lambda actual, expected: bool(expected) and expected in actual,
+    '^=': lambda actual, expected: bool(expected) and actual.startswith(expected),
+    '$=': lambda actual, expected: bool(expected) and actual.endswith(expected),
+    '~=': lambda actual, expected: expected in actual.split(),
+}
+
+def parse_compound(text):
+    """解析复合选择器（如 nav.menu#main[aria-label*="x"]），返回 (标签, id列表, 类列表, 属性条件列表)"""
+    tag, ids, classes, attrs = None, [], [], []
+    pos = 0
+    while pos < len(text):
+        match = SELECTOR_PART.match(text, pos)
+        if not match or (match.group('tag') and pos > 0):
+            raise ValueError(f"不支持的CSS选择器: {text}")
+        if match.group('tag'):
+            tag = None if match.group('tag') == '*' else match.group('tag').lower()
+        elif match.group('cls'):
+            classes.append(match.group('cls'))
+        elif match.group('id'):
+            ids.append(match.group('id'))
+        else:
+            value = next((v for v in match.group('dq', 'sq', 'bare') if v is not None), None)
+            attrs.append((match.group('attr').lower(), match.group('op'), value))
+        pos = match.end()
+    return tag, tuple(ids), tuple(classes), tuple(attrs)
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """编译选择器，返回后代链列表（每个逗号分组一条，链中按从外到内排列）"""
+    chains = []
+    for group in selector.split(','):
+        compounds = SELECTOR_COMPOUND.findall(group)
+        if not compounds:
+            raise ValueError(f"空的CSS选择器: {selector}")
+        chains.append(tuple(parse_compound(compound) for compound in compounds))
+    return tuple(chains)
+
+def matches_compound(element, compound):
+    tag, ids, classes, attrs = compound
+    if tag is not None and element.name != tag:
+        return False
+    if ids and any(element.attrs.get('id') != element_id for element_id in ids):
+        return False
+    if classes:
+        element_classes = element.attrs.get('class', ())
+        if any(cls not in element_classes for cls in classes):
+            return False
+    for name, op, value in attrs:
+        actual = element.attrs.get(name)
+        if actual is None:
+            return False
+        if isinstance(actual, list):
+            actual = ' '.join(actual)
+        if not ATTRIBUTE_TESTS[op](actual, value):
+            return False
+    return True
+
+def matches_chain(element, chain):
+    """从最内层开始匹配，前面的复合选择器依次在祖先中查找（后代组合）"""
+    if not matches_compound(element, chain[-1]):
+        return False
+    ancestor = element.parent
+    for compound in reversed(chain[:-1]):
+        # 文档根节点（parent 为 None）不参与匹配
+        while ancestor.parent is not None and not matches_compound(ancestor, compound):
+            ancestor = ancestor.parent
+        if ancestor.parent is None:
+            return False
+        ancestor = ancestor.parent
+    return True
+
+def select_all(root, selectors):
+    """
+    一次遍历元素树，返回 {选择器: 按文档顺序排列的匹配元素列表}
+
+    选择器链按最内层复合选择器的 id/类/标签分桶，每个元素只检查可能匹配的链；
+    两级后代选择器（如 header a）通过遍历时维护的"打开的祖先匹配计数"判断，不需要回溯祖先
+    """
+    results = {selector: [] for selector in dict.fromkeys(selectors)}
+    by_id, by_class, by_tag, universal = {}, {}, {}, []
+    open_counts = {}
+    for selector in results:
+        for chain in compile_selector(selector):
+            tag, ids, classes, _ = chain[-1]
+            if ids:
+                bucket = by_id.setdefault(ids[0], [])
+            elif classes:
+                bucket = by_class.setdefault(classes[0], [])
+            elif tag is not None:
+                bucket = by_tag.setdefault(tag, [])
+            else:
+                bucket = universal
+            bucket.append((selector, chain))
+            if len(chain) == 2:
+                open_counts[chain[0]] = 0
+    ancestor_compounds = list(open_counts)
+    
+    # 栈中的 None 标记之后紧跟的是需要在离开元素时递减的祖先计数
+    stack = [child for child in reversed(root.children) if isinstance(child, Element)]
+    while stack:
+        element = stack.pop()
+        if element is None:
+            for compound in stack.pop():
+                open_counts[compound] -= 1
+            continue
+            
+        candidates = list(universal)
+        candidates += by_tag.get(element.name, ())
+        element_id = element.attrs.get('id')
+        if element_id:
+            candidates += by_id.get(element_id, ())
+        for cls in element.attrs.get('class', ()):
+            candidates += by_class.get(cls, ())
+            
+        matched = set()
+        for selector, chain in candidates:
+            if selector in matched:
+                continue
+            if len(chain) == 1:
+                found = matches_compound(element, chain[0])
+            elif len(chain) == 2:
+                found = open_counts[chain[0]] > 0 and matches_compound(element, chain[1])
+            else:
+                found = matches_chain(element, chain)
+            if found:
+                matched.add(selector)
+                results[selector].append(element)
+                
+        entered = [compound for compound in ancestor_compounds if matches_compound(element, compound)]
+        if entered:
+            for compound in entered:
+                open_counts[compound] += 1
+            stack.append(entered)
+            stack.append(None)
+        stack.extend(child for child in reversed(element.children) if isinstance(child, Element))
+        
+    return results
+
+class PageDocument:
+    """页面元素树：解析一次，预先给定的选择器在同一次遍历中全部求值"""
+    
+    def __init__(self, content, selectors=()):
+        parser = SimpleHTMLParser()
+        parser.feed(content)
+        parser.close()
+        self.root = parser.root
+        self.results = select_all(self.root, selectors)
+        
+    def select(self, selector):
+        if selector not in self.results:
+            self.results.update(select_all(self.root, [selector]))
+        return self.results[selector]
+        
+    def select_one(self, selector):
+        matches = self.select(selector)
+        return matches[0] if matches else None
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
@@ -84,11 +337,22 @@ def print_error(message):
 class NavigationConsistencyChecker:
     """导航一致性检查器"""
     
-    def __init__(self):
+    HEADER_SELECTORS = ['header', '.header', '.app-header', '#header', '#app-header']
+    SIDEBAR_SELECTORS = ['.sidebar', '.app-sidebar', '#sidebar', '#app-sidebar', 'aside']
+    BREADCRUMB_SELECTORS = ['.breadcrumb', '.breadcrumb-nav', '#breadcrumb', 'nav[aria-label*="breadcrumb"]']
+    NAV_LINK_SELECTOR = 'header a, .sidebar a, .breadcrumb a, nav a'
+    NAV_CLASS_SELECTOR = 'header, header *, .sidebar, .sidebar *, .breadcrumb, .breadcrumb *, nav, nav *'
+    
+    # 每个页面只解析一次，以上选择器在同一次元素树遍历中全部求值
+    NAVIGATION_SELECTORS = (HEADER_SELECTORS + SIDEBAR_SELECTORS + BREADCRUMB_SELECTORS +
+                            [NAV_LINK_SELECTOR, NAV_CLASS_SELECTOR])
+    
+    def __init__(self, jobs=1):
         self.project_root = project_root
         self.front_dir = self.project_root / "output_sourcecode" / "front"
         self.navigation_issues = []
         self.pages_data = {}
+        self.jobs = jobs
         
     def check_all(self):
         """执行所有导航一致性检查"""
@@ -124,37 +388,57 @@ class NavigationConsistencyChecker:
         return all_passed
         
     def parse_all_pages(self, html_files):
-        """解析所有页面的导航结构"""
+        """解析所有页面的导航结构（jobs > 1 时在进程池中并行解析，按文件顺序收集结果）"""
         print_info("解析页面导航结构...")
         
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # 使用简单的正则表达式和字符串匹配来提取导航结构
-                    page_data = {
-                        'file': html_file.name,
-                        'path': str(html_file),
-                        'header': self.extract_header_structure(content),
-                        'sidebar': self.extract_sidebar_structure(content),
-                        'breadcrumb': self.extract_breadcrumb_structure(content),
-                        'navigation_links': self.extract_navigation_links(content),
-                        'css_classes': self.extract_navigation_css_classes(content),
-                        'javascript': self.extract_navigation_javascript(content)
-                    }
-                    
-                    self.pages_data[html_file.name] = page_data
-                    
-            except Exception as e:
-                print_error(f"解析页面失败 {html_file.name}: {e}")
+        html_files = list(html_files)
+        jobs = min(self.jobs, len(html_files))
+        if jobs > 1:
+            print_info(f"使用 {jobs} 个进程并行解析")
+            chunksize = max(1, len(html_files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                self.collect_pages(executor.map(parse_page_worker, html_files, chunksize=chunksize))
+        else:
+            self.collect_pages(self.parse_page_safe(html_file) for html_file in html_files)
+            
+    def collect_pages(self, results):
+        """收集页面解析结果 (文件名, 页面数据, 错误信息)"""
+        for name, page_data, error in results:
+            if error:
+                print_error(f"解析页面失败 {name}: {error}")
+            else:
+                self.pages_data[name] = page_data
                 
-    def extract_header_structure(self, soup):
-        """提取头部导航结构"""
-        header_selectors = ['header', '.header', '.app-header', '#header', '#app-header']
+    def parse_page_safe(self, html_file):
+        """解析单个页面，异常转换为错误信息返回"""
+        try:
+            return html_file.name, self.parse_page(html_file), None
+        except Exception as e:
+            return html_file.name, None, str(e)
+            
+    def parse_page(self, html_file):
+        """解析单个页面，返回页面数据"""
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # 解析为元素树，一次遍历求出所有导航选择器
+        document = PageDocument(content, self.NAVIGATION_SELECTORS)
+        page_data = {
+            'file': html_file.name,
+            'path': str(html_file),
+            'header': self.extract_header_structure(document),
+            'sidebar': self.extract_sidebar_structure(document),
+            'breadcrumb': self.extract_breadcrumb_structure(document),
+            'navigation_links': self.extract_navigation_links(document),
+            'css_classes': self.extract_navigation_css_classes(document),
+            'javascript': self.extract_navigation_javascript(content)
+        }
+        return page_data
         
-        for selector in header_selectors:
-            header = soup.select_one(selector)
+    def extract_header_structure(self, document):
+        """提取头部导航结构"""
+        for selector in self.HEADER_SELECTORS:
+            header = document.select_one(selector)
             if header:
                 return {
                     'tag': header.name,
@@ -165,12 +449,10 @@ class NavigationConsistencyChecker:
                 }
         return None
         
-    def extract_sidebar_structure(self, soup):
+    def extract_sidebar_structure(self, document):
         """提取侧边栏导航结构"""
-        sidebar_selectors = ['.sidebar', '.app-sidebar', '#sidebar', '#app-sidebar', 'aside']
-        
-        for selector in sidebar_selectors:
-            sidebar = soup.select_one(selector)
+        for selector in self.SIDEBAR_SELECTORS:
+            sidebar = document.select_one(selector)
             if sidebar:
                 return {
                     'tag': sidebar.name,
@@ -181,12 +463,10 @@ class NavigationConsistencyChecker:
                 }
         return None
         
-    def extract_breadcrumb_structure(self, soup):
+    def extract_breadcrumb_structure(self, document):
         """提取面包屑导航结构"""
-        breadcrumb_selectors = ['.breadcrumb', '.breadcrumb-nav', '#breadcrumb', 'nav[aria-label*="breadcrumb"]']
-        
-        for selector in breadcrumb_selectors:
-            breadcrumb = soup.select_one(selector)
+        for selector in self.BREADCRUMB_SELECTORS:
+            breadcrumb = document.select_one(selector)
             if breadcrumb:
                 return {
                     'tag': breadcrumb.name,
@@ -197,10 +477,10 @@ class NavigationConsistencyChecker:
                 }
         return None
         
-    def extract_navigation_links(self, soup):
+    def extract_navigation_links(self, document):
         """提取导航链接"""
         links = []
-        nav_areas = soup.select('header a, .sidebar a, .breadcrumb a, nav a')
+        nav_areas = document.select(self.NAV_LINK_SELECTOR)
         
         for link in nav_areas:
             href = link.get('href', '')
@@ -212,10 +492,10 @@ class NavigationConsistencyChecker:
                 })
         return links
         
-    def extract_navigation_css_classes(self, soup):
+    def extract_navigation_css_classes(self, document):
         """提取导航相关的CSS类名"""
         nav_classes = set()
-        nav_elements = soup.select('header, header *, .sidebar, .sidebar *, .breadcrumb, .breadcrumb *, nav, nav *')
+        nav_elements = document.select(self.NAV_CLASS_SELECTOR)
         
         for element in nav_elements:
             classes = element.get('class', [])
@@ -494,10 +774,26 @@ class NavigationConsistencyChecker:
             
         print_message(Colors.CYAN, "=" * 60)
 
+# 进程池工作进程中复用的检查器实例
+_worker_checker = None
+
+def parse_page_worker(html_file):
+    """进程池任务：解析单个页面，返回 (文件名, 页面数据, 错误信息)"""
+    global _worker_checker
+    if _worker_checker is None:
+        _worker_checker = NavigationConsistencyChecker()
+    return _worker_checker.parse_page_safe(html_file)
+
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='并行解析页面的进程数（0 表示使用全部CPU核心，默认 1）')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     try:
-        checker = NavigationConsistencyChecker()
+        checker = NavigationConsistencyChecker(jobs=jobs)
         success = checker.check_all()
         
         # 返回适当的退出码
@@ -8,9 +8,12 @@
 """
 
 import os
-import sys
 import re
+import sys
+import argparse
+import html
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
@@ -45,13 +48,118 @@ def print_warning(message):
 def print_error(message):
     print_message(Colors.RED, f"✗ {message}")
 
+# 页面词法单元：注释、script/style 元素（内容不解析）、开始标签；属性值中的 > 不会截断标签
+TAG_TOKEN = re.compile(r"""
+    <!--.*?(?:-->|\Z)
+  | <(?P<raw>script|style)\b(?P<raw_attrs>(?:"[^"]*"|'[^']*'|[^'">])*)>.*?(?:</(?P=raw)\s*>|\Z)
+  | <(?P<tag>[a-zA-Z][^\s/>]*)(?P<attrs>(?:"[^"]*"|'[^']*'|[^'">])*)>
+""", re.S | re.I | re.X)
+
+TAG_ATTRIBUTE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+class NavFeatureParser:
+    """
+    导航特征提取器：一次扫描页面，收集所有导航检查需要的特征
+
+    逐个开始标签触发 handle_starttag(tag, attrs)，接口与 html.parser.HTMLParser 相同
+    （标签名和属性名小写，属性值已反转义）；结果见 record()：
+    导航标签计数、class/id/aria-label 集合和内部页面链接
+    """
+    
+    COUNTED_TAGS = ('header', 'nav', 'aside')
+    NAV_CLASS_KEYWORDS = ('nav', 'menu', 'header', 'sidebar', 'breadcrumb')
+    
+    def __init__(self):
+        self.tag_counts = dict.fromkeys(self.COUNTED_TAGS, 0)
+        self.classes = set()
+        self.nav_classes = set()
+        self.ids = set()
+        self.aria_labels = set()
+        self.links = set()
+        self.menu_class_count = 0
+        # class 属性值 -> 是否含 menu；生成页面中大量重复的 class 只分析一次
+        self._class_cache = {}
+        
+    def feed(self, content):
+        """扫描页面内容"""
+        for match in TAG_TOKEN.finditer(content):
+            tag = match.group('tag')
+            if tag is not None:
+                attrs_text = match.group('attrs')
+            else:
+                tag = match.group('raw')
+                if tag is None:
+                    continue
+                attrs_text = match.group('raw_attrs')
+            self.handle_starttag(tag.lower(), self.parse_attrs(attrs_text) if '=' in attrs_text else [])
+            
+    @staticmethod
+    def parse_attrs(attrs_text):
+        attrs = []
+        for name, double_quoted, single_quoted, bare in TAG_ATTRIBUTE.findall(attrs_text):
+            value = double_quoted or single_quoted or bare
+            if '&' in value:
+                value = html.unescape(value)
+            attrs.append((name.lower(), value))
+        return attrs
+        
+    def handle_starttag(self, tag, attrs):
+        if tag in self.tag_counts:
+            self.tag_counts[tag] += 1
+            
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == 'class':
+                analysis = self._class_cache.get(value)
+                if analysis is None:
+                    classes = value.split()
+                    self.classes.update(classes)
+                    nav_classes = [cls for cls in classes
+                                   if any(keyword in cls.lower() for keyword in self.NAV_CLASS_KEYWORDS)]
+                    self.nav_classes.update(nav_classes)
+                    analysis = self._class_cache[value] = 'menu' in value.lower()
+                if analysis:
+                    self.menu_class_count += 1
+            elif name == 'id':
+                self.ids.add(value)
+            elif name == 'aria-label':
+                self.aria_labels.add(value)
+            elif name == 'href':
+                # 只保留站内HTML页面链接（排除外部链接和锚链接），按文件名记录
+                if value.endswith('.html') and not value.startswith(('http', '#')):
+                    self.links.add(value.split('/')[-1])
+                    
+    def record(self):
+        """返回页面的导航特征记录"""
+        return {
+            'tags': dict(self.tag_counts),
+            'classes': self.classes,
+            'nav_classes': self.nav_classes,
+            'ids': self.ids,
+            'aria_labels': self.aria_labels,
+            'links': self.links,
+            'menu_class_count': self.menu_class_count
+        }
+
+def extract_nav_features(content):
+    """单次解析页面内容，返回导航特征记录"""
+    parser = NavFeatureParser()
+    parser.feed(content)
+    return parser.record()
+
+def contains_keyword(values, keyword):
+    """集合中是否有值包含关键字（不区分大小写）"""
+    return any(keyword in value.lower() for value in values)
+
 class SimpleNavigationChecker:
     """简化的导航一致性检查器"""
     
-    def __init__(self):
+    def __init__(self, jobs=1):
         self.project_root = project_root
         self.front_dir = self.project_root / "output_sourcecode" / "front"
         self.pages_data = {}
+        self.jobs = jobs
         
     def check_all(self):
         """执行所有导航一致性检查"""
@@ -85,100 +193,80 @@ class SimpleNavigationChecker:
         return all_passed
         
     def parse_all_pages(self, html_files):
-        """解析所有页面的导航结构"""
+        """解析所有页面的导航结构（jobs > 1 时在进程池中并行解析，按文件顺序收集结果）"""
         print_info("解析页面导航结构...")
         
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                    # 提取导航相关信息
-                    page_data = {
-                        'file': html_file.name,
-                        'path': str(html_file),
-                        'has_header': self.has_header_nav(content),
-                        'has_sidebar': self.has_sidebar_nav(content),
-                        'has_breadcrumb': self.has_breadcrumb_nav(content),
-                        'nav_links': self.extract_nav_links(content),
-                        'nav_css_classes': self.extract_nav_css_classes(content),
-                        'nav_structure': self.extract_nav_structure(content)
-                    }
-                    
-                    self.pages_data[html_file.name] = page_data
-                    
-            except Exception as e:
-                print_error(f"解析页面失败 {html_file.name}: {e}")
+        html_files = list(html_files)
+        jobs = min(self.jobs, len(html_files))
+        if jobs > 1:
+            print_info(f"使用 {jobs} 个进程并行解析")
+            chunksize = max(1, len(html_files) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                self.collect_pages(executor.map(parse_page_worker, html_files, chunksize=chunksize))
+        else:
+            self.collect_pages(self.parse_page_safe(html_file) for html_file in html_files)
+            
+    def collect_pages(self, results):
+        """收集页面解析结果 (文件名, 页面数据, 错误信息)"""
+        for name, page_data, error in results:
+            if error:
+                print_error(f"解析页面失败 {name}: {error}")
+            else:
+                self.pages_data[name] = page_data
                 
-    def has_header_nav(self, content):
+    def parse_page_safe(self, html_file):
+        """解析单个页面，异常转换为错误信息返回"""
+        try:
+            return html_file.name, self.parse_page(html_file), None
+        except Exception as e:
+            return html_file.name, None, str(e)
+            
+    def parse_page(self, html_file):
+        """解析单个页面，返回页面数据"""
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # 一次解析提取所有导航特征
+        features = extract_nav_features(content)
+        page_data = {
+            'file': html_file.name,
+            'path': str(html_file),
+            'has_header': self.has_header_nav(features),
+            'has_sidebar': self.has_sidebar_nav(features),
+            'has_breadcrumb': self.has_breadcrumb_nav(features),
+            'nav_links': sorted(features['links']),
+            'nav_css_classes': sorted(features['nav_classes']),
+            'nav_structure': self.extract_nav_structure(features)
+        }
+        return page_data
+        
+    def has_header_nav(self, features):
         """检查是否有头部导航"""
-        header_patterns = [
-            r'<header[^>]*>',
-            r'class=["\'][^"\']*header[^"\']*["\']',
-            r'id=["\'][^"\']*header[^"\']*["\']',
-            r'<nav[^>]*>'
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in header_patterns)
+        return (features['tags']['header'] > 0 or
+                features['tags']['nav'] > 0 or
+                contains_keyword(features['classes'], 'header') or
+                contains_keyword(features['ids'], 'header'))
         
-    def has_sidebar_nav(self, content):
+    def has_sidebar_nav(self, features):
         """检查是否有侧边栏导航"""
-        sidebar_patterns = [
-            r'<aside[^>]*>',
-            r'class=["\'][^"\']*sidebar[^"\']*["\']',
-            r'id=["\'][^"\']*sidebar[^"\']*["\']',
-            r'class=["\'][^"\']*nav[^"\']*["\']'
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in sidebar_patterns)
+        return (features['tags']['aside'] > 0 or
+                contains_keyword(features['classes'], 'sidebar') or
+                contains_keyword(features['ids'], 'sidebar') or
+                contains_keyword(features['classes'], 'nav'))
         
-    def has_breadcrumb_nav(self, content):
+    def has_breadcrumb_nav(self, features):
         """检查是否有面包屑导航"""
-        breadcrumb_patterns = [
-            r'class=["\'][^"\']*breadcrumb[^"\']*["\']',
-            r'id=["\'][^"\']*breadcrumb[^"\']*["\']',
-            r'aria-label=["\'][^"\']*breadcrumb[^"\']*["\']'
-        ]
-        return any(re.search(pattern, content, re.IGNORECASE) for pattern in breadcrumb_patterns)
-        
-    def extract_nav_links(self, content):
-        """提取导航链接"""
-        # 查找HTML文件链接
-        link_pattern = r'href=["\']([^"\']*\.html)["\']'
-        links = re.findall(link_pattern, content)
+        return (contains_keyword(features['classes'], 'breadcrumb') or
+                contains_keyword(features['ids'], 'breadcrumb') or
+                contains_keyword(features['aria_labels'], 'breadcrumb'))
         
-        # 过滤掉外部链接和锚链接
-        internal_links = []
-        for link in links:
-            if not link.startswith('http') and not link.startswith('#'):
-                # 获取文件名
-                filename = link.split('/')[-1]
-                internal_links.append(filename)
-                
-        return list(set(internal_links))  # 去重
-        
-    def extract_nav_css_classes(self, content):
-        """提取导航相关的CSS类"""
-        nav_keywords = ['nav', 'menu', 'header', 'sidebar', 'breadcrumb']
-        nav_classes = []
-        
-        # 查找class属性
-        class_pattern = r'class=["\']([^"\']*)["\']'
-        class_matches = re.findall(class_pattern, content)
-        
-        for classes in class_matches:
-            class_list = classes.split()
-            for cls in class_list:
-                if any(keyword in cls.lower() for keyword in nav_keywords):
-                    nav_classes.append(cls)
-                    
-        return list(set(nav_classes))  # 去重
-        
-    def extract_nav_structure(self, content):
+    def extract_nav_structure(self, features):
         """提取导航结构特征"""
         structure = {
-            'header_count': len(re.findall(r'<header[^>]*>', content, re.IGNORECASE)),
-            'nav_count': len(re.findall(r'<nav[^>]*>', content, re.IGNORECASE)),
-            'aside_count': len(re.findall(r'<aside[^>]*>', content, re.IGNORECASE)),
-            'menu_class_count': len(re.findall(r'class=["\'][^"\']*menu[^"\']*["\']', content, re.IGNORECASE))
+            'header_count': features['tags']['header'],
+            'nav_count': features['tags']['nav'],
+            'aside_count': features['tags']['aside'],
+            'menu_class_count': features['menu_class_count']
         }
         return structure
         
@@ -223,17 +311,25 @@ class SimpleNavigationChecker:
             return True
             
     def check_navigation_links(self):
-        """检查导航链接有效性"""
+        """检查导航链接有效性，并分析孤立页面和从入口页面不可达的页面"""
         print_info("检查导航链接有效性...")
         
-        all_files = set(data['file'] for data in self.pages_data.values())
-        issues = []
+        # 由已解析的页面记录构建链接图，不重新解析页面（navigation_graph 依赖本模块，在此处导入）
+        from navigation_graph import NavigationGraph
+        graph = NavigationGraph({name: data['nav_links'] for name, data in self.pages_data.items()})
         
-        for page_name, page_data in self.pages_data.items():
-            for link in page_data['nav_links']:
-                if link not in all_files:
-                    issues.append(f"{page_name}: 导航链接指向不存在的文件 '{link}'")
-                    
+        issues = []
+        for page_name, links in graph.broken_links().items():
+            for link in links:
+                issues.append(f"{page_name}: 导航链接指向不存在的文件 '{link}'")
+                
+        orphans = graph.orphan_pages()
+        if orphans:
+            print_warning(f"  孤立页面（没有其他页面的导航链接指向）: {', '.join(orphans)}")
+        unreachable = graph.unreachable_pages()
+        if unreachable:
+            print_warning(f"  从入口页面无法通过导航到达: {', '.join(unreachable)}")
+            
         if issues:
             for issue in issues:
                 print_error(f"  {issue}")
@@ -294,10 +390,26 @@ class SimpleNavigationChecker:
             
         print_message(Colors.CYAN, "=" * 60)
 
+# 进程池工作进程中复用的检查器实例
+_worker_checker = None
+
+def parse_page_worker(html_file):
+    """进程池任务：解析单个页面，返回 (文件名, 页面数据, 错误信息)"""
+    global _worker_checker
+    if _worker_checker is None:
+        _worker_checker = SimpleNavigationChecker()
+    return _worker_checker.parse_page_safe(html_file)
+
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='并行解析页面的进程数（0 表示使用全部CPU核心，默认 1）')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     try:
-        checker = SimpleNavigationChecker()
+        checker = SimpleNavigationChecker(jobs=jobs)
         success = checker.check_all()
         
         # 返回适当的退出码
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+多模式关键词匹配模块
+功能：把若干关键词词典编译为一个 Aho-Corasick 自动机，单次扫描文本即可得到
+所有词典中每个关键词的出现次数和位置
+
+特点：
+- 自动机按词典集合只构建一次，扫描时间与文本长度成线性关系，与关键词数量无关
+- 每个关键词的计数与 str.count 一致（同一关键词的重叠出现不重复计数），
+  不同关键词之间互不影响（如“安全”和“安全性”各自计数）
+- 词典可以设置为不区分大小写（适用于技术名称等英文关键词），区分大小写的关键词在命中后用原文核对
+- 词典从 JSON 数据文件加载，见 requirements_keywords.json
+"""
+
+import re
+import json
+from pathlib import Path
+from collections import namedtuple
+from typing import Dict, Iterable, List
+
+KEYWORDS_FILE = Path(__file__).parent / "requirements_keywords.json"
+
+# 小写化会改变文本长度时（极少数字符，如 'İ'），只折叠 ASCII 大写字母，保证位置一一对应
+ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+def fold_case(text: str) -> str:
+    """转换为小写，保证结果与原文长度相同"""
+    folded = text.lower()
+    return folded if len(folded) == len(text) else text.translate(ASCII_LOWER)
+
+KeywordDictionary = namedtuple('KeywordDictionary', ['name', 'keywords', 'case_sensitive'])
+
+class KeywordHits:
+    """一次扫描的结果：词典 -> 关键词 -> 出现位置列表"""
+
+    def __init__(self, offsets: Dict[str, Dict[str, List[int]]]):
+        self._offsets = offsets
+
+    def offsets(self, dictionary: str, keyword: str) -> List[int]:
+        """关键词在文本中的起始位置"""
+        return self._offsets.get(dictionary, {}).get(keyword, [])
+
+    def counts(self, dictionary: str) -> Dict[str, int]:
+        """词典中每个关键词的出现次数（按词典顺序，包含未出现的关键词）"""
+        return {keyword: len(positions) for keyword, positions in self._offsets.get(dictionary, {}).items()}
+
+    def count(self, dictionary: str) -> int:
+        """词典中所有关键词的出现次数之和"""
+        return sum(len(positions) for positions in self._offsets.get(dictionary, {}).values())
+
+    def found(self, dictionary: str) -> List[str]:
+        """词典中出现过的关键词（按词典顺序）"""
+        return [keyword for keyword, positions in self._offsets.get(dictionary, {}).items() if positions]
+
+class KeywordAutomaton:
+    """由多个关键词词典编译而成的 Aho-Corasick 自动机"""
+
+    def __init__(self, dictionaries: Iterable[KeywordDictionary]):
+        self.dictionaries = list(dictionaries)
+        # 模式表：(词典名, 原始关键词, 长度, 是否区分大小写)
+        self.patterns = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[tuple] = [()]
+
+        for dictionary in self.dictionaries:
+            for keyword in dictionary.keywords:
+                if keyword:
+                    self._add(keyword, dictionary)
+        self._build_failure_links()
+        # 所有关键词首字符组成的字符类，用于在根状态时快速跳过无关文本
+        first_chars = ''.join(re.escape(char) for char in sorted(self.goto[0]))
+        self.start_pattern = re.compile(f"[{first_chars}]") if first_chars else None
+
+    def _add(self, keyword: str, dictionary: KeywordDictionary):
+        state = 0
+        for char in fold_case(keyword):
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] += (len(self.patterns),)
+        self.patterns.append((dictionary.name, keyword, len(keyword), dictionary.case_sensitive))
+
+    def _build_failure_links(self):
+        """
+        按层次遍历建立失败指针，并展开为确定性转移表：
+        每个状态的转移包含沿失败链可达的所有转移，扫描时每个字符只需查一次表
+        """
+        self.delta: List[Dict[str, int]] = [dict(self.goto[0])] + [None] * (len(self.goto) - 1)
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            self.delta[state] = dict(self.delta[self.fail[state]])
+            self.delta[state].update(self.goto[state])
+            for char, next_state in self.goto[state].items():
+                target = self.delta[self.fail[state]].get(char, 0)
+                self.fail[next_state] = target
+                self.output[next_state] += self.output[target]
+                queue.append(next_state)
+
+    def scan(self, text: str) -> KeywordHits:
+        """单次扫描文本，返回所有词典的命中结果"""
+        folded = fold_case(text)
+        delta, output, patterns = self.delta, self.output, self.patterns
+        positions = [[] for _ in patterns]
+        last_end = [0] * len(patterns)
+        find_start = self.start_pattern.search if self.start_pattern is not None else None
+        length = len(folded)
+
+        pos = 0
+        while find_start is not None:
+            # 在根状态时直接跳到下一个可能开始关键词的字符
+            match = find_start(folded, pos)
+            if match is None:
+                break
+            index = match.start()
+            state = 0
+            while index < length:
+                state = delta[state].get(folded[index], 0)
+                if not state:
+                    break
+
+                for pattern_id in output[state]:
+                    _, keyword, size, case_sensitive = patterns[pattern_id]
+                    start = index + 1 - size
+                    # 与 str.count 一致：同一关键词不计重叠出现
+                    if start < last_end[pattern_id]:
+                        continue
+                    if case_sensitive and text[start:index + 1] != keyword:
+                        continue
+                    positions[pattern_id].append(start)
+                    last_end[pattern_id] = index + 1
+                index += 1
+            pos = index + 1
+
+        offsets = {dictionary.name: {} for dictionary in self.dictionaries}
+        for (name, keyword, _, _), found in zip(patterns, positions):
+            offsets[name].setdefault(keyword, [])
+            offsets[name][keyword].extend(found)
+        return KeywordHits(offsets)
+
+def load_keyword_dictionaries(path: Path = KEYWORDS_FILE) -> List[KeywordDictionary]:
+    """
+    从JSON数据文件加载关键词词典
+
+    格式：{"dictionaries": {"词典名": {"keywords": [...], "case_sensitive": true}}}
+    文件缺失或格式错误时抛出 OSError / ValueError
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    dictionaries = []
+    for name, spec in data.get('dictionaries', {}).items():
+        if isinstance(spec, list):
+            spec = {'keywords': spec}
+        keywords = spec.get('keywords', [])
+        if not isinstance(keywords, list):
+            raise ValueError(f"词典 {name} 的 keywords 必须是列表")
+        dictionaries.append(KeywordDictionary(name, [str(k) for k in keywords],
+                                              bool(spec.get('case_sensitive', True))))
+    return dictionaries
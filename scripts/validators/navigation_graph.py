@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+导航链接图工具
+功能：一次解析 output_sourcecode/front/*.html，构建页面之间的链接邻接表，
+在 O(V+E) 时间内分析失效链接、孤立页面、从入口页面（login/index）不可达的页面
+和强连通分量，并导出为JSON供其他验证工具复用，不需要重新解析页面
+
+链接来源：任意标签的 href 属性，以及脚本/事件中的 location.href = '...'、
+location.assign/replace('...')、window.open('...')；只统计站内 .html 页面，按文件名匹配
+
+用法：
+  python3 scripts/validators/navigation_graph.py
+  python3 scripts/validators/navigation_graph.py --json graph.json
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from check_navigation_consistency_simple import (
+    TAG_TOKEN, NavFeatureParser, Colors, print_message, print_success, print_info, print_warning, print_error
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+FRONT_DIR = PROJECT_ROOT / "output_sourcecode" / "front"
+GRAPH_CACHE_FILE = PROJECT_ROOT / "output_docs" / ".cache" / "navigation_graph.json"
+
+# 入口页面：不可达分析的起点，不计为孤立页面
+ENTRY_PAGES = ('login.html', 'index.html')
+
+GRAPH_FORMAT_VERSION = 1
+
+JS_NAVIGATION = re.compile(
+    r"""(?:location(?:\.href)?\s*=|location\.(?:assign|replace)\(|window\.open\()\s*['"]([^'"]+)['"]"""
+)
+EXTERNAL_PREFIXES = ('http:', 'https:', '//', 'mailto:', 'tel:', 'javascript:', 'data:', '#')
+
+def normalize_link(href: str) -> Optional[str]:
+    """站内页面链接转换为目标文件名，外部链接、锚链接和非HTML资源返回 None"""
+    href = href.strip()
+    if not href or href.lower().startswith(EXTERNAL_PREFIXES):
+        return None
+    path = re.split(r'[?#]', href, 1)[0]
+    if not path.lower().endswith('.html'):
+        return None
+    return path.rsplit('/', 1)[-1]
+
+def extract_page_links(content: str) -> List[str]:
+    """提取页面中所有站内页面链接的目标文件名（去重，按出现顺序）"""
+    targets = []
+    for match in TAG_TOKEN.finditer(content):
+        attrs_text = match.group('attrs')
+        if attrs_text is None:
+            attrs_text = match.group('raw_attrs')
+        if not attrs_text or 'href' not in attrs_text.lower():
+            continue
+        for name, value in NavFeatureParser.parse_attrs(attrs_text):
+            if name == 'href':
+                targets.append(normalize_link(value))
+    targets.extend(normalize_link(value) for value in JS_NAVIGATION.findall(content))
+    return [target for target in dict.fromkeys(targets) if target]
+
+def scan_pages(front_dir: Path) -> Dict[str, dict]:
+    """列出目录下的HTML页面：文件名 -> {size, mtime_ns}"""
+    pages = {}
+    with os.scandir(front_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.html') and entry.is_file():
+                stat = entry.stat()
+                pages[entry.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return pages
+
+class NavigationGraph:
+    """页面链接图：links 保留所有链接（含失效链接），adjacency 只包含指向已存在页面的边"""
+
+    def __init__(self, links: Dict[str, Iterable[str]], entries: Iterable[str] = ENTRY_PAGES,
+                 fingerprints: Optional[Dict[str, dict]] = None):
+        self.pages = sorted(links)
+        self.links = {page: list(dict.fromkeys(links[page])) for page in self.pages}
+        self.adjacency = {page: [target for target in self.links[page] if target in self.links]
+                          for page in self.pages}
+        self.entries = [page for page in entries if page in self.links]
+        self.fingerprints = fingerprints or {}
+
+    @classmethod
+    def from_directory(cls, front_dir: Path = FRONT_DIR, entries: Iterable[str] = ENTRY_PAGES) -> 'NavigationGraph':
+        """解析目录下所有页面构建链接图"""
+        front_dir = Path(front_dir)
+        fingerprints = scan_pages(front_dir)
+        links = {}
+        for name in fingerprints:
+            with open(front_dir / name, 'r', encoding='utf-8', errors='replace') as f:
+                links[name] = extract_page_links(f.read())
+        return cls(links, entries, fingerprints)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NavigationGraph':
+        pages = data['pages']
+        fingerprints = {name: {'size': info['size'], 'mtime_ns': info['mtime_ns']} for name, info in pages.items()}
+        return cls({name: info['links'] for name, info in pages.items()}, data.get('entries', ENTRY_PAGES), fingerprints)
+
+    def edge_count(self) -> int:
+        return sum(len(targets) for targets in self.adjacency.values())
+
+    def broken_links(self) -> Dict[str, List[str]]:
+        """指向不存在页面的链接：页面 -> 目标文件名列表"""
+        broken = {}
+        for page in self.pages:
+            missing = [target for target in self.links[page] if target not in self.links]
+            if missing:
+                broken[page] = missing
+        return broken
+
+    def orphan_pages(self) -> List[str]:
+        """没有被其他页面链接的页面（入口页面除外）"""
+        linked = set()
+        for page, targets in self.adjacency.items():
+            linked.update(target for target in targets if target != page)
+        return [page for page in self.pages if page not in linked and page not in self.entries]
+
+    def unreachable_pages(self) -> List[str]:
+        """从入口页面出发沿链接无法到达的页面；没有入口页面时返回空列表"""
+        if not self.entries:
+            return []
+        seen = set(self.entries)
+        queue = list(self.entries)
+        for page in queue:
+            for target in self.adjacency[page]:
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return [page for page in self.pages if page not in seen]
+
+    def strongly_connected_components(self) -> List[List[str]]:
+        """强连通分量（Tarjan 算法，非递归实现），每个分量内按文件名排序"""
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+        counter = 0
+
+        for root in self.pages:
+            if root in index:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.adjacency[root]))]
+
+            while work:
+                node, targets = work[-1]
+                descended = False
+                for target in targets:
+                    if target not in index:
+                        index[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.adjacency[target])))
+                        descended = True
+                        break
+                    if target in on_stack:
+                        low[node] = min(low[node], index[target])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        return sorted(components, key=lambda component: (-len(component), component[0]))
+
+    def to_dict(self) -> dict:
+        """导出为可JSON序列化的字典（包含链接和分析结果）"""
+        return {
+            'version': GRAPH_FORMAT_VERSION,
+            'entries': self.entries,
+            'pages': {page: dict(self.fingerprints.get(page, {'size': 0, 'mtime_ns': 0}), links=self.links[page])
+                      for page in self.pages},
+            'analysis': {
+                'page_count': len(self.pages),
+                'edge_count': self.edge_count(),
+                'broken_links': self.broken_links(),
+                'orphan_pages': self.orphan_pages(),
+                'unreachable_pages': self.unreachable_pages(),
+                'strongly_connected_components': self.strongly_connected_components()
+            }
+        }
+
+    def save_json(self, path: Path):
+        """原子写入JSON文件"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+def load_navigation_graph(front_dir: Path = FRONT_DIR, cache_file: Optional[Path] = GRAPH_CACHE_FILE,
+                          refresh: bool = False) -> NavigationGraph:
+    """
+    获取链接图：缓存文件中的页面列表和大小/修改时间与目录一致时直接复用，
+    否则重新解析所有页面并更新缓存（cache_file 为 None 时不使用缓存）
+    """
+    front_dir = Path(front_dir)
+    if cache_file is not None and not refresh:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == GRAPH_FORMAT_VERSION:
+                graph = NavigationGraph.from_dict(data)
+                if graph.fingerprints == scan_pages(front_dir):
+                    return graph
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    graph = NavigationGraph.from_directory(front_dir)
+    if cache_file is not None:
+        try:
+            graph.save_json(cache_file)
+        except OSError as e:
+            print_warning(f"链接图缓存写入失败: {e}")
+    return graph
+
+def print_graph_report(graph: NavigationGraph) -> int:
+    """输出分析结果，返回失效链接数量"""
+    print_info(f"页面 {len(graph.pages)} 个，站内链接 {graph.edge_count()} 条，"
+               f"入口页面: {', '.join(graph.entries) or '无'}")
+
+    broken = graph.broken_links()
+    broken_count = sum(len(targets) for targets in broken.values())
+    if broken:
+        for page, targets in broken.items():
+            for target in targets:
+                print_error(f"  {page}: 链接指向不存在的页面 '{target}'")
+    else:
+        print_success("没有失效链接")
+
+    orphans = graph.orphan_pages()
+    if orphans:
+        print_warning(f"孤立页面（没有其他页面链接到）: {', '.join(orphans)}")
+    else:
+        print_success("没有孤立页面")
+
+    if not graph.entries:
+        print_warning(f"未找到入口页面 ({', '.join(ENTRY_PAGES)})，跳过可达性分析")
+    else:
+        unreachable = graph.unreachable_pages()
+        if unreachable:
+            print_warning(f"从入口页面不可达的页面: {', '.join(unreachable)}")
+        else:
+            print_success("所有页面都可以从入口页面到达")
+
+    components = graph.strongly_connected_components()
+    cycles = [component for component in components if len(component) > 1]
+    print_info(f"强连通分量 {len(components)} 个，其中包含多个页面的 {len(cycles)} 个"
+               + (f"（最大 {len(cycles[0])} 个页面）" if cycles else ""))
+
+    return broken_count
+
+def main():
+    parser = argparse.ArgumentParser(description='导航链接图分析')
+    parser.add_argument('--front-dir', default=str(FRONT_DIR), help='前端页面目录')
+    parser.add_argument('--json', help='把链接图和分析结果导出到指定JSON文件')
+    parser.add_argument('--refresh', action='store_true', help='忽略缓存，重新解析所有页面')
+    args = parser.parse_args()
+
+    front_dir = Path(args.front_dir)
+    if not front_dir.is_dir():
+        print_error(f"前端页面目录不存在: {front_dir}")
+        return 1
+
+    print_message(Colors.BOLD + Colors.CYAN, "🔗 导航链接图分析")
+    print_message(Colors.CYAN, "=" * 60)
+
+    cache_file = GRAPH_CACHE_FILE if front_dir.resolve() == FRONT_DIR.resolve() else None
+    graph = load_navigation_graph(front_dir, cache_file, refresh=args.refresh)
+    broken_count = print_graph_report(graph)
+
+    if args.json:
+        graph.save_json(Path(args.json))
+        print_success(f"链接图已导出: {args.json}")
+
+    print_message(Colors.CYAN, "=" * 60)
+    return 1 if broken_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
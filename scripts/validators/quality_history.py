@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+质量监控历史记录模块
+功能：把每次 QualityMonitor.run_monitoring() 的结果保存到项目内的 SQLite 数据库，
+提供按组件查询分数趋势、比较两次运行、查找分数下降的运行等接口，
+不需要重新解析旧的监控报告
+
+数据库结构：
+  runs              每次监控一行（时间、项目名、完成度、总体分数、成功率及完整结果JSON）
+  component_scores  每次监控每个组件一行（时间、组件、分数、文件数），
+                    时间、组件和分数均建有索引；组件包括 frontend/backend/database 以及
+                    overall（总体质量分数）、progress（生成完成度）、prediction（加权评分）
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+HISTORY_DIR_NAME = ".history"
+HISTORY_FILE_NAME = "quality_history.db"
+SCHEMA_VERSION = 1
+
+# 查询结果中组件的显示顺序
+COMPONENTS = ['overall', 'frontend', 'backend', 'database', 'progress', 'prediction']
+
+RunRecord = namedtuple('RunRecord', ['run_id', 'timestamp', 'project_name', 'completion_rate',
+                                     'overall_score', 'quality_level', 'probability', 'weighted_score'])
+ScorePoint = namedtuple('ScorePoint', ['run_id', 'timestamp', 'score'])
+ScoreChange = namedtuple('ScoreChange', ['component', 'before', 'after', 'delta'])
+Regression = namedtuple('Regression', ['run_id', 'timestamp', 'component', 'previous_run_id', 'before', 'after', 'delta'])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    project_name TEXT,
+    completion_rate REAL,
+    overall_score REAL,
+    quality_level TEXT,
+    probability REAL,
+    weighted_score REAL,
+    result_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs (timestamp);
+
+CREATE TABLE IF NOT EXISTS component_scores (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    timestamp TEXT NOT NULL,
+    component TEXT NOT NULL,
+    score REAL NOT NULL,
+    file_count INTEGER,
+    PRIMARY KEY (run_id, component)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_component_timestamp ON component_scores (component, timestamp);
+CREATE INDEX IF NOT EXISTS idx_scores_timestamp ON component_scores (timestamp);
+CREATE INDEX IF NOT EXISTS idx_scores_component_score ON component_scores (component, score);
+"""
+
+def default_history_path(project_root: Path) -> Path:
+    """项目内历史数据库的默认位置"""
+    return Path(project_root) / "output_docs" / HISTORY_DIR_NAME / HISTORY_FILE_NAME
+
+def component_scores(result: Dict) -> Dict[str, tuple]:
+    """从监控结果中提取各组件的 (分数, 文件数)"""
+    scores = {
+        'overall': (result['quality']['overall_score'], None),
+        'progress': (result['progress']['completion_rate'], None),
+        'prediction': (result['prediction']['weighted_score'], None),
+    }
+    for component, metrics in result['quality']['components'].items():
+        if metrics.get('exists'):
+            scores[component] = (metrics['quality_score'], metrics.get('file_count'))
+    return scores
+
+class QualityHistory:
+    """质量监控历史数据库"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(f"历史数据库版本 {version} 高于当前支持的版本 {SCHEMA_VERSION}")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, result: Dict) -> int:
+        """保存一次监控结果，返回运行编号"""
+        timestamp = result['timestamp']
+        quality = result['quality']
+        prediction = result['prediction']
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (timestamp, project_name, completion_rate, overall_score, quality_level,"
+                " probability, weighted_score, result_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (timestamp, result['project_name'], result['progress']['completion_rate'],
+                 quality['overall_score'], quality['quality_level'], prediction['probability'],
+                 prediction['weighted_score'], json.dumps(result, ensure_ascii=False, default=str)))
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                "INSERT INTO component_scores (run_id, timestamp, component, score, file_count) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, timestamp, component, score, file_count)
+                 for component, (score, file_count) in component_scores(result).items()])
+        return run_id
+
+    def run_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def runs(self, limit: Optional[int] = None) -> List[RunRecord]:
+        """最近的运行记录，按时间从旧到新排列"""
+        query = ("SELECT id, timestamp, project_name, completion_rate, overall_score, quality_level,"
+                 " probability, weighted_score FROM runs ORDER BY timestamp DESC, id DESC")
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+        return [RunRecord(*row) for row in reversed(self.connection.execute(query, params).fetchall())]
+
+    def latest_run_ids(self, count: int = 2) -> List[int]:
+        """最近 count 次运行的编号，按时间从旧到新排列"""
+        rows = self.connection.execute(
+            "SELECT id FROM runs ORDER BY timestamp DESC, id DESC LIMIT ?", (count,)).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def scores(self, run_id: int) -> Dict[str, float]:
+        """单次运行各组件的分数"""
+        rows = self.connection.execute(
+            "SELECT component, score FROM component_scores WHERE run_id = ?", (run_id,)).fetchall()
+        return dict(rows)
+
+    def trend(self, component: str = 'overall', limit: Optional[int] = None,
+              since: Optional[str] = None) -> List[ScorePoint]:
+        """组件分数的时间序列（按时间从旧到新），since 为 ISO 时间字符串"""
+        query = "SELECT run_id, timestamp, score FROM component_scores WHERE component = ?"
+        params = [component]
+        if since:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY timestamp DESC, run_id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [ScorePoint(*row) for row in reversed(self.connection.execute(query, params).fetchall())]
+
+    def diff(self, run_a: int, run_b: int) -> List[ScoreChange]:
+        """比较两次运行的组件分数（某次运行缺少的组件分数为 None）"""
+        before = self.scores(run_a)
+        after = self.scores(run_b)
+        changes = []
+        for component in COMPONENTS + sorted((set(before) | set(after)) - set(COMPONENTS)):
+            if component not in before and component not in after:
+                continue
+            old, new = before.get(component), after.get(component)
+            delta = new - old if old is not None and new is not None else None
+            changes.append(ScoreChange(component, old, new, delta))
+        return changes
+
+    def regressions(self, threshold: float = 0.0, component: Optional[str] = None,
+                    limit: Optional[int] = None) -> List[Regression]:
+        """
+        分数比同一组件上一次运行下降超过 threshold 的运行（按时间从旧到新）
+
+        使用窗口函数在数据库中一次完成相邻运行的比较
+        """
+        query = """
+            SELECT run_id, timestamp, component, previous_run_id, previous_score, score, score - previous_score
+            FROM (
+                SELECT run_id, timestamp, component, score,
+                       LAG(score) OVER (PARTITION BY component ORDER BY timestamp, run_id) AS previous_score,
+                       LAG(run_id) OVER (PARTITION BY component ORDER BY timestamp, run_id) AS previous_run_id
+                FROM component_scores
+                {where}
+            )
+            WHERE previous_score IS NOT NULL AND score < previous_score - ?
+            ORDER BY timestamp DESC, run_id DESC
+        """
+        params = []
+        where = ""
+        if component:
+            where = "WHERE component = ?"
+            params.append(component)
+        params.append(threshold)
+        query = query.format(where=where)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [Regression(*row) for row in reversed(self.connection.execute(query, params).fetchall())]
@@ -11,14 +11,36 @@
 3. 文档完整性验证
 4. 申请成功率预测
 5. 性能指标分析
+
+性能：
+- 前端、后端、数据库三个分析器并发运行
+- 单文件指标按内容哈希缓存在 output_docs/.cache/quality_monitor/，
+  再次运行时只重新分析有变化的文件（--no-cache 可关闭）
+
+历史记录：
+- 每次监控结果保存到 output_docs/.history/quality_history.db（--no-history 可关闭）
+- --history 列出最近的运行，--trend 显示组件分数趋势和分数下降的运行，--diff 比较两次运行
 """
 
+import os
 import sys
 import json
-import re
+import sqlite3
+import hashlib
+import argparse
+import tempfile
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+# 与生成脚本共享 output_sourcecode/ 的文件索引
+sys.path.append(str(Path(__file__).resolve().parent.parent / "generators"))
+from file_index import get_file_index
+from sql_lexer import analyze_sql
+from source_lexer import analyze_source, language_for
+from quality_history import QualityHistory, COMPONENTS, default_history_path
+from merge_cache import CACHE_DIR_NAME
 
 # 颜色输出类
 class Colors:
@@ -47,13 +69,157 @@ def print_header(message: str):
     print(f"{Colors.PURPLE}{message.center(80)}{Colors.NC}")
     print(f"{Colors.PURPLE}{'=' * 80}{Colors.NC}")
 
+METRICS_CACHE_NAMESPACE = "quality_monitor"
+METRICS_CACHE_VERSION = 3
+
+# 分析函数的参数为 (文件内容, 小写扩展名)，后端按扩展名选择语言
+def analyze_html_file(content: str, suffix: str) -> Dict[str, int]:
+    """单个前端页面的质量指标"""
+    lowered = content.lower()
+    return {
+        'size': len(content),
+        'has_css': int('<style>' in content or 'class=' in content),
+        'has_js': int('<script>' in content or 'function' in content),
+        'has_responsive': int('responsive' in lowered or '@media' in content),
+        'has_navigation': int('<nav>' in content or 'navigation' in lowered),
+        'html5_compliant': int('<!DOCTYPE html>' in content)
+    }
+
+def analyze_source_file(content: str, suffix: str) -> Dict[str, int]:
+    """单个后端源文件的质量指标（按语言词法分析，注释和字符串中的关键字不计数）"""
+    metrics = analyze_source(content, language_for(suffix))
+    return {
+        'size': len(content),
+        'function_count': metrics.functions,
+        'class_count': metrics.classes,
+        'comment_chars': metrics.comment_chars,
+        'has_functions': int(metrics.functions > 0),
+        'has_classes': int(metrics.classes > 0),
+        'has_comments': int(metrics.comment_chars > 0),
+        'has_error_handling': int(metrics.error_handlers > 0),
+        # 圈复杂度：分支数 + 函数数
+        'complexity': metrics.complexity
+    }
+
+def analyze_sql_file(content: str, suffix: str) -> Dict[str, int]:
+    """单个SQL文件的质量指标（与数据库拼接脚本共用SQL词法分析，注释和字符串中的关键字不计数）"""
+    analysis = analyze_sql(content)
+    statements = analysis.statements
+    return {
+        'size': len(content),
+        'create_table_count': statements.get('CREATE TABLE', 0),
+        'index_count': statements.get('CREATE INDEX', 0),
+        'constraint_count': analysis.constraints,
+        'procedure_count': statements.get('CREATE PROCEDURE', 0) + statements.get('CREATE FUNCTION', 0),
+        'view_count': statements.get('CREATE VIEW', 0)
+    }
+
+class MetricsCache:
+    """
+    单文件质量指标的持久化缓存
+
+    指标以内容哈希 (SHA-256) 加扩展名为键保存，另按路径记录 mtime、大小和哈希：
+    mtime 与大小均未变化时只需 stat，不读取文件；内容和扩展名相同的文件（包括改名、touch）共用同一份指标。
+    分析器逻辑变化时提高 METRICS_CACHE_VERSION，使旧指标全部失效
+    """
+
+    def __init__(self, cache_file: Path, enabled: bool = True):
+        self.cache_file = Path(cache_file)
+        self.enabled = enabled
+        self.files: Dict[str, dict] = {}
+        self.metrics: Dict[str, Optional[dict]] = {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+        if enabled:
+            self._load()
+
+    def _load(self):
+        """读取缓存文件，版本不符或损坏时视为空缓存"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(data, dict) and data.get('version') == METRICS_CACHE_VERSION:
+            self.files = data.get('files', {})
+            self.metrics = data.get('metrics', {})
+
+    def get(self, file_path: Path, key: str, analyzer: Callable[[str, str], dict]) -> Optional[dict]:
+        """
+        获取文件的质量指标，内容变化时调用 analyzer 重新分析
+
+        文件无法读取或不是UTF-8文本时返回 None（同样会被缓存）
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        self.seen.add(key)
+        suffix = file_path.suffix.lower()
+
+        entry = self.files.get(key)
+        if (self.enabled and entry is not None and entry.get('mtime_ns') == stat.st_mtime_ns
+                and entry.get('size') == stat.st_size and entry.get('content_key') in self.metrics):
+            self.hits += 1
+            return self.metrics[entry['content_key']]
+
+        try:
+            data = file_path.read_bytes()
+        except OSError:
+            return None
+        content_key = hashlib.sha256(data).hexdigest() + suffix
+        self.files[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'content_key': content_key}
+
+        if self.enabled and content_key in self.metrics:
+            self.hits += 1
+            return self.metrics[content_key]
+
+        self.misses += 1
+        try:
+            # 与文本模式读取一致：统一换行符后再分析
+            content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        except UnicodeDecodeError:
+            result = None
+        else:
+            result = analyzer(content, suffix)
+        self.metrics[content_key] = result
+        return result
+
+    def save(self):
+        """原子写入缓存文件，并清理本次未出现的文件及无引用的指标"""
+        if not self.enabled:
+            return
+
+        self.files = {key: entry for key, entry in self.files.items() if key in self.seen}
+        referenced = {entry['content_key'] for entry in self.files.values()}
+        self.metrics = {content_key: result for content_key, result in self.metrics.items()
+                        if content_key in referenced}
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(self.cache_file.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': METRICS_CACHE_VERSION, 'files': self.files, 'metrics': self.metrics},
+                          f, ensure_ascii=False)
+            os.replace(temp_path, self.cache_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
 class QualityMonitor:
     """质量监控器"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, record_history: bool = True):
         self.project_root = Path.cwd()
         self.config_path = self.project_root / "ai-copyright-config.json"
         self.monitoring_results = {}
+        self.use_cache = use_cache
+        self.record_history = record_history
+        self.history_path = default_history_path(self.project_root)
+        self.metrics_caches: Dict[str, MetricsCache] = {}
         
     def load_config(self) -> Optional[dict]:
         """加载项目配置"""
@@ -66,6 +232,32 @@ class QualityMonitor:
         except:
             return None
     
+    def get_source_index(self):
+        """output_sourcecode/ 的文件索引（每次运行只遍历一次）"""
+        return get_file_index(self.project_root / "output_sourcecode")
+    
+    def get_metrics_cache(self, component: str) -> MetricsCache:
+        """各分析器使用独立的缓存文件，并发运行时互不影响"""
+        cache = self.metrics_caches.get(component)
+        if cache is None:
+            cache_file = (self.project_root / "output_docs" / CACHE_DIR_NAME /
+                          METRICS_CACHE_NAMESPACE / f"{component}.json")
+            cache = MetricsCache(cache_file, enabled=self.use_cache)
+            self.metrics_caches[component] = cache
+        return cache
+    
+    def collect_file_metrics(self, component: str, files: List[Path],
+                             analyzer: Callable[[str, str], dict]) -> List[dict]:
+        """通过缓存获取每个文件的指标，跳过无法读取的文件"""
+        cache = self.get_metrics_cache(component)
+        results = []
+        for file_path in files:
+            key = os.path.relpath(file_path, self.project_root)
+            file_metrics = cache.get(file_path, key, analyzer)
+            if file_metrics is not None:
+                results.append(file_metrics)
+        return results
+    
     def check_generation_progress(self) -> Dict[str, any]:
         """检查生成进度"""
         progress = {
@@ -96,8 +288,18 @@ class QualityMonitor:
             'merged_database': 'output_docs/数据库源代码.txt'
         }
         
+        source_index = self.get_source_index()
+        
         for key, pattern in file_mappings.items():
-            if '*' in pattern:
+            if pattern.startswith('output_sourcecode/'):
+                # 源代码目录使用共享文件索引，不再单独 glob
+                directory, _, name_pattern = pattern.rpartition('/')
+                suffix = Path(name_pattern).suffix
+                matches = source_index.files(self.project_root / directory,
+                                             suffixes={suffix} if suffix else None,
+                                             recursive=not suffix)
+                progress[key] = len(matches) > 0
+            elif '*' in pattern:
                 # 使用glob匹配
                 matches = list(self.project_root.glob(pattern))
                 progress[key] = len(matches) > 0
@@ -120,12 +322,24 @@ class QualityMonitor:
     
     def analyze_code_quality(self) -> Dict[str, any]:
         """分析代码质量"""
-        quality_metrics = {
-            'frontend': self.analyze_frontend_quality(),
-            'backend': self.analyze_backend_quality(),
-            'database': self.analyze_database_quality()
+        analyzers = {
+            'frontend': self.analyze_frontend_quality,
+            'backend': self.analyze_backend_quality,
+            'database': self.analyze_database_quality
         }
         
+        # 先建立共享文件索引，避免各线程重复遍历目录
+        self.get_source_index()
+        with ThreadPoolExecutor(max_workers=len(analyzers)) as executor:
+            futures = {component: executor.submit(analyzer) for component, analyzer in analyzers.items()}
+            quality_metrics = {component: future.result() for component, future in futures.items()}
+        
+        for cache in self.metrics_caches.values():
+            try:
+                cache.save()
+            except OSError as e:
+                print_warning(f"质量指标缓存写入失败: {e}")
+        
         # 计算总体质量分数
         quality_scores = [metrics['quality_score'] for metrics in quality_metrics.values() if metrics['quality_score'] > 0]
         overall_score = sum(quality_scores) / len(quality_scores) if quality_scores else 0
@@ -143,7 +357,8 @@ class QualityMonitor:
         if not frontend_dir.exists():
             return {'exists': False, 'quality_score': 0}
         
-        html_files = list(frontend_dir.glob("*.html"))
+        html_files = [Path(entry.path) for entry in
+                      self.get_source_index().files(frontend_dir, suffixes={'.html'}, recursive=False)]
         if not html_files:
             return {'exists': False, 'quality_score': 0}
         
@@ -159,32 +374,10 @@ class QualityMonitor:
             'quality_score': 0
         }
         
-        for html_file in html_files:
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                file_size = len(content)
-                metrics['total_size'] += file_size
-                
-                # 检查各种质量指标
-                if '<style>' in content or 'class=' in content:
-                    metrics['has_css'] += 1
-                
-                if '<script>' in content or 'function' in content:
-                    metrics['has_js'] += 1
-                
-                if 'responsive' in content.lower() or '@media' in content:
-                    metrics['has_responsive'] += 1
-                
-                if '<nav>' in content or 'navigation' in content.lower():
-                    metrics['has_navigation'] += 1
-                
-                if '<!DOCTYPE html>' in content:
-                    metrics['html5_compliant'] += 1
-                    
-            except:
-                continue
+        for file_metrics in self.collect_file_metrics('frontend', html_files, analyze_html_file):
+            metrics['total_size'] += file_metrics['size']
+            for key in ('has_css', 'has_js', 'has_responsive', 'has_navigation', 'html5_compliant'):
+                metrics[key] += file_metrics[key]
         
         if metrics['file_count'] > 0:
             metrics['avg_size'] = metrics['total_size'] / metrics['file_count']
@@ -212,9 +405,8 @@ class QualityMonitor:
         
         # 收集源代码文件
         source_extensions = ['.java', '.py', '.js', '.php', '.cs', '.go', '.rb']
-        source_files = []
-        for ext in source_extensions:
-            source_files.extend(backend_dir.rglob(f"*{ext}"))
+        source_files = [Path(entry.path) for entry in
+                        self.get_source_index().files(backend_dir, suffixes=source_extensions)]
         
         if not source_files:
             return {'exists': False, 'quality_score': 0}
@@ -227,41 +419,26 @@ class QualityMonitor:
             'has_classes': 0,
             'has_comments': 0,
             'has_error_handling': 0,
+            'function_count': 0,
+            'class_count': 0,
+            'comment_ratio': 0,
             'complexity_score': 0,
             'quality_score': 0
         }
         
-        for source_file in source_files:
-            try:
-                with open(source_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                file_size = len(content)
-                metrics['total_size'] += file_size
-                
-                # 检查代码特征
-                if re.search(r'function\s+\w+|def\s+\w+|public\s+\w+\s+\w+\s*\(', content):
-                    metrics['has_functions'] += 1
-                
-                if re.search(r'class\s+\w+|public\s+class\s+\w+', content):
-                    metrics['has_classes'] += 1
-                
-                if '//' in content or '/*' in content or '#' in content or '"""' in content:
-                    metrics['has_comments'] += 1
-                
-                if re.search(r'try\s*{|except:|catch\s*\(|error|exception', content, re.IGNORECASE):
-                    metrics['has_error_handling'] += 1
-                
-                # 计算复杂度分数（基于关键词密度）
-                complexity_keywords = ['if', 'for', 'while', 'switch', 'case', 'else', 'elif']
-                complexity_count = sum(content.lower().count(keyword) for keyword in complexity_keywords)
-                metrics['complexity_score'] += complexity_count
-                
-            except:
-                continue
+        comment_chars = 0
+        for file_metrics in self.collect_file_metrics('backend', source_files, analyze_source_file):
+            metrics['total_size'] += file_metrics['size']
+            for key in ('has_functions', 'has_classes', 'has_comments', 'has_error_handling',
+                        'function_count', 'class_count'):
+                metrics[key] += file_metrics[key]
+            metrics['complexity_score'] += file_metrics['complexity']
+            comment_chars += file_metrics['comment_chars']
         
         if metrics['file_count'] > 0:
             metrics['avg_size'] = metrics['total_size'] / metrics['file_count']
+            if metrics['total_size']:
+                metrics['comment_ratio'] = comment_chars / metrics['total_size']
             
             # 计算质量分数
             score = 0
@@ -284,7 +461,8 @@ class QualityMonitor:
         if not db_dir.exists():
             return {'exists': False, 'quality_score': 0}
         
-        sql_files = list(db_dir.glob("*.sql"))
+        sql_files = [Path(entry.path) for entry in
+                     self.get_source_index().files(db_dir, suffixes={'.sql'}, recursive=False)]
         if not sql_files:
             return {'exists': False, 'quality_score': 0}
         
@@ -299,20 +477,10 @@ class QualityMonitor:
             'quality_score': 0
         }
         
-        for sql_file in sql_files:
-            try:
-                with open(sql_file, 'r', encoding='utf-8') as f:
-                    content = f.read().upper()
-                
-                metrics['total_size'] += len(content)
-                metrics['create_table_count'] += content.count('CREATE TABLE')
-                metrics['index_count'] += content.count('CREATE INDEX')
-                metrics['constraint_count'] += content.count('CONSTRAINT') + content.count('PRIMARY KEY') + content.count('FOREIGN KEY')
-                metrics['procedure_count'] += content.count('CREATE PROCEDURE') + content.count('CREATE FUNCTION')
-                metrics['view_count'] += content.count('CREATE VIEW')
-                
-            except:
-                continue
+        for file_metrics in self.collect_file_metrics('database', sql_files, analyze_sql_file):
+            metrics['total_size'] += file_metrics['size']
+            for key in ('create_table_count', 'index_count', 'constraint_count', 'procedure_count', 'view_count'):
+                metrics[key] += file_metrics[key]
         
         # 计算质量分数
         score = 0
@@ -432,6 +600,10 @@ class QualityMonitor:
         # 分析代码质量
         print_info("分析代码质量...")
         quality_data = self.analyze_code_quality()
+        if self.use_cache:
+            hits = sum(cache.hits for cache in self.metrics_caches.values())
+            misses = sum(cache.misses for cache in self.metrics_caches.values())
+            print_info(f"质量指标缓存: 复用 {hits} 个文件，重新分析 {misses} 个文件")
         
         # 预测申请成功率
         print_info("评估申请成功率...")
@@ -440,7 +612,7 @@ class QualityMonitor:
         # 生成改进建议
         recommendations = self.generate_recommendations(progress_data, quality_data, prediction)
         
-        return {
+        result = {
             'project_name': project_name,
             'timestamp': datetime.now().isoformat(),
             'progress': progress_data,
@@ -448,6 +620,22 @@ class QualityMonitor:
             'prediction': prediction,
             'recommendations': recommendations
         }
+        
+        if self.record_history:
+            self.save_history(result)
+        
+        return result
+    
+    def save_history(self, result: Dict) -> Optional[int]:
+        """把监控结果写入历史数据库，返回运行编号（写入失败时只给出警告）"""
+        try:
+            with QualityHistory(self.history_path) as history:
+                run_id = history.record(result)
+        except (sqlite3.Error, OSError) as e:
+            print_warning(f"质量历史记录写入失败: {e}")
+            return None
+        result['history_run_id'] = run_id
+        return run_id
 
 def generate_monitoring_report(monitoring_result: Dict) -> str:
     """生成监控报告"""
@@ -523,6 +711,9 @@ def generate_monitoring_report(monitoring_result: Dict) -> str:
         report += f"    - 函数定义: {backend['has_functions']}/{backend['file_count']}\n"
         report += f"    - 类定义: {backend['has_classes']}/{backend['file_count']}\n"
         report += f"    - 错误处理: {backend['has_error_handling']}/{backend['file_count']}\n"
+        report += f"    - 函数/类数量: {backend['function_count']}/{backend['class_count']}\n"
+        report += f"    - 圈复杂度: {backend['complexity_score'] / backend['file_count']:.1f}/文件\n"
+        report += f"    - 注释占比: {backend['comment_ratio'] * 100:.1f}%\n"
     else:
         report += "  ✗ 后端代码: 未生成\n"
     
@@ -592,24 +783,148 @@ def generate_monitoring_report(monitoring_result: Dict) -> str:
     
     return report
 
+SPARK_CHARS = '▁▂▃▄▅▆▇█'
+TREND_BAR_WIDTH = 40
+SPARKLINE_WIDTH = 60
+
+def format_score(score: Optional[float]) -> str:
+    return '-' if score is None else f"{score:.1f}"
+
+def sparkline(values: List[float], width: int = SPARKLINE_WIDTH) -> str:
+    """按 0-100 分绘制迷你折线；点数超过 width 时按区间取平均"""
+    if len(values) > width:
+        buckets = [values[len(values) * i // width:len(values) * (i + 1) // width] for i in range(width)]
+        values = [sum(bucket) / len(bucket) for bucket in buckets]
+    top = len(SPARK_CHARS) - 1
+    return ''.join(SPARK_CHARS[max(0, min(top, round(value / 100 * top)))] for value in values)
+
+def print_history(history: QualityHistory, limit: int):
+    """列出最近的运行及各组件分数"""
+    runs = history.runs(limit)
+    if not runs:
+        print_info(f"暂无质量历史记录: {history.db_path}")
+        return
+
+    print_header(f"质量监控历史（最近 {len(runs)} 次，共 {history.run_count()} 次）")
+    columns = [component for component in COMPONENTS if component not in ('overall', 'progress')]
+    print(f"{'编号':>6}  {'时间':<19}  {'完成度':>6}  {'总体':>6}  " +
+          '  '.join(f"{component:>10}" for component in columns))
+    for run in runs:
+        scores = history.scores(run.run_id)
+        print(f"{run.run_id:>6}  {run.timestamp[:19]:<19}  {run.completion_rate:>6.1f}  {run.overall_score:>6.1f}  " +
+              '  '.join(f"{format_score(scores.get(component)):>10}" for component in columns))
+
+def print_trend(history: QualityHistory, component: str, limit: int, threshold: float):
+    """显示组件分数趋势图，并标出分数下降超过 threshold 的运行"""
+    points = history.trend(component)
+    if not points:
+        print_info(f"暂无组件 {component} 的历史分数")
+        return
+
+    values = [point.score for point in points]
+    print_header(f"{component} 分数趋势（共 {len(points)} 次运行）")
+    print_info(f"最低 {min(values):.1f}  最高 {max(values):.1f}  最新 {values[-1]:.1f}")
+    print(f"  {sparkline(values)}")
+    print()
+
+    shown = points[-limit:]
+    previous = points[-len(shown) - 1].score if len(shown) < len(points) else None
+    for point in shown:
+        bar = '█' * round(point.score / 100 * TREND_BAR_WIDTH)
+        delta = '' if previous is None else f"{point.score - previous:+.1f}"
+        line = f"  {point.run_id:>6}  {point.timestamp[:19]}  {bar:<{TREND_BAR_WIDTH}} {point.score:5.1f} {delta}"
+        if previous is not None and point.score < previous - threshold:
+            print(f"{Colors.RED}{line}{Colors.NC}")
+        else:
+            print(line)
+        previous = point.score
+
+    regressions = history.regressions(threshold, component)
+    print()
+    if regressions:
+        print_warning(f"分数下降超过 {threshold:g} 分的运行 {len(regressions)} 次:")
+        for regression in regressions[-10:]:
+            print_warning(f"  #{regression.run_id} {regression.timestamp[:19]}: "
+                          f"{regression.before:.1f} → {regression.after:.1f} ({regression.delta:+.1f})，"
+                          f"上一次运行 #{regression.previous_run_id}")
+    else:
+        print_success(f"没有分数下降超过 {threshold:g} 分的运行")
+
+def print_diff(history: QualityHistory, run_ids: List[int]):
+    """比较两次运行的组件分数，默认比较最近两次"""
+    if len(run_ids) == 1:
+        run_ids = history.latest_run_ids(1) + run_ids
+    elif not run_ids:
+        run_ids = history.latest_run_ids(2)
+    if len(run_ids) != 2:
+        print_info("至少需要两次运行记录才能比较")
+        return
+
+    run_a, run_b = run_ids
+    print_header(f"运行 #{run_a} 与 #{run_b} 的分数比较")
+    for change in history.diff(run_a, run_b):
+        line = f"  {change.component:<12} {format_score(change.before):>6} → {format_score(change.after):>6}"
+        if change.delta is None:
+            print(line)
+        elif change.delta < 0:
+            print_error(f"{line}  ({change.delta:+.1f})")
+        elif change.delta > 0:
+            print_success(f"{line}  ({change.delta:+.1f})")
+        else:
+            print(f"{line}  (不变)")
+
+def query_history(args) -> int:
+    """--history / --trend / --diff：只查询历史数据库，不执行监控"""
+    history_path = default_history_path(Path.cwd())
+    if not history_path.exists():
+        print_info(f"暂无质量历史记录: {history_path}")
+        return 0
+
+    try:
+        with QualityHistory(history_path) as history:
+            if args.history is not None:
+                print_history(history, args.history)
+            if args.trend is not None:
+                print_trend(history, args.trend, args.limit, args.threshold)
+            if args.diff is not None:
+                print_diff(history, args.diff)
+    except sqlite3.Error as e:
+        print_error(f"读取质量历史记录失败: {e}")
+        return 1
+    return 0
+
 def main():
     """主函数"""
-    if len(sys.argv) > 1 and sys.argv[1] in ['-h', '--help']:
-        print("软著申请材料质量监控工具")
-        print("\n用法:")
-        print("  python3 quality_monitor.py")
-        print("\n功能:")
-        print("  - 监控生成进度和质量")
-        print("  - 分析代码复杂度和专业性")
-        print("  - 预测申请成功率")
-        print("  - 提供改进建议和行动计划")
-        print("\n输出:")
-        print("  - 终端显示监控结果")
-        print("  - 生成详细的质量监控报告")
-        return
+    parser = argparse.ArgumentParser(
+        description="软著申请材料质量监控工具",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="功能:\n"
+               "  - 监控生成进度和质量\n"
+               "  - 分析代码复杂度和专业性\n"
+               "  - 预测申请成功率\n"
+               "  - 提供改进建议和行动计划\n"
+               "  - 保存历史记录，查询分数趋势\n"
+               "\n输出:\n"
+               "  - 终端显示监控结果\n"
+               "  - 生成详细的质量监控报告")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不使用 output_docs/.cache 中的单文件指标缓存，全部重新分析')
+    parser.add_argument('--no-history', action='store_true', help='不把本次结果写入历史数据库')
+    parser.add_argument('--history', type=int, nargs='?', const=20, metavar='N',
+                        help='列出最近 N 次运行的分数（默认20），不执行监控')
+    parser.add_argument('--trend', nargs='?', const='overall', metavar='COMPONENT',
+                        help=f"显示组件分数趋势（{'/'.join(COMPONENTS)}，默认 overall），不执行监控")
+    parser.add_argument('--diff', type=int, nargs='*', metavar='RUN',
+                        help='比较两次运行的分数（默认最近两次），不执行监控')
+    parser.add_argument('--limit', type=int, default=30, help='--trend 逐行显示的运行数（默认30）')
+    parser.add_argument('--threshold', type=float, default=5.0, help='--trend 标记分数下降的阈值（默认5分）')
+    args = parser.parse_args()
+    
+    if args.history is not None or args.trend is not None or args.diff is not None:
+        sys.exit(query_history(args))
     
     # 执行监控
-    monitor = QualityMonitor()
+    monitor = QualityMonitor(use_cache=not args.no_cache, record_history=not args.no_history)
     result = monitor.run_monitoring()
     
     # 显示关键结果
@@ -651,6 +966,9 @@ def main():
     except Exception as e:
         print_error(f"保存报告失败: {e}")
     
+    if 'history_run_id' in result:
+        print_info(f"历史记录已保存: 运行 #{result['history_run_id']} ({monitor.history_path})")
+    
     # 返回状态码
     if prediction['probability'] >= 0.7:
         sys.exit(0)  # 成功
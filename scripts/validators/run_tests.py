@@ -288,6 +288,45 @@ class TestRunner:
             except Exception:
                 return False
 
+    def test_html_scan_linear_time(self):
+        """测试页面结构扫描在大量非标签 '<' 的输入上保持线性：统计 str.find 扫过的字符数"""
+        sys.path.insert(0, str(self.project_dir / "scripts" / "validators"))
+        try:
+            from validate_frontend_pages import scan_html_structure
+        except Exception:
+            return False
+        
+        class CountingStr(str):
+            """记录 find 扫过的字符总数"""
+            scanned = 0
+            
+            def find(self, sub, start=0, end=None):
+                result = str.find(self, sub, start, end)
+                stop = len(self) if result == -1 else result + len(sub)
+                CountingStr.scanned += max(stop - start, 0)
+                return result
+        
+        content = CountingStr('<html><body>' + 'a <1 ' * 200000 + '>')
+        state = scan_html_structure(content)
+        # 线性实现中每个字符只被 find 扫过常数次；逐个 '<' 重新查找 '>' 的实现约为 n²/10 次
+        return state['html'] and state['body_open'] and CountingStr.scanned <= 4 * len(content)
+
+    def test_token_calibration(self):
+        """测试token估算系数由参考样本拟合得到，且估算值不低于样本的实际token数、误差不超过声明的上限"""
+        sys.path.insert(0, str(self.project_dir / "scripts" / "generators"))
+        try:
+            from token_estimator import HeuristicCounter, fit_calibration, load_calibration, load_reference_samples
+        except Exception:
+            return False
+        
+        samples, max_error = load_reference_samples()
+        calibration = load_calibration()
+        if fit_calibration(samples) != calibration:
+            return False
+        
+        counter = HeuristicCounter(calibration)
+        return all(tokens <= counter.count(text) <= tokens * (1 + max_error) for text, tokens in samples)
+
     def run_all_tests(self):
         """运行所有测试"""
         self.print_colored(Colors.PURPLE, "🚀 开始AI软著申请材料生成系统自动化测试")
@@ -302,7 +341,9 @@ class TestRunner:
             ("检查脚本功能", self.test_check_script_functionality),
             ("初始化脚本导入", self.test_init_script_import),
             ("文档完整性", self.test_documentation_completeness),
-            ("模板创建功能", self.test_template_creation)
+            ("模板创建功能", self.test_template_creation),
+            ("页面结构扫描线性时间", self.test_html_scan_linear_time),
+            ("token估算校准", self.test_token_calibration)
         ]
         
         passed = 0
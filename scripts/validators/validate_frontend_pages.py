@@ -15,6 +15,8 @@ import json
 import re
 from pathlib import Path
 
+from navigation_graph import load_navigation_graph
+
 class Colors:
     """终端颜色定义"""
     RED = '\033[0;31m'
@@ -76,6 +78,146 @@ def extract_pages_from_page_list(page_list_file):
         print_error(f"读取页面清单文件失败: {e}")
         return []
 
+# 省略标记：(报告中显示的模式, 同一行内依次出现的片段)
+OMISSION_MARKERS = [
+    ('此处省略', ('此处省略',)),
+    ('代码较长.*省略', ('代码较长', '省略')),
+    ('其余.*类似', ('其余', '类似')),
+    (r'\[注：.*省略.*\]', ('[注：', '省略', ']')),
+    ('<!-- 省略 -->', ('<!-- 省略 -->',)),
+    ('省略其余', ('省略其余',)),
+]
+# CSS省略标记（拼接后的文档用它代替样式）
+CSS_OMISSION_MARKER = ('<!-- CSS', '已省略')
+
+# 标记扫描的锚点：各标记的第一个片段（同一锚点可能属于多个标记）
+MARKER_ANCHORS = {}
+for _label, _parts in OMISSION_MARKERS + [(None, CSS_OMISSION_MARKER)]:
+    MARKER_ANCHORS.setdefault(_parts[0], []).append((_label, _parts))
+# 零宽匹配，锚点之间互相重叠（如“省略其余”中的“其余”）时也都能找到
+MARKER_ANCHOR_PATTERN = re.compile('(?=' + '|'.join(re.escape(anchor) for anchor in MARKER_ANCHORS) + ')')
+
+TAG_NAME = re.compile(r'(/?)([a-zA-Z][a-zA-Z0-9:-]*)')
+DOCTYPE_HTML = re.compile(r'!doctype\s+html\s*', re.IGNORECASE)
+RAW_TEXT_END = {
+    'style': re.compile(r'</style\s*>', re.IGNORECASE),
+    'script': re.compile(r'</script\s*>', re.IGNORECASE),
+}
+
+def scan_html_structure(content):
+    """
+    单次线性扫描页面结构，记录 DOCTYPE、html/head/body 的开闭状态和CSS样式
+
+    只用 str.find 和锚定在当前位置的匹配向前推进，每个字符最多被检查常数次，
+    截断的页面（缺少结束标签或 >）不会导致回溯
+    """
+    state = {
+        'doctype': False, 'html': False,
+        'head_open': False, 'head_closed': False,
+        'body_open': False, 'body_closed': False,
+        'style': False, 'stylesheet_link': False,
+    }
+    length = len(content)
+    pos = 0
+    # 最近找到的 '>' 位置：不是标签的 '<' 之后仍可复用，避免每个 '<' 都重新向后查找
+    gt = -1
+    while True:
+        start = content.find('<', pos)
+        if start == -1:
+            break
+        
+        # 注释：整体跳过（省略标记由 find_omission_markers 检查）
+        if content.startswith('<!--', start):
+            end = content.find('-->', start + 4)
+            if end == -1:
+                break
+            pos = end + 3
+            continue
+        
+        if gt <= start:
+            gt = content.find('>', start + 1)
+            if gt == -1:
+                break  # 页面被截断，最后一个标签不完整
+        end = gt
+        
+        if content.startswith('<!', start):
+            if DOCTYPE_HTML.fullmatch(content, start + 1, end):
+                state['doctype'] = True
+            pos = end + 1
+            continue
+        
+        match = TAG_NAME.match(content, start + 1, end)
+        if not match:
+            pos = start + 1
+            continue
+        closing, name = match.group(1), match.group(2).lower()
+        pos = end + 1
+        
+        if closing:
+            if name == 'head' and state['head_open']:
+                state['head_closed'] = True
+            elif name == 'body' and state['body_open']:
+                state['body_closed'] = True
+        elif name == 'html':
+            state['html'] = True
+        elif name == 'head':
+            state['head_open'] = True
+        elif name == 'body':
+            state['body_open'] = True
+        elif name == 'link':
+            if 'stylesheet' in content[start:end].lower():
+                state['stylesheet_link'] = True
+        elif name in RAW_TEXT_END:
+            # style/script 的内容不是标签，直接跳到结束标签
+            raw_end = RAW_TEXT_END[name].search(content, pos)
+            if raw_end is None:
+                break
+            if name == 'style':
+                state['style'] = True
+            pos = raw_end.end()
+            
+    return state
+
+def find_omission_markers(content):
+    """
+    单次扫描查找省略标记，返回 (命中的省略标记列表, 是否有CSS省略标记)
+
+    每个标记的后续片段只在锚点所在行内查找；同一行中较早的锚点没有命中时，
+    后面的锚点也不会命中，记录已检查到的行尾位置避免重复扫描，保证线性时间
+    """
+    found = set()
+    css_omitted = False
+    checked_until = {}
+    
+    for match in MARKER_ANCHOR_PATTERN.finditer(content):
+        start = match.start()
+        for anchor, markers in MARKER_ANCHORS.items():
+            if not content.startswith(anchor, start):
+                continue
+            for label, parts in markers:
+                if label in found or (label is None and css_omitted):
+                    continue
+                if start < checked_until.get(parts, -1):
+                    continue
+                line_end = content.find('\n', start)
+                line_end = len(content) if line_end == -1 else line_end
+                pos = start + len(anchor)
+                for part in parts[1:]:
+                    index = content.find(part, pos, line_end)
+                    if index == -1:
+                        break
+                    pos = index + len(part)
+                else:
+                    if label is None:
+                        css_omitted = True
+                    else:
+                        found.add(label)
+                    continue
+                checked_until[parts] = line_end
+            
+    markers = [label for label, _ in OMISSION_MARKERS if label in found]
+    return markers, css_omitted
+
 def check_html_completeness(html_file):
     """检查HTML文件的完整性"""
     issues = []
@@ -84,25 +226,24 @@ def check_html_completeness(html_file):
         with open(html_file, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        structure = scan_html_structure(content)
+        omission_markers, css_omitted = find_omission_markers(content)
+        
         # 检查基本HTML结构
-        if not re.search(r'<!DOCTYPE\s+html>', content, re.IGNORECASE):
+        if not structure['doctype']:
             issues.append("缺少 DOCTYPE 声明")
         
-        if not re.search(r'<html[^>]*>', content, re.IGNORECASE):
+        if not structure['html']:
             issues.append("缺少 <html> 标签")
         
-        if not re.search(r'<head[^>]*>.*</head>', content, re.IGNORECASE | re.DOTALL):
+        if not structure['head_closed']:
             issues.append("缺少完整的 <head> 部分")
         
-        if not re.search(r'<body[^>]*>.*</body>', content, re.IGNORECASE | re.DOTALL):
+        if not structure['body_closed']:
             issues.append("缺少完整的 <body> 部分")
         
         # 检查CSS样式（原始HTML文件应该包含CSS，拼接后的文档会移除CSS）
-        has_css = (
-            re.search(r'<style[^>]*>.*</style>', content, re.IGNORECASE | re.DOTALL) or
-            re.search(r'<link[^>]*stylesheet[^>]*>', content, re.IGNORECASE) or
-            re.search(r'<!-- CSS.*已省略', content, re.IGNORECASE)  # 检查CSS省略标记
-        )
+        has_css = structure['style'] or structure['stylesheet_link'] or css_omitted
         if not has_css:
             issues.append("缺少CSS样式或CSS省略标记")
         
@@ -112,18 +253,8 @@ def check_html_completeness(html_file):
             issues.append(f"文件过小 ({file_size} bytes)，可能不完整")
         
         # 检查是否包含省略标记
-        omission_patterns = [
-            r'此处省略',
-            r'代码较长.*省略',
-            r'其余.*类似',
-            r'\[注：.*省略.*\]',
-            r'<!-- 省略 -->',
-            r'省略其余',
-        ]
-        
-        for pattern in omission_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                issues.append(f"发现省略标记: {pattern}")
+        for pattern in omission_markers:
+            issues.append(f"发现省略标记: {pattern}")
         
         return issues
         
@@ -135,8 +266,8 @@ def validate_frontend_pages():
     print_colored(Colors.PURPLE, "🔍 前端页面完整性验证")
     print_colored(Colors.BLUE, "=" * 60)
     
-    # 获取项目路径
-    base_dir = Path(__file__).parent
+    # 获取项目路径（脚本位于 scripts/validators/ 下）
+    base_dir = Path(__file__).resolve().parent.parent.parent
     page_list_file = base_dir / "process_docs" / "页面清单.md"
     front_dir = base_dir / "output_sourcecode" / "front"
     output_file = base_dir / "output_docs" / "前端源代码.txt"
@@ -150,10 +281,13 @@ def validate_frontend_pages():
     print_colored(Colors.CYAN, "📋 步骤1: 分析页面清单")
     expected_pages = extract_pages_from_page_list(page_list_file)
     
+    # 一次解析所有页面构建链接图（页面未变化时复用 output_docs/.cache 中的缓存）
+    graph = load_navigation_graph(front_dir) if front_dir.exists() else None
+    
     if not expected_pages:
         print_warning("无法从页面清单中提取页面信息，尝试扫描前端目录...")
-        if front_dir.exists():
-            expected_pages = [f.name for f in front_dir.glob("*.html")]
+        if graph is not None:
+            expected_pages = list(graph.pages)
         else:
             print_error("前端目录不存在且无法提取页面清单")
             return
@@ -168,13 +302,13 @@ def validate_frontend_pages():
     missing_pages = []
     existing_pages = []
     
-    if not front_dir.exists():
+    if graph is None:
         print_error(f"前端目录不存在: {front_dir}")
         return
     
+    generated_pages = set(graph.pages)
     for page in expected_pages:
-        page_file = front_dir / page
-        if page_file.exists():
+        if page in generated_pages:
             existing_pages.append(page)
             print_success(f"文件存在: {page}")
         else:
@@ -201,8 +335,35 @@ def validate_frontend_pages():
     
     print()
     
-    # 步骤4: 检查汇总文档
-    print_colored(Colors.CYAN, "📄 步骤4: 检查汇总文档")
+    # 步骤4: 检查页面链接
+    print_colored(Colors.CYAN, "🔗 步骤4: 检查页面链接")
+    print_info(f"站内链接: {graph.edge_count()} 条，入口页面: {', '.join(graph.entries) or '无'}")
+    
+    broken_links = graph.broken_links()
+    for page, targets in broken_links.items():
+        for target in targets:
+            print_warning(f"失效链接: {page} -> {target}")
+    if not broken_links:
+        print_success("没有失效链接")
+    
+    orphan_pages = graph.orphan_pages()
+    if orphan_pages:
+        print_warning(f"孤立页面（没有其他页面链接到）: {', '.join(orphan_pages)}")
+    
+    unreachable_pages = graph.unreachable_pages()
+    if unreachable_pages:
+        print_warning(f"从入口页面不可达: {', '.join(unreachable_pages)}")
+    elif graph.entries:
+        print_success("所有页面都可以从入口页面到达")
+    
+    unlisted_pages = sorted(generated_pages - set(expected_pages))
+    if unlisted_pages:
+        print_info(f"页面清单之外的页面: {', '.join(unlisted_pages)}")
+    
+    print()
+    
+    # 步骤5: 检查汇总文档
+    print_colored(Colors.CYAN, "📄 步骤5: 检查汇总文档")
     
     if output_file.exists():
         try:
@@ -252,6 +413,7 @@ def validate_frontend_pages():
     print(f"✅ 完整页面数量: {complete_count}")
     print(f"❌ 缺失页面数量: {len(missing_pages)}")
     print(f"⚠️  不完整页面数量: {len(incomplete_pages)}")
+    print(f"🔗 失效链接数量: {sum(len(targets) for targets in broken_links.values())}")
     
     if total_pages > 0:
         completion_rate = (complete_count / total_pages) * 100
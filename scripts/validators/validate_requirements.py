@@ -22,6 +22,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from keyword_matcher import KeywordAutomaton, KeywordDictionary, KeywordHits, load_keyword_dictionaries
+
 # 颜色输出类
 class Colors:
     RED = '\033[0;31m'
@@ -57,6 +59,9 @@ class RequirementsValidator:
         self.validation_results = []
         self.warnings = []
         self.recommendations = []
+        self.keyword_dictionaries = None
+        self._automatons = {}
+        self._keyword_hits = None
         
     def load_config(self) -> Optional[dict]:
         """加载项目配置"""
@@ -84,6 +89,35 @@ class RequirementsValidator:
             self.add_error(f"需求文档读取失败: {e}")
             return None
     
+    def scan_keywords(self, content: str, config: Optional[dict] = None) -> KeywordHits:
+        """
+        单次扫描需求文档，统计所有关键词词典的命中次数和位置
+
+        配置中的前端/后端技术作为额外词典 configured_technology 一起扫描；
+        结果按文档缓存，各项验证共享同一次扫描（config 为 None 时沿用已有结果）
+        """
+        terms = None
+        if config is not None:
+            terms = tuple(term for term in (config.get('front', '').lower(),
+                                            config.get('backend', '').lower()) if term)
+
+        if self._keyword_hits is not None:
+            cached_content, cached_terms, hits = self._keyword_hits
+            if cached_content is content and (terms is None or terms == cached_terms):
+                return hits
+
+        terms = terms or ()
+        automaton = self._automatons.get(terms)
+        if automaton is None:
+            if self.keyword_dictionaries is None:
+                self.keyword_dictionaries = load_keyword_dictionaries()
+            dictionaries = self.keyword_dictionaries + [KeywordDictionary('configured_technology', list(terms), False)]
+            automaton = self._automatons[terms] = KeywordAutomaton(dictionaries)
+
+        hits = automaton.scan(content)
+        self._keyword_hits = (content, terms, hits)
+        return hits
+    
     def add_success(self, message: str):
         self.validation_results.append(('success', message))
     
@@ -152,13 +186,13 @@ class RequirementsValidator:
             matches = re.findall(pattern, content, re.IGNORECASE)
             function_matches.extend(matches)
         
+        hits = self.scan_keywords(content)
+        
         # 查找业务流程相关内容
-        workflow_keywords = ['流程', '步骤', '操作', '处理', '业务', '逻辑']
-        workflow_count = sum(content.count(keyword) for keyword in workflow_keywords)
+        workflow_count = hits.count('workflow')
         
         # 查找具体功能描述
-        feature_keywords = ['登录', '注册', '查询', '添加', '修改', '删除', '导入', '导出', '统计', '报表', '审批', '权限']
-        feature_count = sum(content.count(keyword) for keyword in feature_keywords)
+        feature_count = hits.count('feature')
         
         stats = {
             'function_mentions': len(function_matches),
@@ -185,12 +219,7 @@ class RequirementsValidator:
         # 查找用户角色相关内容
         role_patterns = [
             r'用户.*[:：]',
-            r'角色.*[:：]',
-            r'管理员',
-            r'普通用户',
-            r'操作员',
-            r'审核员',
-            r'系统管理员'
+            r'角色.*[:：]'
         ]
         
         role_matches = []
@@ -198,9 +227,13 @@ class RequirementsValidator:
             matches = re.findall(pattern, content, re.IGNORECASE)
             role_matches.extend(matches)
         
+        # 角色名称（管理员、审核员等）由关键词词典统计
+        hits = self.scan_keywords(content)
+        for role, count in hits.counts('role').items():
+            role_matches.extend([role] * count)
+        
         # 查找权限相关描述
-        permission_keywords = ['权限', '授权', '访问控制', '角色管理', '用户管理']
-        permission_count = sum(content.count(keyword) for keyword in permission_keywords)
+        permission_count = hits.count('permission')
         
         stats = {
             'role_mentions': len(role_matches),
@@ -222,26 +255,18 @@ class RequirementsValidator:
         config_front = config.get('front', '').lower()
         config_backend = config.get('backend', '').lower()
         
-        # 查找技术相关关键词
-        tech_keywords = [
-            'javascript', 'java', 'python', 'php', 'nodejs', 'react', 'vue', 'angular',
-            'spring', 'django', 'flask', 'laravel', 'express',
-            'mysql', 'postgresql', 'mongodb', 'redis', 'sqlite',
-            'html', 'css', 'bootstrap', 'jquery'
-        ]
+        hits = self.scan_keywords(content, config)
         
-        mentioned_techs = []
-        for keyword in tech_keywords:
-            if keyword in content.lower():
-                mentioned_techs.append(keyword)
+        # 查找技术相关关键词（不区分大小写）
+        mentioned_techs = hits.found('technology')
         
         # 检查配置一致性
-        front_mentioned = config_front in content.lower() if config_front else False
-        backend_mentioned = config_backend in content.lower() if config_backend else False
+        configured = hits.found('configured_technology')
+        front_mentioned = config_front in configured if config_front else False
+        backend_mentioned = config_backend in configured if config_backend else False
         
         # 查找非功能需求
-        nfr_keywords = ['性能', '安全', '可用性', '扩展性', '兼容性', '响应时间', '并发']
-        nfr_count = sum(content.count(keyword) for keyword in nfr_keywords)
+        nfr_count = hits.count('nfr')
         
         stats = {
             'mentioned_technologies': mentioned_techs,
@@ -265,19 +290,8 @@ class RequirementsValidator:
     
     def validate_professional_terminology(self, content: str) -> Dict[str, any]:
         """验证专业术语使用"""
-        # 软件开发相关专业术语
-        professional_terms = [
-            '系统架构', '数据库', '接口', 'API', '模块', '组件', '框架',
-            '用户界面', '业务逻辑', '数据流', '工作流', '算法', '协议',
-            '安全性', '稳定性', '可维护性', '可扩展性', '兼容性',
-            '前端', '后端', '服务器', '客户端', '浏览器', '移动端',
-            '数据库设计', '表结构', '索引', '事务', '备份', '恢复'
-        ]
-        
-        found_terms = []
-        for term in professional_terms:
-            if term in content:
-                found_terms.append(term)
+        # 软件开发相关专业术语（词典见 requirements_keywords.json）
+        found_terms = self.scan_keywords(content).found('professional_terms')
         
         # 计算专业术语密度
         word_count = len(content.split())
@@ -343,6 +357,13 @@ class RequirementsValidator:
         print_info(f"文档路径: {self.requirements_path}")
         print()
         
+        # 所有关键词词典只扫描一次文档
+        try:
+            self.scan_keywords(content, config)
+        except (OSError, ValueError) as e:
+            self.add_error(f"关键词词典加载失败: {e}")
+            return {'success': False, 'error': '关键词词典加载失败'}
+        
         # 执行各项验证
         length_stats = self.validate_document_length(content, config)
         function_stats = self.validate_functional_modules(content)